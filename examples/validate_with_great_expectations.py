@@ -6,6 +6,11 @@ Workflow
 
        python -m flatdir . --output index.json
 
+   or, for large trees, a Parquet file that loads without parsing JSON
+   (needs pyarrow):
+
+       python -m flatdir . --format parquet --output index.parquet
+
 2. Run this script to load that inventory as a pandas DataFrame and
    validate it against a set of structural expectations:
 
@@ -70,7 +75,15 @@ NAME_REGEX = r"^[^\s].*"  # must not start with whitespace
 
 
 def load_index(path: str) -> pd.DataFrame:
-    """Load a flatdir JSON index and return it as a DataFrame."""
+    """Load a flatdir index (JSON, Parquet, Arrow or CSV) and return it as a DataFrame."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix in (".arrow", ".feather"):
+        return pd.read_feather(path)
+    if suffix == ".csv":
+        return pd.read_csv(path, keep_default_na=False, na_values=[""])
+
     raw = json.loads(Path(path).read_text(encoding="utf-8"))
 
     # Support both plain arrays and --with-headers envelope
@@ -212,7 +225,7 @@ def main() -> int:
     parser.add_argument(
         "index",
         metavar="INDEX_JSON",
-        help="Path to the JSON file produced by `python -m flatdir . --output index.json`.",
+        help="Path to the JSON (or .parquet, .arrow, .csv) file produced by flatdir --output.",
     )
     args = parser.parse_args()
 
@@ -7,21 +7,42 @@ Options:
   --limit N                  Limit the number of entries returned to N.
   --depth N                  Limit the directory traversal depth to max N.
   --min-depth N              Filter out objects positioned shallower than depth N.
+  --workers N                Scan directories and compute fields on N threads.
+  --processes N              Compute fields in N worker processes (CPU-heavy plugins).
   --output FILE              Write the JSON output to FILE instead of stdout.
+  --cache FILE               Reuse plugin field values of unchanged entries from FILE (SQLite).
+  --incremental FILE         Reuse entries of unchanged directories from a previous output
+                             written with --with-headers.
+  --format FORMAT            Output format: json (default) or ndjson (one entry per line), or
+                             csv, parquet or arrow (columns, parquet/arrow need pyarrow),
+                             or sqlite (upserted into --output FILE[#TABLE], default table entries).
+  --compact                  Write JSON without indentation or spaces (fast encoder if installed).
+  --encoder NAME             With --compact: auto (default), orjson, msgspec or json.
+  --stream                   Write entries as they are found (traversal order unless --sort);
+                             --tree/--nested are written as directories complete.
+  --sort-buffer N            With --stream --sort, entries sorted in memory per spilled run.
   --diff FILE                Compare the current flatdir result with FILE and output only changes.
-  --fields FILE              Path to a python file defining custom formatting.
+                             Entries are tagged added, removed, modified or moved.
+                             With --stream, both sides are sorted on disk and merge-joined.
+  --fields FILE              Path to a python file defining custom formatting
+                             (or a .toml/.json file of declarative name patterns).
   --exclude field=value      Exclude objects precisely matching boolean parameters.
   --only field=value         Mandate object mapping fields validating correctly.
   --add field=value          Inject static metadata values sequentially across arrays.
   --dict-field KEY[=FILE]    Extract KEY from FILE in each dir (FILE defaults to <dir>.json).
+                             KEY may be a JSON pointer to a nested value: meta/athlete/name.
   --include-json [FILE]      Embed the entire FILE payload recursively under KEY in each dir.
-  --join FILE:REM:LOC        Merge matched external database FILE entries mapping REM back to LOC.
+  --json-cache-size BYTES    Memory budget for parsed --dict-field/--include-json files (32 MiB).
+  --join FILE:REM:LOC[:AS]   Merge matched external database FILE entries mapping REM back to LOC.
+                             FILE may be JSON, NDJSON, CSV/TSV or SQLite (FILE#TABLE); a fifth
+                             part lists the COLUMNS to keep.
   --match PATTERN            Apply regex validation pattern filters across filename nodes.
   --sort FIELD               Configure topological sequence ordering mapped by parameter.
   --desc                     Invert topological JSON indexing sequentially backwards.
   --tree                     Format the output as a D3.js compatible tree with children arrays.
   --nested                   Build hierarchal topological directory map nodes dynamically.
   --ignore-typical           Omit standard dev environments natively (like .git, .venv).
+  --prune                    Do not descend into directories removed by --exclude name= or --only path=.
   --no-defaults              Omit default fields (type, size, mtime) but preserve name.
   --absolute                 Include absolute path in the path field.
   --id                       Inject an auto-incrementing integer sequence post-sorting.
@@ -38,19 +59,77 @@ path Defaults to the current directory '.'
 
 from __future__ import annotations
 
+import itertools
 import json
 import sys
 import time
 import datetime
 import shlex
+import sqlite3
+from dataclasses import dataclass, field
 from pathlib import Path
-
-from .listing import list_entries
+from typing import Iterable, Iterator, TextIO
+
+from .cache import FieldCache
+from .columnar import COLUMNAR_FORMATS, check_format, field_schema, write_columnar
+from .incremental import PreviousIndex
+from .hierarchy import build_nested as _build_nested
+from .hierarchy import build_tree as _build_tree
+from .hierarchy import write_nested_stream, write_tree_stream
+from .listing import DEFAULT_FIELDS, iter_entries, list_entries
+from .output import ENCODERS, FORMATS, Encode, get_encoder, open_output, write_output, write_stream
+from .sorting import DEFAULT_BUFFER_SIZE, external_sort, sort_key, top_k
 from .plugins_loader import load_fields_file
-from .compare import compare_entries
+from .compare import MOVE_FIELDS, compare_entries, entry_key, iter_changes
+from .reading import read_entries
+from .sidecars import DEFAULT_MAX_BYTES, JsonCache
 from .plugins import options as plugin_options
 
 
+
+@dataclass
+class _Options:
+    """Parsed command-line options of one flatdir run."""
+
+    path: Path
+    limit: int | None = None
+    depth: int | None = None
+    min_depth: int | None = None
+    add_depth: int | None = None
+    workers: int | None = None
+    processes: int | None = None
+    output: str | None = None
+    output_format: str = "json"
+    encode: Encode | None = None
+    stream: bool = False
+    sort_buffer: int = DEFAULT_BUFFER_SIZE
+    compare_json_path: str | None = None
+    diff_json_path: str | None = None
+    ics_mode: bool = False
+    ics_component: str = "VEVENT"
+    fields: dict[str, object] | None = None
+    exclude: list[tuple[str, str]] = field(default_factory=list)
+    only: list[tuple[str, str]] = field(default_factory=list)
+    add_fields: dict[str, object] = field(default_factory=dict)
+    dict_fields: list[tuple[str, str | None]] = field(default_factory=list)
+    include_jsons: list[tuple[str, str | None]] = field(default_factory=list)
+    joins: list[tuple[str, ...]] = field(default_factory=list)
+    match: str | None = None
+    sort_by: str | None = None
+    sort_desc: bool = False
+    tree: bool = False
+    nested: bool = False
+    ignore_typical: bool = False
+    prune: bool = False
+    no_defaults: bool = False
+    absolute: bool = False
+    auto_id: bool = False
+    with_headers: bool = False
+    cache: FieldCache | None = None
+    previous: PreviousIndex | None = None
+    json_cache: JsonCache | None = None
+
+
 def main(argv: list[str] | None = None) -> int:
     start_time = time.time()
     argv = argv if argv is not None else sys.argv[1:]
@@ -59,12 +138,113 @@ def main(argv: list[str] | None = None) -> int:
         print(__doc__)
         return 0
 
-    if argv and argv[0] == "diff":
-        # Handled later after flag parsing
-        pass
-
     original_argv = list(argv)
-    
+    opts = _parse_options(argv)
+    if isinstance(opts, int):
+        return opts
+
+    if opts.stream and not opts.ics_mode:
+        stream_entries: Iterable[dict[str, object]] = iter_entries(opts.path, **_listing_options(opts))
+        if opts.compare_json_path:
+            # both sides are sorted on disk by (path, name) and merge-joined
+            if opts.sort_by and opts.limit is not None and opts.limit >= 0:
+                stream_entries = top_k(stream_entries, sort_key(opts.sort_by), opts.limit, reverse=opts.sort_desc)
+            elif opts.limit is not None and opts.limit >= 0:
+                stream_entries = itertools.islice(stream_entries, opts.limit)
+            if opts.auto_id:
+                stream_entries = _with_ids(stream_entries)
+            try:
+                with open(opts.compare_json_path, "r", encoding="utf-8") as old_fp:
+                    changes = iter_changes(
+                        external_sort(read_entries(old_fp), entry_key, buffer_size=opts.sort_buffer),
+                        external_sort(stream_entries, entry_key, buffer_size=opts.sort_buffer),
+                        _move_fields(opts),
+                    )
+                    if opts.output is not None:
+                        with open_output(opts.output) as f:
+                            write_stream(changes, f, opts.output_format, opts.encode)
+                    else:
+                        write_stream(changes, sys.stdout, opts.output_format, opts.encode)
+            except (OSError, ValueError) as exc:
+                print(f"error: diff source: {exc}", file=sys.stderr)
+                return 1
+            return 0
+        if opts.sort_by and opts.limit is not None and opts.limit >= 0:
+            stream_entries = top_k(stream_entries, sort_key(opts.sort_by), opts.limit, reverse=opts.sort_desc)
+        elif opts.sort_by:
+            stream_entries = external_sort(
+                stream_entries, sort_key(opts.sort_by), reverse=opts.sort_desc, buffer_size=opts.sort_buffer
+            )
+        elif opts.limit is not None and opts.limit >= 0:
+            # traversal order: stop walking as soon as enough entries passed the filters
+            stream_entries = itertools.islice(stream_entries, opts.limit)
+        if opts.auto_id:
+            stream_entries = _with_ids(stream_entries)
+        if opts.output_format in COLUMNAR_FORMATS:
+            return _write_columnar(stream_entries, opts)
+        if opts.output is not None:
+            with open_output(opts.output) as f:
+                _write_streamed(stream_entries, f, opts)
+        else:
+            _write_streamed(stream_entries, sys.stdout, opts)
+        return 0
+
+    out_data: object
+    if opts.diff_json_path:
+        # the current state is listed with the options stored in the diff
+        # source, not with the ones of this invocation
+        diff_data = _diff_with_stored_command(opts.diff_json_path)
+        if isinstance(diff_data, int):
+            return diff_data
+        out_data = diff_data
+    else:
+        entries = _collect_entries(opts)
+        if opts.output_format in COLUMNAR_FORMATS:
+            return _write_columnar(entries, opts)
+
+        if opts.compare_json_path:
+            try:
+                previous_entries = _load_flatdir_entries_for_diff(opts.compare_json_path)
+            except ValueError as exc:
+                print(f"error: {exc}", file=sys.stderr)
+                return 1
+            out_data = compare_entries(previous_entries, entries, _move_fields(opts))
+        elif opts.tree:
+            out_data = _build_tree(entries, opts.path.name)
+        elif opts.nested:
+            out_data = _build_nested(entries)
+        else:
+            out_data = entries
+
+        if opts.with_headers and opts.compare_json_path is None:
+            headers = {
+                "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "execution_time_seconds": round(time.time() - start_time, 4),
+                "command": "python -m flatdir " + shlex.join(original_argv),
+                "entries_count": len(entries)
+            }
+            if opts.cache is not None:
+                headers["cache_hits"] = opts.cache.hits
+                headers["cache_misses"] = opts.cache.misses
+            if opts.json_cache is not None:
+                headers["json_cache_hits"] = opts.json_cache.hits
+                headers["json_cache_misses"] = opts.json_cache.misses
+            out_data = {
+                "headers": headers,
+                "entries": out_data
+            }
+
+    # write JSON to output file or stdout
+    if opts.output is not None:
+        with open_output(opts.output) as f:
+            write_output(out_data, f, opts.output_format, opts.encode)
+    else:
+        write_output(out_data, sys.stdout, opts.output_format, opts.encode)
+    return 0
+
+
+def _parse_options(argv: list[str]) -> _Options | int:
+    """Parse *argv* into options, or print the error and return the exit code."""
     # parse --limit flag if present
     limit: int | None = None
     if "--limit" in argv:
@@ -109,6 +289,38 @@ def main(argv: list[str] | None = None) -> int:
             print("error: --add-depth requires a valid integer argument", file=sys.stderr)
             return 1
 
+    # parse --workers flag if present
+    workers: int | None = None
+    if "--workers" in argv:
+        try:
+            idx = argv.index("--workers")
+            workers = int(argv[idx + 1])
+            argv = argv[:idx] + argv[idx + 2 :]
+        except (IndexError, ValueError):
+            print("error: --workers requires a valid integer argument", file=sys.stderr)
+            return 1
+        if workers < 1:
+            print("error: --workers must be at least 1", file=sys.stderr)
+            return 1
+
+    # parse --processes flag if present
+    processes: int | None = None
+    if "--processes" in argv:
+        try:
+            idx = argv.index("--processes")
+            processes = int(argv[idx + 1])
+            argv = argv[:idx] + argv[idx + 2 :]
+        except (IndexError, ValueError):
+            print("error: --processes requires a valid integer argument", file=sys.stderr)
+            return 1
+        if processes < 1:
+            print("error: --processes must be at least 1", file=sys.stderr)
+            return 1
+
+    if workers is not None and processes is not None:
+        print("error: use either --workers or --processes, not both", file=sys.stderr)
+        return 1
+
     # parse --output flag if present
     output: str | None = None
     if "--output" in argv:
@@ -120,6 +332,106 @@ def main(argv: list[str] | None = None) -> int:
             print("error: --output requires a file path argument", file=sys.stderr)
             return 1
 
+    # parse --cache flag if present
+    cache_path: str | None = None
+    if "--cache" in argv:
+        try:
+            idx = argv.index("--cache")
+            cache_path = argv[idx + 1]
+            argv = argv[:idx] + argv[idx + 2 :]
+        except IndexError:
+            print("error: --cache requires a file path argument", file=sys.stderr)
+            return 1
+
+    # parse --json-cache-size flag if present
+    json_cache_size = DEFAULT_MAX_BYTES
+    if "--json-cache-size" in argv:
+        try:
+            idx = argv.index("--json-cache-size")
+            json_cache_size = int(argv[idx + 1])
+            argv = argv[:idx] + argv[idx + 2 :]
+        except (IndexError, ValueError):
+            print("error: --json-cache-size requires a valid integer argument", file=sys.stderr)
+            return 1
+        if json_cache_size < 0:
+            print("error: --json-cache-size must not be negative", file=sys.stderr)
+            return 1
+
+    # parse --incremental flag if present
+    incremental_path: str | None = None
+    if "--incremental" in argv:
+        try:
+            idx = argv.index("--incremental")
+            incremental_path = argv[idx + 1]
+            argv = argv[:idx] + argv[idx + 2 :]
+        except IndexError:
+            print("error: --incremental requires a file path argument", file=sys.stderr)
+            return 1
+
+    # parse --format flag if present
+    output_format = "json"
+    if "--format" in argv:
+        try:
+            idx = argv.index("--format")
+            output_format = argv[idx + 1]
+            argv = argv[:idx] + argv[idx + 2 :]
+        except IndexError:
+            print("error: --format requires a FORMAT argument", file=sys.stderr)
+            return 1
+        if output_format not in FORMATS + COLUMNAR_FORMATS:
+            print(f"error: --format must be one of: {', '.join(FORMATS + COLUMNAR_FORMATS)}", file=sys.stderr)
+            return 1
+
+    # parse --compact and --encoder flags if present
+    compact = False
+    if "--compact" in argv:
+        idx = argv.index("--compact")
+        compact = True
+        argv = argv[:idx] + argv[idx + 1 :]
+    encoder_name = "auto"
+    if "--encoder" in argv:
+        try:
+            idx = argv.index("--encoder")
+            encoder_name = argv[idx + 1]
+            argv = argv[:idx] + argv[idx + 2 :]
+        except IndexError:
+            print("error: --encoder requires a NAME argument", file=sys.stderr)
+            return 1
+        if encoder_name not in ENCODERS:
+            print(f"error: --encoder must be one of: {', '.join(ENCODERS)}", file=sys.stderr)
+            return 1
+        if not compact:
+            print("error: --encoder requires --compact", file=sys.stderr)
+            return 1
+    encode: Encode | None = None
+    if compact:
+        try:
+            encode = get_encoder(encoder_name)
+        except ImportError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+
+    # parse --stream flag if present
+    stream: bool = False
+    if "--stream" in argv:
+        idx = argv.index("--stream")
+        stream = True
+        argv = argv[:idx] + argv[idx + 1 :]
+
+    # parse --sort-buffer flag if present
+    sort_buffer = DEFAULT_BUFFER_SIZE
+    if "--sort-buffer" in argv:
+        try:
+            idx = argv.index("--sort-buffer")
+            sort_buffer = int(argv[idx + 1])
+            argv = argv[:idx] + argv[idx + 2 :]
+        except (IndexError, ValueError):
+            print("error: --sort-buffer requires a valid integer argument", file=sys.stderr)
+            return 1
+        if sort_buffer < 1:
+            print("error: --sort-buffer must be at least 1", file=sys.stderr)
+            return 1
+
     # parse --diff flag if present
     compare_json_path: str | None = None
     if "--diff" in argv:
@@ -210,7 +522,7 @@ def main(argv: list[str] | None = None) -> int:
         except IndexError:
             print("error: --fields requires a file path argument", file=sys.stderr)
             return 1
-        except (FileNotFoundError, ImportError) as exc:
+        except (FileNotFoundError, ImportError, ValueError) as exc:
             print(f"error: {exc}", file=sys.stderr)
             return 1
 
@@ -337,8 +649,8 @@ def main(argv: list[str] | None = None) -> int:
             argv = argv[:idx] + argv[idx + 1 :]
             include_jsons.append(("include", None))
 
-    # parse --join flags (repeatable: --join FILE:REMOTE_KEY[:LOCAL_KEY])
-    joins: list[tuple[str, str, str]] = []
+    # parse --join flags (repeatable: --join FILE:REMOTE_KEY[:LOCAL_KEY[:AS_KEY[:COLUMNS]]])
+    joins: list[tuple[str, ...]] = []
     while "--join" in argv:
         try:
             idx = argv.index("--join")
@@ -353,11 +665,20 @@ def main(argv: list[str] | None = None) -> int:
             elif len(parts) == 3:
                 filename, remote_key, local_key = parts
                 joins.append((filename, remote_key, local_key))
+            elif len(parts) == 4:
+                filename, remote_key, local_key, as_key = parts
+                joins.append((filename, remote_key, local_key or "name", as_key))
+            elif len(parts) == 5:
+                filename, remote_key, local_key, as_key, columns = parts
+                joins.append((filename, remote_key, local_key or "name", as_key, columns))
             else:
-                print("error: --join requires FILE:REMOTE_KEY[:LOCAL_KEY] format", file=sys.stderr)
+                print("error: --join requires FILE:REMOTE_KEY[:LOCAL_KEY[:AS_KEY[:COLUMNS]]] format", file=sys.stderr)
+                return 1
+            if len(joins[-1][1].split(",")) != len(joins[-1][2].split(",")):
+                print("error: --join REMOTE_KEY and LOCAL_KEY must list the same number of keys", file=sys.stderr)
                 return 1
         except IndexError:
-            print("error: --join requires a FILE:REMOTE_KEY[:LOCAL_KEY] argument", file=sys.stderr)
+            print("error: --join requires a FILE:REMOTE_KEY[:LOCAL_KEY[:AS_KEY[:COLUMNS]]] argument", file=sys.stderr)
             return 1
 
     # parse --match flag if present
@@ -410,6 +731,13 @@ def main(argv: list[str] | None = None) -> int:
         ignore_typical = True
         argv = argv[:idx] + argv[idx + 1 :]
 
+    # parse --prune flag if present
+    prune: bool = False
+    if "--prune" in argv:
+        idx = argv.index("--prune")
+        prune = True
+        argv = argv[:idx] + argv[idx + 1 :]
+
     # parse --no-defaults flag if present
     no_defaults: bool = False
     if "--no-defaults" in argv:
@@ -466,11 +794,14 @@ def main(argv: list[str] | None = None) -> int:
         print(f"path is not a directory: {path}", file=sys.stderr)
         return 2
 
-    if no_defaults and (fields is None or "name" not in fields):
+    if no_defaults and (fields is None or "name" not in fields or output_format == "sqlite"):
         from .plugins import defaults as _defaults
         if fields is None:
             fields = {}
         fields["name"] = _defaults.name
+        if output_format == "sqlite" and "path" not in fields:
+            # rows are upserted on (path, name)
+            fields["path"] = _defaults.path
 
     if (tree or nested):
         from .plugins import defaults as _defaults
@@ -487,127 +818,250 @@ def main(argv: list[str] | None = None) -> int:
         pattern_id_separator=pattern_id_separator,
     )
 
-    # generate the actual list of entries to be returned as JSON
-    if ics_mode:
+    if stream:
+        # streaming never holds the whole result, so anything needing it
+        # (diff, headers) is unavailable; --sort spills to disk, and
+        # hierarchies are written as directories complete, in traversal order;
+        # --diff writes a flat list of changes, so it has no hierarchy either
+        conflicts = [
+            flag for flag, enabled in (
+                ("diff", diff_json_path is not None),
+                ("--with-headers", with_headers),
+                ("--sort with --tree/--nested", sort_by is not None and (tree or nested)),
+                ("--diff with --tree/--nested", compare_json_path is not None and (tree or nested)),
+            ) if enabled
+        ]
+        if conflicts:
+            print(f"error: --stream cannot be combined with {', '.join(conflicts)}", file=sys.stderr)
+            return 1
+
+    if output_format in COLUMNAR_FORMATS:
+        # columns hold flat entries, written in batches as they come
+        conflicts = [
+            flag for flag, enabled in (
+                ("--tree", tree),
+                ("--nested", nested),
+                ("--with-headers", with_headers),
+                ("--diff", compare_json_path is not None),
+                ("diff", diff_json_path is not None),
+                # calendar entries have no path and name to key the rows on
+                ("--ics", ics_mode and output_format == "sqlite"),
+            ) if enabled
+        ]
+        if conflicts:
+            print(f"error: --format {output_format} cannot be combined with {', '.join(conflicts)}", file=sys.stderr)
+            return 1
+        if output_format != "csv" and output is None:
+            print(f"error: --format {output_format} requires --output", file=sys.stderr)
+            return 1
+        try:
+            check_format(output_format)
+        except ImportError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+
+    previous: PreviousIndex | None = None
+    if incremental_path is not None and not ics_mode:
+        # reused directories only hold what the previous output listed, so it
+        # must not have dropped entries the current run could need
+        conflicts = [
+            flag for flag, enabled in (
+                # only name rules with --prune drop whole subtrees, which a rerun skips too
+                (
+                    "--exclude (other than name= with --prune)",
+                    bool(exclude) and (not prune or any(field_name != "name" for field_name, _ in exclude)),
+                ),
+                ("--only", bool(only)),
+                ("--match", match is not None),
+                ("--min-depth", min_depth is not None),
+                ("--limit", limit is not None),
+            ) if enabled
+        ]
+        if conflicts:
+            print(f"error: --incremental cannot be combined with {', '.join(conflicts)}", file=sys.stderr)
+            return 1
+        try:
+            previous = PreviousIndex.from_file(incremental_path)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+
+    cache: FieldCache | None = None
+    if cache_path is not None and not ics_mode:
+        try:
+            cache = FieldCache(cache_path)
+        except sqlite3.Error as exc:
+            print(f"error: cannot open cache {cache_path}: {exc}", file=sys.stderr)
+            return 1
+
+    return _Options(
+        path=path,
+        limit=limit,
+        depth=depth,
+        min_depth=min_depth,
+        add_depth=add_depth,
+        workers=workers,
+        processes=processes,
+        output=output,
+        output_format=output_format,
+        encode=encode,
+        stream=stream,
+        sort_buffer=sort_buffer,
+        compare_json_path=compare_json_path,
+        diff_json_path=diff_json_path,
+        ics_mode=ics_mode,
+        ics_component=ics_component,
+        fields=fields,
+        exclude=exclude,
+        only=only,
+        add_fields=add_fields,
+        dict_fields=dict_fields,
+        include_jsons=include_jsons,
+        joins=joins,
+        match=match,
+        sort_by=sort_by,
+        sort_desc=sort_desc,
+        tree=tree,
+        nested=nested,
+        ignore_typical=ignore_typical,
+        prune=prune,
+        no_defaults=no_defaults,
+        absolute=absolute,
+        auto_id=auto_id,
+        with_headers=with_headers,
+        cache=cache,
+        previous=previous,
+        json_cache=JsonCache(json_cache_size) if dict_fields or include_jsons else None,
+    )
+
+
+def _listing_options(opts: _Options) -> dict[str, object]:
+    """Keyword arguments shared by :func:`list_entries` and :func:`iter_entries`."""
+    return {
+        "depth": opts.depth,
+        "min_depth": opts.min_depth,
+        "add_depth": opts.add_depth,
+        "fields": opts.fields,
+        "exclude": opts.exclude or None,
+        "only": opts.only or None,
+        "add_fields": opts.add_fields or None,
+        "dict_fields": opts.dict_fields or None,
+        "include_jsons": opts.include_jsons or None,
+        "joins": opts.joins or None,
+        "match": opts.match,
+        "ignore_typical": opts.ignore_typical,
+        "use_defaults": not opts.no_defaults,
+        "absolute": opts.absolute,
+        "workers": opts.workers,
+        "processes": opts.processes,
+        "prune": opts.prune,
+        "cache": opts.cache,
+        "previous": opts.previous,
+        "json_cache": opts.json_cache,
+    }
+
+
+def _write_streamed(entries: Iterable[dict[str, object]], fp: TextIO, opts: _Options) -> None:
+    """Write streamed entries flat or, in traversal order, as a --tree/--nested hierarchy."""
+    indent = None if opts.output_format == "ndjson" else 4
+    if opts.tree:
+        write_tree_stream(entries, fp, opts.path.name, indent=indent, encode=opts.encode)
+    elif opts.nested:
+        write_nested_stream(entries, fp, indent=indent, encode=opts.encode)
+    else:
+        write_stream(entries, fp, opts.output_format, opts.encode)
+
+
+def _write_columnar(entries: Iterable[dict[str, object]], opts: _Options) -> int:
+    """Write flat entries in the columnar --format, typed after the active field plugins.
+
+    Return the exit status: 1 if the entries cannot be written in that format.
+    """
+    fields: dict[str, object] = {}
+    if not opts.ics_mode:
+        fields = {**(DEFAULT_FIELDS if not opts.no_defaults else {}), **(opts.fields or {})}
+    schema = field_schema(fields)  # type: ignore[arg-type]
+    try:
+        if opts.output is not None:
+            write_columnar(entries, opts.output, opts.output_format, schema)
+        else:
+            write_columnar(entries, sys.stdout, opts.output_format, schema)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _collect_entries(opts: _Options) -> list[dict[str, object]]:
+    """List, filter and sort the entries requested by *opts* (ICS file or directory)."""
+    if opts.ics_mode:
         from .ics import list_ics_entries
 
-        entries = list_ics_entries(path, component=ics_component)
-        if add_fields and add_depth is None:
+        entries = list_ics_entries(opts.path, component=opts.ics_component)
+        if opts.add_fields and opts.add_depth is None:
             for entry in entries:
-                entry.update(add_fields)
-        entries = _filter_json_entries(entries, exclude or None, only or None)
+                entry.update(opts.add_fields)
+        entries = _filter_json_entries(entries, opts.exclude or None, opts.only or None)
+        sort_by = opts.sort_by
         if sort_by:
-            entries.sort(key=lambda entry: _json_sort_value(entry.get(sort_by)), reverse=sort_desc)
-        if limit is not None and limit >= 0:
-            entries = entries[:limit]
+            entries.sort(key=lambda entry: _json_sort_value(entry.get(sort_by)), reverse=opts.sort_desc)
+        if opts.limit is not None and opts.limit >= 0:
+            entries = entries[:opts.limit]
     else:
         entries = list_entries(
-            path,
-            limit=limit,
-            depth=depth,
-            min_depth=min_depth,
-            add_depth=add_depth,
-            fields=fields,
-            exclude=exclude or None,
-            only=only or None,
-            add_fields=add_fields or None,
-            dict_fields=dict_fields or None,
-            include_jsons=include_jsons or None,
-            joins=joins or None,
-            match=match,
-            sort_by=sort_by,
-            sort_desc=sort_desc,
-            ignore_typical=ignore_typical,
-            use_defaults=not no_defaults,
-            absolute=absolute,
+            opts.path,
+            limit=opts.limit,
+            sort_by=opts.sort_by,
+            sort_desc=opts.sort_desc,
+            **_listing_options(opts),  # type: ignore[arg-type]
         )
 
-    if auto_id:
+    if opts.auto_id:
         for index, entry in enumerate(entries, start=1):
             entry["id"] = index
+    return entries
 
-    if compare_json_path:
-        try:
-            previous_entries = _load_flatdir_entries_for_diff(compare_json_path)
-        except ValueError as exc:
-            print(f"error: {exc}", file=sys.stderr)
-            return 1
-        out_data = compare_entries(previous_entries, entries)
-    else:
-        out_data = entries
 
-    if compare_json_path is None:
-        if tree:
-            out_data = _build_tree(entries, path.name)
-        elif nested:
-            out_data = _build_nested(entries)
+def _diff_with_stored_command(diff_json_path: str) -> list[dict[str, object]] | int:
+    """Compare a ``--with-headers`` output with the current result of its stored command."""
+    try:
+        with open(diff_json_path, "r", encoding="utf-8") as f:
+            old_data = json.load(f)
+    except Exception as e:
+        print(f"error reading JSON file for diff: {e}", file=sys.stderr)
+        return 1
 
-    if with_headers and compare_json_path is None:
-        headers = {
-            "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "execution_time_seconds": round(time.time() - start_time, 4),
-            "command": "python -m flatdir " + shlex.join(original_argv),
-            "entries_count": len(entries)
-        }
-        out_data = {
-            "headers": headers,
-            "entries": out_data
-        }
-
-    if diff_json_path:
-        try:
-            with open(diff_json_path, "r", encoding="utf-8") as f:
-                old_data = json.load(f)
-        except Exception as e:
-            print(f"error reading JSON file for diff: {e}", file=sys.stderr)
-            return 1
-            
-        if not isinstance(old_data, dict) or "headers" not in old_data or "entries" not in old_data:
-            print("error: diff source JSON must have 'headers' and 'entries' (use --with-headers)", file=sys.stderr)
-            return 1
-            
-        command_str = old_data["headers"].get("command", "")
-        if not command_str.startswith("python -m flatdir"):
-            print("error: diff source headers must contain a valid flatdir command", file=sys.stderr)
-            return 1
-            
-        # Extract arguments from the command string to run the current state
-        cmd_argv = shlex.split(command_str)[3:]
-        
-        # Run the command recursively to get fresh state (not using 'entries' from above
-        # because the current execution flags might differ from the original command in the JSON)
-        import io
-        from contextlib import redirect_stdout
-        
-        capture = io.StringIO()
-        with redirect_stdout(capture):
-            try:
-                main(cmd_argv)
-            except SystemExit:
-                pass
-        
-        try:
-            new_data = json.loads(capture.getvalue())
-        except Exception as e:
-            print(f"error parsing current state output: {e}", file=sys.stderr)
-            return 1
-            
-        new_entries = new_data["entries"] if isinstance(new_data, dict) and "entries" in new_data else new_data
-        if not isinstance(new_entries, list):
-            print("error: comparison command did not return a list of entries", file=sys.stderr)
-            return 1
-            
-        out_data = compare_entries(old_data["entries"], new_entries)
+    if not isinstance(old_data, dict) or "headers" not in old_data or "entries" not in old_data:
+        print("error: diff source JSON must have 'headers' and 'entries' (use --with-headers)", file=sys.stderr)
+        return 1
 
-    # write JSON to output file or stdout
-    if output is not None:
-        with open(output, "w", encoding="utf-8") as f:
-            json.dump(out_data, f, ensure_ascii=False, indent=4)
-            f.write("\n")
-    else:
-        json.dump(out_data, sys.stdout, ensure_ascii=False, indent=4)
-        _ = sys.stdout.write("\n")
-    return 0
+    command_str = old_data["headers"].get("command", "")
+    if not command_str.startswith("python -m flatdir"):
+        print("error: diff source headers must contain a valid flatdir command", file=sys.stderr)
+        return 1
+
+    # list the current state with the stored options, straight from the
+    # listing engine: the stored output settings (--output, --tree, ...)
+    # only shaped how the old entries were written
+    cmd_opts = _parse_options(shlex.split(command_str)[3:])
+    if isinstance(cmd_opts, int):
+        return cmd_opts
+    old_entries = old_data["entries"]
+    if not isinstance(old_entries, list):
+        print("error: diff source 'entries' must be a flat list of entries", file=sys.stderr)
+        return 1
+    return compare_entries(old_entries, _collect_entries(cmd_opts), _move_fields(cmd_opts))
+
+
+def _move_fields(opts: _Options) -> tuple[str, ...]:
+    """Return the identity fields of *opts* usable to detect moved entries in a diff."""
+    return tuple(field_name for field_name in MOVE_FIELDS if field_name in (opts.fields or {}))
+
+
+def _with_ids(entries: Iterable[dict[str, object]]) -> Iterator[dict[str, object]]:
+    for index, entry in enumerate(entries, start=1):
+        entry["id"] = index
+        yield entry
 
 
 def _filter_json_entries(
@@ -680,126 +1134,6 @@ def _load_flatdir_entries_for_diff(json_path: str) -> list[dict[str, object]]:
     raise ValueError("diff source JSON must be a flatdir list or an object containing an 'entries' list")
 
 
-def _build_nested(entries: list[dict[str, object]]) -> dict[str, object]:
-    """Convert a flat list of entries into a nested dictionary based on 'name' and 'path'."""
-    nested_dict: dict[str, object] = {}
-    for entry in entries:
-        name_val = entry.get("name")
-        path_val = entry.get("path")
-        if not isinstance(name_val, str) or not isinstance(path_val, str):
-            continue
-            
-        if path_val == ".":
-            parts = (name_val,)
-        else:
-            parts = Path(path_val).parts + (name_val,)
-            
-        current: dict[str, object] = nested_dict
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            elif not isinstance(current[part], dict):
-                current[part] = {}
-            current = current[part] # type: ignore
-            
-        last_part = parts[-1]
-        entry_data = {k: v for k, v in entry.items() if k != "name" and k != "path"}
-        
-        if last_part not in current:
-            current[last_part] = entry_data
-        else:
-            existing = current[last_part]
-            if isinstance(existing, dict):
-                existing.update(entry_data)
-            else:
-                current[last_part] = entry_data
-                
-    return nested_dict
-
-
-def _build_tree(entries: list[dict[str, object]], root_name: str) -> dict[str, object]:
-    """Convert a flat list of entries into a D3.js compliant tree dictionary with 'children'."""
-    # Build out recursive hierarchy nodes tracking children arrays
-    tree_root: dict[str, object] = {"name": root_name}
-    
-    for entry in entries:
-        path_val = entry.get("path")
-        name_val = entry.get("name")
-        if not isinstance(path_val, str) or not isinstance(name_val, str):
-            continue
-            
-        parts = Path(path_val).parts
-        if not parts or parts[0] == ".":
-            # If path represents root directory object itself
-            if not parts or (len(parts) == 1 and parts[0] == "."):
-                parts = ()
-                
-        # Traverse and construct missing hierarchy based on the relative path
-        current_node = tree_root
-        for part in parts:
-            if part == ".":
-                continue
-                
-            # Look for existing child
-            if "children" not in current_node:
-                current_node["children"] = []
-            assert isinstance(current_node["children"], list)
-            
-            found = False
-            for child in current_node["children"]:
-                if child.get("name") == part:
-                    current_node = child
-                    found = True
-                    break
-            
-            # Create intermediary branch if needed
-            if not found:
-                new_node: dict[str, object] = {"name": part}
-                current_node["children"].append(new_node)
-                current_node = new_node
-                
-        # If the entry IS the root directory itself, apply properties to root
-        if not parts and name_val == root_name:
-            for k, v in entry.items():
-                if k not in ["name", "path"]:
-                    tree_root[k] = v
-            continue
-
-        # Find if the target node (name_val) is already structurally appended
-        if "children" not in current_node:
-            current_node["children"] = []
-        assert isinstance(current_node["children"], list)
-        
-        target_node = None
-        for child in current_node["children"]:
-            if child.get("name") == name_val:
-                target_node = child
-                break
-                
-        if target_node is None:
-            target_node = {"name": name_val}
-            current_node["children"].append(target_node)
-            
-        # Bind payload data (except 'path')
-        for k, v in entry.items():
-            if k == "path" or k == "name":
-                continue
-            target_node[k] = v
-                
-    # Remove empty children blocks if any leaves happen to spawn them without validation
-    def _prune_empty_children(node: dict[str, object]):
-        if "children" in node:
-            assert isinstance(node["children"], list)
-            if not node["children"]:
-                del node["children"]
-            else:
-                for child in node["children"]:
-                    _prune_empty_children(child)
-                    
-    _prune_empty_children(tree_root)
-    return tree_root
-
-
 def _parse_value(value: str) -> object:
     """Parse string value into correct python type (bool, int, float, str)."""
     if value.lower() == "true":
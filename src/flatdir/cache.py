@@ -0,0 +1,161 @@
+"""Persistent cache of computed field values, reused across runs.
+
+Values are stored in a local SQLite file, one row per ``(path, field)``
+where ``path`` is the absolute path of the entry.
+A row is only reused while the entry still has the same device, inode, size,
+modification and change times, and the field is still produced by the same
+plugin source, listing root and plugin options (fields such as ``depth`` or
+``parent`` are relative to the root, others read ``--subfolders-whitelist``
+and the like); anything else is recomputed and overwritten. The built-in
+default fields are cheap and never cached, nor are fields that do not come
+from a fields file (e.g. lambdas) or whose function sets ``cacheable = False``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable
+
+from .entry import Entry
+from .plugins import options as plugin_options
+from .plugins_loader import field_source
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fields (
+    path TEXT NOT NULL,
+    field TEXT NOT NULL,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (path, field)
+)
+"""
+
+# pending rows are committed in batches of this size
+_COMMIT_EVERY = 1000
+
+
+class FieldCache:
+    """Field values keyed by path, validated against the entry's stat."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        self.hits = 0
+        self.misses = 0
+        self._identities: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def track(
+        self, fields: dict[str, Callable[..., object]], root: Path, skip: tuple[object, ...] = ()
+    ) -> None:
+        """Register the cacheable fields of a run listing *root* (functions in *skip* are not cached).
+
+        The current plugin options are part of the identity of the fields.
+        """
+        context = run_context(root, plugin_options.get_options())
+        for field_name, func in fields.items():
+            if func in skip:
+                continue
+            identity = field_identity(field_name, func, context)
+            if identity is not None:
+                self._identities[field_name] = identity
+
+    def identity(self, field_name: str) -> str | None:
+        return self._identities.get(field_name)
+
+    def lookup(self, entry_ctx: Entry) -> dict[str, object]:
+        """Return ``{identity: value}`` for the still valid cached fields of *entry_ctx*."""
+        key = _stat_key(entry_ctx)
+        if key is None or not self._identities:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT field, value FROM fields WHERE path = ? AND dev = ? AND ino = ?"
+                " AND size = ? AND mtime_ns = ? AND ctime_ns = ?",
+                (str(entry_ctx.path), *key),
+            ).fetchall()
+        return {field: json.loads(value) for field, value in rows}
+
+    def store(self, entry_ctx: Entry, values: dict[str, object]) -> None:
+        """Save freshly computed ``{identity: value}`` pairs for *entry_ctx*."""
+        key = _stat_key(entry_ctx)
+        if key is None or not values:
+            return
+        path = str(entry_ctx.path)
+        rows = []
+        for identity, value in values.items():
+            try:
+                rows.append((path, identity, *key, json.dumps(value, ensure_ascii=False)))
+            except (TypeError, ValueError):
+                continue  # not JSON-serialisable: recompute it next time
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._pending += len(rows)
+            if self._pending >= _COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+
+    def count(self, hits: int, misses: int) -> None:
+        """Add the hits and misses of a task (a thread or a worker process batch) to the totals."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+
+# digests of plugin files, keyed by (path, mtime_ns, size) so edits are noticed
+_file_digests: dict[tuple[str, int, int], str] = {}
+
+
+def run_context(root: Path, options: dict[str, object]) -> str:
+    """Return a digest of what field values depend on besides the entry: *root* and plugin *options*."""
+    text = json.dumps([str(root), options], sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def field_identity(field_name: str, func: Callable[..., object], context: str = "") -> str | None:
+    """Return a string identifying *func*, its source and the run *context*, or None if it must not be cached."""
+    if getattr(func, "cacheable", True) is False:
+        return None
+    source = field_source(func)
+    if source is None:
+        return None
+    filepath, func_name = source
+    try:
+        st = Path(filepath).stat()
+        key = (filepath, st.st_mtime_ns, st.st_size)
+        digest = _file_digests.get(key)
+        if digest is None:
+            digest = _file_digests[key] = hashlib.sha1(Path(filepath).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+    return f"{field_name}={func_name}@{digest}/{context}"
+
+
+def _stat_key(entry_ctx: Entry) -> tuple[int, int, int, int, int] | None:
+    st = entry_ctx.stat()
+    if st is None:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
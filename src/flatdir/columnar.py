@@ -0,0 +1,332 @@
+"""Write flatdir entries column-wise: CSV, Parquet, Arrow or SQLite (``--format``).
+
+Entries are consumed in batches of :data:`DEFAULT_BATCH_SIZE` and each batch
+is turned into columns, so the listing is never held as a whole. Parquet and
+Arrow (the IPC file format, also known as Feather v2) need the optional
+``pyarrow`` package; CSV and SQLite only use the standard library.
+
+The columns are fixed when the first batch is written: the keys met in that
+batch, in order, followed by the active fields it did not contain. Column
+types come from the return annotations of the field plugins (``-> int | None``
+gives an integer column), or else from the values of the first batch.
+Values that do not fit the type of their column are written as null, nested
+values (lists and objects) as JSON text, and keys first met after the first
+batch are left out, except in SQLite where they get a new column.
+
+SQLite output goes to a table (``entries``, or ``FILE#TABLE``) indexed on
+``path``, ``name`` and ``type``, and updates it in place: entries are upserted
+on ``(path, name)``, rows left unchanged are not rewritten, and rows of
+entries no longer listed are deleted, all in one transaction, so the table
+always mirrors a complete run for the readers of the database. Every entry
+must therefore have a ``path`` and a ``name``; one that lacks either raises
+ValueError and leaves the table as it was.
+"""
+
+from __future__ import annotations
+
+import csv
+import inspect
+import itertools
+import json
+import sqlite3
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from .joins import _quote
+
+COLUMNAR_FORMATS = ("csv", "parquet", "arrow", "sqlite")
+
+DEFAULT_TABLE = "entries"
+
+# entries per batch, and per row group in Parquet files
+DEFAULT_BATCH_SIZE = 65536
+
+_ANNOTATION_TYPES = {
+    "str": "string",
+    "int": "int",
+    "float": "float",
+    "bool": "bool",
+    "list": "json",
+    "dict": "json",
+}
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def field_schema(fields: dict[str, Callable[..., object]]) -> dict[str, str | None]:
+    """Return the column type of each field plugin, None when its annotation tells none.
+
+    ``name`` and ``path`` are always strings.
+    """
+    schema: dict[str, str | None] = {"name": "string", "path": "string"}
+    for field_name, func in fields.items():
+        if field_name not in schema:
+            schema[field_name] = _annotation_type(func)
+    return schema
+
+
+def _annotation_type(func: Callable[..., object]) -> str | None:
+    try:
+        annotation = inspect.signature(func).return_annotation
+    except (TypeError, ValueError):
+        return None
+    if annotation is inspect.Signature.empty:
+        return None
+    if not isinstance(annotation, str):
+        annotation = getattr(annotation, "__name__", None) or str(annotation)
+    # "int | None", "Optional[int]" and "list[str]" alike
+    text = annotation.replace("Optional[", "").replace("typing.", "")
+    kinds = {part.strip().split("[")[0].rstrip("]") for part in text.split("|")} - {"None"}
+    if len(kinds) != 1:
+        return None
+    return _ANNOTATION_TYPES.get(kinds.pop())
+
+
+def check_format(fmt: str) -> None:
+    """Raise ImportError if the libraries needed to write *fmt* are missing."""
+    if fmt in ("parquet", "arrow"):
+        _import_pyarrow(fmt)
+
+
+def _import_pyarrow(fmt: str) -> object:
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(f"{fmt} output needs the pyarrow package") from None
+    return pyarrow
+
+
+def write_columnar(
+    entries: Iterable[dict[str, object]],
+    target: str | IO[str],
+    fmt: str,
+    schema: dict[str, str | None] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write *entries* in the columnar format *fmt* to *target* and return their number.
+
+    *target* is a file path, or for CSV an open text stream, or for SQLite
+    ``FILE#TABLE``; *schema* maps field names to column types, as returned by
+    :func:`field_schema`.
+    Raises ImportError for Parquet and Arrow without pyarrow.
+    """
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"unknown columnar format {fmt!r}, expected one of: {', '.join(COLUMNAR_FORMATS)}")
+    batches = _batches(entries, batch_size)
+    first = next(batches, [])
+    columns = _columns(first, schema or {})
+    if fmt == "csv":
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8", newline="") as f:
+                return _write_csv(itertools.chain([first], batches), f, columns)
+        return _write_csv(itertools.chain([first], batches), target, columns)
+    if not isinstance(target, str):
+        raise ValueError(f"{fmt} output needs a file path")
+    if fmt == "sqlite":
+        return _write_sqlite(itertools.chain([first], batches), target, columns)
+    return _write_arrow(itertools.chain([first], batches), target, columns, fmt)
+
+
+def _batches(entries: Iterable[dict[str, object]], batch_size: int) -> Iterator[list[dict[str, object]]]:
+    iterator = iter(entries)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _columns(first: list[dict[str, object]], schema: dict[str, str | None]) -> dict[str, str]:
+    """Return the ``{column: type}`` of the output, from the first batch and *schema*."""
+    names: dict[str, None] = {}
+    for entry in first:
+        names.update(dict.fromkeys(entry))
+    names.update(dict.fromkeys(schema))
+    return {name: schema.get(name) or _infer_type(entry.get(name) for entry in first) for name in names}
+
+
+def _infer_type(values: Iterable[object]) -> str:
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds:
+        return "string"
+    if kinds == {bool}:
+        return "bool"
+    if kinds == {int}:
+        return "int"
+    if kinds <= {int, float}:
+        return "float"
+    if kinds == {str}:
+        return "string"
+    return "json"
+
+
+def _coerce(value: object, kind: str) -> object:
+    """Return *value* as stored in a column of type *kind* (None if it does not fit)."""
+    if value is None:
+        return None
+    if kind == "string":
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return value if kind == "bool" else None
+    if kind == "int":
+        return value if isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX else None
+    if kind == "float":
+        return float(value) if isinstance(value, (int, float)) else None
+    return None
+
+
+def _write_csv(batches: Iterable[list[dict[str, object]]], fp: IO[str], columns: dict[str, str]) -> int:
+    writer = csv.writer(fp)
+    writer.writerow(columns)
+    count = 0
+    for batch in batches:
+        writer.writerows(
+            [_csv_cell(_coerce(entry.get(name), kind)) for name, kind in columns.items()] for entry in batch
+        )
+        count += len(batch)
+    return count
+
+
+def _csv_cell(value: object) -> object:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _write_arrow(batches: Iterable[list[dict[str, object]]], path: str, columns: dict[str, str], fmt: str) -> int:
+    pa: Any = _import_pyarrow(fmt)
+    schema = pa.schema([(name, _arrow_type(pa, kind)) for name, kind in columns.items()])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    count = 0
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array([_coerce(entry.get(name), kind) for entry in batch], type=schema.field(name).type)
+                for name, kind in columns.items()
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def _arrow_type(pa: Any, kind: str) -> Any:
+    return {
+        "string": pa.string(),
+        "json": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+    }[kind]
+
+
+_SQL_TYPES = {"string": "TEXT", "json": "TEXT", "int": "INTEGER", "float": "REAL", "bool": "INTEGER"}
+
+# columns indexed in SQLite output, besides the unique (path, name) key
+_INDEXED = ("name", "type")
+
+
+def _write_sqlite(batches: Iterable[list[dict[str, object]]], target: str, columns: dict[str, str]) -> int:
+    path, _, table = target.partition("#")
+    table = table or DEFAULT_TABLE
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        # a table from a previous run keeps its columns; missing ones are added
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+        if not existing:
+            definitions = ", ".join(f"{_quote(name)} {_SQL_TYPES[kind]}" for name, kind in _with_key(columns).items())
+            conn.execute(f"CREATE TABLE {_quote(table)} ({definitions})")
+            existing = list(_with_key(columns))
+        kinds = _add_columns(conn, table, existing, columns)
+        quoted = _quote(table)
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(table + '_path_name')} ON {quoted} (path, name)")
+        for name in _INDEXED:
+            if name in kinds:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(table + '_' + name)} ON {quoted} ({_quote(name)})")
+        conn.execute("CREATE TEMP TABLE _seen (path TEXT, name TEXT, PRIMARY KEY (path, name)) WITHOUT ROWID")
+
+        count = 0
+        for batch in batches:
+            new_columns: dict[str, None] = {}
+            for entry in batch:
+                # NULL keys never conflict in the upsert, nor match in the cleanup below
+                if entry.get("path") is None or entry.get("name") is None:
+                    raise ValueError("sqlite output needs a path and a name in every entry")
+                new_columns.update(dict.fromkeys(key for key in entry if key not in kinds))
+            if new_columns:
+                inferred = {name: _infer_type(entry.get(name) for entry in batch) for name in new_columns}
+                kinds = _add_columns(conn, table, list(kinds), inferred, kinds)
+            conn.executemany(_upsert_statement(table, list(kinds)), (
+                [_coerce(entry.get(name), kind) for name, kind in kinds.items()] for entry in batch
+            ))
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp._seen VALUES (?, ?)",
+                ((entry.get("path"), entry.get("name")) for entry in batch),
+            )
+            count += len(batch)
+
+        # entries of the previous run that were not listed again are gone
+        conn.execute(
+            f"DELETE FROM {quoted} WHERE NOT EXISTS "
+            f"(SELECT 1 FROM temp._seen AS s WHERE s.path = {quoted}.path AND s.name = {quoted}.name)"
+        )
+        conn.execute("DROP TABLE temp._seen")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return count
+
+
+def _with_key(columns: dict[str, str]) -> dict[str, str]:
+    # path and name identify rows, so they exist even when no entry has them
+    return {"path": "string", "name": "string", **columns}
+
+
+def _add_columns(
+    conn: sqlite3.Connection,
+    table: str,
+    existing: list[str],
+    columns: dict[str, str],
+    kinds: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """Add the *columns* missing from *table* and return the kind of every column."""
+    kinds = dict(kinds) if kinds is not None else {name: columns.get(name, "string") for name in existing}
+    for name, kind in _with_key(columns).items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {_SQL_TYPES[kind]}")
+            existing.append(name)
+        kinds.setdefault(name, kind)
+    return kinds
+
+
+def _upsert_statement(table: str, names: list[str]) -> str:
+    quoted = [_quote(name) for name in names]
+    updated = [q for q, name in zip(quoted, names) if name not in ("path", "name")]
+    statement = (
+        f"INSERT INTO {_quote(table)} ({', '.join(quoted)}) VALUES ({', '.join('?' * len(quoted))}) "
+        "ON CONFLICT (path, name) DO "
+    )
+    if not updated:
+        return statement + "NOTHING"
+    # rows whose values did not change are left alone
+    return (
+        statement
+        + "UPDATE SET "
+        + ", ".join(f"{q} = excluded.{q}" for q in updated)
+        + " WHERE "
+        + " OR ".join(f"{_quote(table)}.{q} IS NOT excluded.{q}" for q in updated)
+    )
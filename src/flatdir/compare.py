@@ -1,35 +1,190 @@
-"""Comparison logic for flatdir entries."""
+"""Comparison logic for flatdir entries.
+
+Entries are matched on their ``(path, name)`` key. :func:`iter_changes`
+merge-joins two streams already sorted on that key, so comparing snapshots of
+any size only holds one entry of each side in memory; :func:`compare_entries`
+sorts two in-memory lists and runs the same merge.
+
+Each reported entry carries a ``change`` key (``added``, ``removed``,
+``modified`` or ``moved``) and, for the last two, ``changed_fields``: the
+names of the fields whose value differs. Moves and renames are detected when
+identity fields such as ``sha256`` (``extended.py``) or ``inode`` (``inode.py``) are
+given: a removed and an added entry of the same type with the same identity
+are reported once, as the new entry ``moved`` from its old location. A hash
+only identifies a move when exactly one removed and one added entry have it,
+so copies and identical files (such as empty ones) are not paired.
+"""
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from typing import Iterable, Iterator
+
+# fields identifying the same file or directory under another path, by priority
+MOVE_FIELDS = ("sha256", "inode")
+
 
-def compare_entries(old_entries: list[dict[str, object]], new_entries: list[dict[str, object]]) -> list[dict[str, object]]:
+def entry_key(entry: dict[str, object]) -> tuple[str, str]:
+    """Return the ``(path, name)`` key identifying *entry* across snapshots."""
+    return (str(entry.get("path", ".")), str(entry.get("name", "")))
+
+
+def compare_entries(
+    old_entries: list[dict[str, object]],
+    new_entries: list[dict[str, object]],
+    move_fields: tuple[str, ...] = (),
+) -> list[dict[str, object]]:
     """Compare two lists of entries and return a flat list of affected items.
-    
+
     Uses 'path' and 'name' as the unique key for comparison.
-    Entries that have been added, modified, or removed are included.
+    Entries that have been added, modified, moved or removed are included,
+    tagged as described in the module docstring and sorted by key.
+    """
+    # the last entry wins when a key appears twice
+    old_sorted = sorted({entry_key(e): e for e in old_entries}.values(), key=entry_key)
+    new_sorted = sorted({entry_key(e): e for e in new_entries}.values(), key=entry_key)
+    return sorted(iter_changes(old_sorted, new_sorted, move_fields), key=entry_key)
+
+
+def iter_changes(
+    old_entries: Iterable[dict[str, object]],
+    new_entries: Iterable[dict[str, object]],
+    move_fields: tuple[str, ...] = (),
+) -> Iterator[dict[str, object]]:
+    """Merge-join two key-sorted entry streams and yield the changed entries.
+
+    Added, modified and moved entries are the new ones, removed entries the
+    old ones, each copied with its ``change`` tag. Both streams must be
+    sorted by :func:`entry_key`, otherwise ``ValueError`` is raised when the
+    disorder is met.
+
+    Without *move_fields*, changes come out in key order. With them, added
+    and removed entries carrying an identity wait until their counterpart is
+    found (then yielded as ``moved``) or the streams end (then yielded in key
+    order after the others), so only those unmatched entries are held;
+    entries identified by a content hash always wait until the end.
     """
-    old_map = {(str(e.get("path", ".")), str(e.get("name", ""))): e for e in old_entries}
-    new_map = {(str(e.get("path", ".")), str(e.get("name", ""))): e for e in new_entries}
-    
-    changed = []
-    
-    all_keys = set(old_map.keys()) | set(new_map.keys())
-    
-    for key in sorted(all_keys):
-        old_item = old_map.get(key)
-        new_item = new_map.get(key)
-        
-        if old_item is None:
-            # Added
-            changed.append(new_item)
-        elif new_item is None:
-            # Removed (since there's no new item, we include the old one)
-            changed.append(old_item)
+    old_iter = _checked_sorted(old_entries, "old")
+    new_iter = _checked_sorted(new_entries, "new")
+    moves = _MoveMatcher(move_fields) if move_fields else None
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            assert old is not None
+            if moves is not None:
+                yield from moves.removed(old[1])
+            else:
+                yield dict(old[1], change="removed")
+            old = next(old_iter, None)
+        elif old is None or new[0] < old[0]:
+            if moves is not None:
+                yield from moves.added(new[1])
+            else:
+                yield dict(new[1], change="added")
+            new = next(new_iter, None)
         else:
-            # Compare fields
-            if old_item != new_item:
-                # If any field has changed, add the new entry
-                changed.append(new_item)
-                    
-    return changed
+            if old[1] != new[1]:
+                yield dict(new[1], change="modified", changed_fields=changed_fields(old[1], new[1]))
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+    if moves is not None:
+        yield from moves.unmatched()
+
+
+def changed_fields(old: dict[str, object], new: dict[str, object]) -> list[str]:
+    """Return the sorted names of the fields added, removed or changed from *old* to *new*."""
+    return sorted(k for k in old.keys() | new.keys() if old.get(k, _MISSING) != new.get(k, _MISSING))
+
+
+_MISSING = object()
+
+
+# identity fields describing content rather than one file: several files may
+# share their value, so they only pair entries whose value is unique
+CONTENT_FIELDS = ("sha256",)
+
+
+class _MoveMatcher:
+    """Pair removed and added entries sharing an identity into moves.
+
+    Entries are dropped as soon as they are matched. A content identity
+    (see :data:`CONTENT_FIELDS`) only pairs one removed and one added entry
+    if no other removed or added entry has it, which is known once the
+    streams end, so those entries wait until then; empty files, which all
+    share one hash, never use it.
+    """
+
+    def __init__(self, move_fields: tuple[str, ...]) -> None:
+        self._fields = move_fields
+        # (side, identity) -> entries of one side still waiting for the other side
+        self._waiting: dict[tuple[str, tuple[object, str, object]], deque[dict[str, object]]] = {}
+
+    def _identity(self, entry: dict[str, object]) -> tuple[object, str, object] | None:
+        for field in self._fields:
+            value = entry.get(field)
+            if value is None or (field in CONTENT_FIELDS and entry.get("size") == 0):
+                continue
+            return (entry.get("type"), field, value)
+        return None
+
+    def removed(self, entry: dict[str, object]) -> Iterator[dict[str, object]]:
+        yield from self._match("removed", "added", entry)
+
+    def added(self, entry: dict[str, object]) -> Iterator[dict[str, object]]:
+        yield from self._match("added", "removed", entry)
+
+    def _match(self, side: str, other: str, entry: dict[str, object]) -> Iterator[dict[str, object]]:
+        identity = self._identity(entry)
+        if identity is None:
+            yield dict(entry, change=side)
+            return
+        if identity[1] not in CONTENT_FIELDS:
+            waiting = self._waiting.get((other, identity))
+            if waiting:
+                counterpart = waiting.popleft()
+                if not waiting:
+                    del self._waiting[(other, identity)]
+                old, new = (entry, counterpart) if side == "removed" else (counterpart, entry)
+                yield _moved(old, new)
+                return
+        self._waiting.setdefault((side, identity), deque()).append(entry)
+
+    def unmatched(self) -> Iterator[dict[str, object]]:
+        """Yield the moves by content identity and the unmatched entries, in key order."""
+        pending: list[tuple[tuple[str, str], dict[str, object]]] = []
+        for (side, identity), entries in self._waiting.items():
+            if side == "removed" and identity[1] in CONTENT_FIELDS and len(entries) == 1:
+                added = self._waiting.get(("added", identity))
+                if added is not None and len(added) == 1:
+                    moved = _moved(entries.popleft(), added.popleft())
+                    pending.append((entry_key(moved), moved))
+        for (side, _), entries in self._waiting.items():
+            pending.extend((entry_key(entry), dict(entry, change=side)) for entry in entries)
+        self._waiting.clear()
+        pending.sort(key=lambda pair: pair[0])
+        for _, entry in pending:
+            yield entry
+
+
+def _moved(old: dict[str, object], new: dict[str, object]) -> dict[str, object]:
+    path, name = entry_key(old)
+    return dict(
+        new,
+        change="moved",
+        moved_from=name if path == "." else os.path.join(path, name),
+        changed_fields=changed_fields(old, new),
+    )
+
+
+def _checked_sorted(
+    entries: Iterable[dict[str, object]], side: str
+) -> Iterator[tuple[tuple[str, str], dict[str, object]]]:
+    last: tuple[str, str] | None = None
+    for entry in entries:
+        key = entry_key(entry)
+        if last is not None and key < last:
+            raise ValueError(f"{side} entries are not sorted by (path, name)")
+        last = key
+        yield key, entry
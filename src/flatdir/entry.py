@@ -0,0 +1,122 @@
+"""Per-entry context shared by the traversal engine and the field plugins.
+
+An :class:`Entry` wraps a single file or directory found while walking the
+tree. When it comes from ``os.scandir`` it keeps the ``os.DirEntry`` so that
+the entry type is read from the directory listing itself, and ``stat`` is
+called at most once however many fields need it.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+_MISSING = object()
+
+
+class Entry:
+    """Lazily computed, cached filesystem facts about one listed path."""
+
+    __slots__ = ("path", "root", "_dir_entry", "_parts", "_is_dir", "_stat", "_children")
+
+    def __init__(
+        self,
+        path: Path,
+        root: Path,
+        dir_entry: os.DirEntry[str] | None = None,
+        parts: tuple[str, ...] | None = None,
+        is_dir: bool | None = None,
+    ) -> None:
+        self.path = path
+        self.root = root
+        self._dir_entry = dir_entry
+        self._parts = parts
+        self._is_dir = is_dir
+        self._stat: object = _MISSING
+        self._children: list[Entry] | None = None
+
+    @property
+    def name(self) -> str:
+        """The filename or directory name (basename)."""
+        if self._dir_entry is not None:
+            return self._dir_entry.name
+        return self.path.name
+
+    @property
+    def parts(self) -> tuple[str, ...]:
+        """Path components relative to the listing root (the name is the last one)."""
+        if self._parts is None:
+            try:
+                self._parts = self.path.relative_to(self.root).parts
+            except ValueError:
+                self._parts = Path(os.path.relpath(self.path, self.root)).parts
+        return self._parts
+
+    @property
+    def depth(self) -> int:
+        """Number of components below the root: files directly inside it are depth 1."""
+        return len(self.parts)
+
+    @property
+    def parent_path(self) -> str:
+        """Relative path of the parent directory, '.' for direct children of the root."""
+        parts = self.parts
+        return os.path.join(*parts[:-1]) if len(parts) > 1 else "."
+
+    def is_dir(self) -> bool:
+        """Return True for directories (and symlinks to directories)."""
+        if self._is_dir is None:
+            try:
+                if self._dir_entry is not None:
+                    self._is_dir = self._dir_entry.is_dir()
+                else:
+                    self._is_dir = self.path.is_dir()
+            except OSError:
+                self._is_dir = False
+        return self._is_dir
+
+    def is_file(self) -> bool:
+        """Return True for regular files (and symlinks to regular files)."""
+        try:
+            if self._dir_entry is not None:
+                return self._dir_entry.is_file()
+            return self.path.is_file()
+        except OSError:
+            return False
+
+    def is_symlink(self) -> bool:
+        """Return True if the entry itself is a symbolic link."""
+        try:
+            if self._dir_entry is not None:
+                return self._dir_entry.is_symlink()
+            return self.path.is_symlink()
+        except OSError:
+            return False
+
+    def stat(self) -> os.stat_result | None:
+        """Return the cached stat result, or None if the path cannot be stat'ed."""
+        if self._stat is _MISSING:
+            try:
+                if self._dir_entry is not None:
+                    self._stat = self._dir_entry.stat()
+                else:
+                    self._stat = self.path.stat()
+            except OSError:
+                self._stat = None
+        return self._stat  # type: ignore[return-value]
+
+    def children(self) -> list[Entry]:
+        """Return the immediate children of a directory, listed once with ``os.scandir``.
+
+        The listing is cached, so plugins inspecting a directory's content and
+        the traversal descending into it share a single ``scandir`` call.
+        Raises ``OSError`` if the directory cannot be listed.
+        """
+        if self._children is None:
+            parts = self.parts
+            with os.scandir(self.path) as it:
+                self._children = [
+                    Entry(Path(child.path), self.root, child, parts + (child.name,))
+                    for child in it
+                ]
+        return self._children
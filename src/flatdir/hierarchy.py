@@ -0,0 +1,351 @@
+"""Build hierarchical views (``--tree`` and ``--nested``) from flat entries.
+
+Both builders run in time linear in the number of entries: the relative path
+of each distinct directory is split once, and children are found through a
+``name -> child`` index instead of scanning the children already attached,
+so a directory with hundreds of thousands of entries costs no more per entry
+than a small one.
+
+:func:`write_tree_stream` and :func:`write_nested_stream` write the same
+layouts without building them, from entries in traversal order.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from .output import ChunkedWriter, Encode
+
+Node = dict[str, object]
+
+
+def build_tree(entries: Iterable[dict[str, object]], root_name: str) -> Node:
+    """Convert flat entries into a D3.js compliant tree of ``name``/``children`` nodes.
+
+    Each node carries the fields of its entry except ``path``; intermediate
+    directories without an entry of their own get a node with their name only.
+    Children keep the order in which they are first met.
+    """
+    tree_root: Node = {"name": root_name}
+    # id(node) -> {child name: child}, the first child of each name
+    index: dict[int, dict[str, Node]] = {}
+    # relative path -> node of that directory
+    directories: dict[str, Node] = {}
+
+    def child(node: Node, name: str) -> Node:
+        children = index.get(id(node))
+        if children is None:
+            children = index[id(node)] = {}
+        found = children.get(name)
+        if found is None:
+            found = children[name] = {"name": name}
+            node.setdefault("children", []).append(found)  # type: ignore[union-attr]
+        return found
+
+    for entry in entries:
+        path_val = entry.get("path")
+        name_val = entry.get("name")
+        if not isinstance(path_val, str) or not isinstance(name_val, str):
+            continue
+
+        parent = directories.get(path_val)
+        if parent is None:
+            parent = tree_root
+            for part in Path(path_val).parts:
+                if part != ".":
+                    parent = child(parent, part)
+            directories[path_val] = parent
+
+        # the entry of the listed directory itself describes the root
+        if parent is tree_root and name_val == root_name:
+            target = tree_root
+        else:
+            target = child(parent, name_val)
+        for k, v in entry.items():
+            if k != "path" and k != "name":
+                target[k] = v
+
+    return tree_root
+
+
+def build_nested(entries: Iterable[dict[str, object]]) -> dict[str, object]:
+    """Convert flat entries into nested dicts keyed by name, following ``path``.
+
+    An entry's fields (except ``name`` and ``path``) and its children share the
+    same dict; a directory met before its own entry is created empty and
+    filled in when the entry comes.
+    """
+    nested_dict: dict[str, object] = {}
+    # relative path -> its parts, split once per directory
+    split: dict[str, tuple[str, ...]] = {}
+    for entry in entries:
+        name_val = entry.get("name")
+        path_val = entry.get("path")
+        if not isinstance(name_val, str) or not isinstance(path_val, str):
+            continue
+
+        parts = split.get(path_val)
+        if parts is None:
+            parts = split[path_val] = () if path_val == "." else Path(path_val).parts
+
+        current: dict[str, object] = nested_dict
+        for part in parts:
+            node = current.get(part)
+            if not isinstance(node, dict):
+                node = current[part] = {}
+            current = node
+
+        entry_data = {k: v for k, v in entry.items() if k != "name" and k != "path"}
+        existing = current.get(name_val)
+        if isinstance(existing, dict):
+            existing.update(entry_data)
+        else:
+            current[name_val] = entry_data
+
+    return nested_dict
+
+
+def write_tree_stream(
+    entries: Iterable[dict[str, object]],
+    fp: TextIO,
+    root_name: str,
+    indent: int | None = 4,
+    encode: Encode | None = None,
+) -> int:
+    """Write the :func:`build_tree` layout of *entries* to *fp* as they come.
+
+    *entries* must be in traversal order (see :func:`write_hierarchy_stream`),
+    which the unsorted :func:`flatdir.listing.iter_entries` produces. With the
+    default *indent*, the output is byte-identical to ``json.dump(build_tree(
+    entries, root_name), fp, indent=4)``, except that a directory without an
+    entry of its own comes before its later listed siblings instead of after
+    them; ``indent=None`` writes one compact line. With *encode* (see
+    :func:`flatdir.output.get_encoder`), the line has no spaces after
+    separators and values are serialised by *encode*. Returns the number of
+    entries written.
+    """
+    return write_hierarchy_stream(entries, fp, _TreeLayout(root_name), indent, encode)
+
+
+def write_nested_stream(
+    entries: Iterable[dict[str, object]], fp: TextIO, indent: int | None = 4, encode: Encode | None = None
+) -> int:
+    """Write the :func:`build_nested` layout of *entries* to *fp* as they come.
+
+    Same requirements and output guarantees as :func:`write_tree_stream`.
+    """
+    return write_hierarchy_stream(entries, fp, _NestedLayout(), indent, encode)
+
+
+def write_hierarchy_stream(
+    entries: Iterable[dict[str, object]],
+    fp: TextIO,
+    layout: _Layout,
+    indent: int | None = 4,
+    encode: Encode | None = None,
+) -> int:
+    """Write *entries* as the hierarchy described by *layout*, holding only open directories.
+
+    Traversal order means that the entries of a directory are contiguous and
+    that each subdirectory is fully listed (its whole subtree) before the next
+    sibling subdirectory, as in a depth-first walk. A directory's entries are
+    then held until its subdirectories are written, so memory is bounded by
+    the listings of the directories on the current path instead of the tree.
+    Directories with listed content but no entry of their own (filtered out)
+    get a node with their name only.
+    """
+    chunks = ChunkedWriter(fp)
+    writer = _JsonWriter(chunks, indent, encode)
+    layout.open_root(writer)
+    stack = [_Frame(())]
+    count = 0
+    split: dict[str, tuple[str, ...]] = {}
+    for entry in entries:
+        path_val = entry.get("path")
+        name_val = entry.get("name")
+        if not isinstance(path_val, str) or not isinstance(name_val, str):
+            continue
+        parts = split.get(path_val)
+        if parts is None:
+            if len(split) > _SPLIT_CACHE_SIZE:
+                split.clear()
+            parts = split[path_val] = tuple(part for part in Path(path_val).parts if part != ".")
+
+        # close the directories left behind and open the ones leading to parts
+        while stack[-1].parts != parts:
+            top = stack[-1]
+            depth = len(top.parts)
+            if parts[:depth] != top.parts:
+                _close_frame(writer, layout, stack.pop())
+                continue
+            next_name = parts[depth]
+            node_entry: dict[str, object] = {"name": next_name}
+            if next_name in top.pending:
+                while True:
+                    name, pending_entry = top.pending.popitem(last=False)
+                    if name == next_name:
+                        node_entry = pending_entry
+                        break
+                    layout.leaf(writer, pending_entry, top)
+            layout.open_node(writer, node_entry, top)
+            stack.append(_Frame(parts[: depth + 1]))
+
+        pending = stack[-1].pending
+        if name_val in pending:
+            pending[name_val] = {**pending[name_val], **entry}
+        else:
+            pending[name_val] = entry
+        count += 1
+
+    while len(stack) > 1:
+        _close_frame(writer, layout, stack.pop())
+    _flush_pending(writer, layout, stack[0])
+    layout.close_root(writer, stack[0])
+    chunks.write("\n")
+    chunks.flush()
+    return count
+
+
+_SPLIT_CACHE_SIZE = 1 << 16
+
+
+class _Frame:
+    """An open directory: its parts and its entries not written yet, in order."""
+
+    __slots__ = ("parts", "pending", "has_children")
+
+    def __init__(self, parts: tuple[str, ...]) -> None:
+        self.parts = parts
+        self.pending: OrderedDict[str, dict[str, object]] = OrderedDict()
+        self.has_children = False
+
+
+def _flush_pending(writer: _JsonWriter, layout: _Layout, frame: _Frame) -> None:
+    while frame.pending:
+        layout.leaf(writer, frame.pending.popitem(last=False)[1], frame)
+
+
+def _close_frame(writer: _JsonWriter, layout: _Layout, frame: _Frame) -> None:
+    _flush_pending(writer, layout, frame)
+    layout.close_node(writer, frame)
+
+
+class _JsonWriter:
+    """Write a JSON document piece by piece, formatted like ``json.dump``."""
+
+    def __init__(self, fp: ChunkedWriter, indent: int | None, encode: Encode | None = None) -> None:
+        self._fp = fp
+        self._indent = None if encode is not None else indent
+        self._encode = encode
+        self._separator = "," if encode is not None else ", "
+        self._colon = ":" if encode is not None else ": "
+        # number of items written in each open container
+        self._counts: list[int] = []
+
+    def _prefix(self, key: str | None) -> str:
+        prefix = ""
+        if self._counts:
+            written = self._counts[-1]
+            self._counts[-1] += 1
+            if self._indent is None:
+                prefix = self._separator if written else ""
+            else:
+                prefix = ("," if written else "") + "\n" + " " * (self._indent * len(self._counts))
+        if key is not None:
+            prefix += json.dumps(key, ensure_ascii=False) + self._colon
+        return prefix
+
+    def begin(self, key: str | None, bracket: str) -> None:
+        self._fp.write(self._prefix(key) + bracket)
+        self._counts.append(0)
+
+    def end(self, bracket: str) -> None:
+        written = self._counts.pop()
+        if written and self._indent is not None:
+            self._fp.write("\n" + " " * (self._indent * len(self._counts)))
+        self._fp.write(bracket)
+
+    def member(self, key: str, value: object) -> None:
+        if self._encode is not None:
+            text = self._encode(value)
+        else:
+            text = json.dumps(value, ensure_ascii=False, indent=self._indent)
+        if self._indent is not None:
+            text = text.replace("\n", "\n" + " " * (self._indent * len(self._counts)))
+        self._fp.write(self._prefix(key) + text)
+
+
+class _Layout(ABC):
+    """How nodes of a streamed hierarchy are written."""
+
+    @abstractmethod
+    def open_root(self, writer: _JsonWriter) -> None:
+        ...
+
+    @abstractmethod
+    def close_root(self, writer: _JsonWriter, frame: _Frame) -> None:
+        ...
+
+    @abstractmethod
+    def open_node(self, writer: _JsonWriter, entry: dict[str, object], parent: _Frame) -> None:
+        ...
+
+    @abstractmethod
+    def close_node(self, writer: _JsonWriter, frame: _Frame) -> None:
+        ...
+
+    def leaf(self, writer: _JsonWriter, entry: dict[str, object], parent: _Frame) -> None:
+        self.open_node(writer, entry, parent)
+        self.close_node(writer, _Frame(()))
+
+
+class _TreeLayout(_Layout):
+    """``{"name": ..., fields..., "children": [...]}`` nodes, as :func:`build_tree`."""
+
+    def __init__(self, root_name: str) -> None:
+        self.root_name = root_name
+
+    def open_root(self, writer: _JsonWriter) -> None:
+        writer.begin(None, "{")
+        writer.member("name", self.root_name)
+
+    def close_root(self, writer: _JsonWriter, frame: _Frame) -> None:
+        self.close_node(writer, frame)
+
+    def open_node(self, writer: _JsonWriter, entry: dict[str, object], parent: _Frame) -> None:
+        if not parent.has_children:
+            writer.begin("children", "[")
+            parent.has_children = True
+        writer.begin(None, "{")
+        writer.member("name", entry["name"])
+        for k, v in entry.items():
+            if k != "path" and k != "name":
+                writer.member(k, v)
+
+    def close_node(self, writer: _JsonWriter, frame: _Frame) -> None:
+        if frame.has_children:
+            writer.end("]")
+        writer.end("}")
+
+
+class _NestedLayout(_Layout):
+    """Objects keyed by name holding fields then children, as :func:`build_nested`."""
+
+    def open_root(self, writer: _JsonWriter) -> None:
+        writer.begin(None, "{")
+
+    def close_root(self, writer: _JsonWriter, frame: _Frame) -> None:
+        writer.end("}")
+
+    def open_node(self, writer: _JsonWriter, entry: dict[str, object], parent: _Frame) -> None:
+        writer.begin(str(entry["name"]), "{")
+        for k, v in entry.items():
+            if k != "path" and k != "name":
+                writer.member(k, v)
+
+    def close_node(self, writer: _JsonWriter, frame: _Frame) -> None:
+        writer.end("}")
@@ -0,0 +1,118 @@
+"""Reuse the entries of a previous run for directories that did not change.
+
+Adding, removing or renaming an entry updates the modification time of its
+directory, so when a directory still has the mtime recorded in a previous
+flatdir output, the entries listed under it can be taken from that output
+instead of listing and stat'ing its content again. Subdirectories are always
+checked (their own mtime tells whether their content changed).
+
+Files modified in place do not change their directory's mtime: their stored
+entries are reused as they are, which suits append-only trees. The previous
+output must come from a run with the same options and fields, and must not
+have been filtered: a directory whose entry (with its ``type`` and ``mtime``)
+is missing from it is listed again, but a subdirectory that neither appears
+nor has entries listed below it is not known to exist. It must also tell when
+it was generated (``--with-headers``): an mtime only proves that nothing
+changed if it is older than the previous run, since a change made within the
+same second (or the file system's mtime granularity) leaves it as it was.
+Entries listed with ``--absolute`` are found by their absolute path.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from pathlib import Path
+
+from .entry import Entry
+from .plugins import defaults as _defaults
+
+
+class ReusedEntry(Entry):
+    """A file whose entry is taken unchanged from the previous output."""
+
+    __slots__ = ("record",)
+
+    def __init__(self, path: Path, root: Path, parts: tuple[str, ...], record: dict[str, object]) -> None:
+        super().__init__(path, root, parts=parts, is_dir=False)
+        self.record = record
+
+
+class PreviousIndex:
+    """Entries of a previous run grouped by the directory that contains them."""
+
+    def __init__(self, entries: list[dict[str, object]], generated_at: float) -> None:
+        self._mtimes: dict[tuple[str, ...], object] = {}
+        self._children: dict[tuple[str, ...], list[tuple[str, dict[str, object]]]] = {}
+        self._subdirs: dict[tuple[str, ...], set[str]] = {}
+        # directories modified during the second the previous run finished may
+        # have changed again without their (second resolution) mtime moving
+        self._before = int(generated_at)
+        # paths written by --absolute, keyed by their absolute parts
+        self._absolute = False
+
+        for record in entries:
+            name, path = record.get("name"), record.get("path")
+            if not isinstance(name, str) or not isinstance(path, str):
+                continue
+            parent = () if path == "." else Path(path).parts
+            self._absolute = self._absolute or Path(path).is_absolute()
+            if record.get("type") == "directory":
+                self._mtimes[parent + (name,)] = record.get("mtime")
+                self._subdirs.setdefault(parent, set()).add(name)
+            else:
+                self._children.setdefault(parent, []).append((name, record))
+            # directories holding listed entries exist even if filtered out themselves
+            for i in range(len(parent)):
+                self._subdirs.setdefault(parent[:i], set()).add(parent[i])
+
+    @classmethod
+    def from_file(cls, json_path: str | Path) -> PreviousIndex:
+        """Load a flatdir JSON output (plain list or ``--with-headers`` envelope)."""
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as exc:
+            raise ValueError(f"error reading previous output: {exc}") from exc
+
+        generated_at: float | None = None
+        if isinstance(data, dict) and "entries" in data:
+            headers = data.get("headers")
+            if isinstance(headers, dict) and isinstance(headers.get("generated_at"), str):
+                try:
+                    generated_at = datetime.datetime.fromisoformat(headers["generated_at"]).timestamp()
+                except ValueError:
+                    pass
+            data = data["entries"]
+        if not isinstance(data, list) or not all(isinstance(entry, dict) for entry in data):
+            raise ValueError("previous output must be a flat flatdir list of entries")
+        if generated_at is None:
+            raise ValueError("previous output must be written with --with-headers (its generated_at is needed)")
+        return cls(data, generated_at)
+
+    def children(self, parent: Entry) -> list[Entry] | None:
+        """Rebuild the children of *parent* from the previous output, None if it changed.
+
+        Files come back as :class:`ReusedEntry`; subdirectories as plain
+        entries so that they are checked and processed again.
+        """
+        parts = parent.parts
+        key = parent.root.parts + parts if self._absolute else parts
+        if not parts or key not in self._mtimes:
+            return None
+        st = parent.stat()
+        if st is None or st.st_mtime >= self._before:
+            return None
+        if _defaults.mtime(parent.path, parent.root, parent) != self._mtimes[key]:
+            return None
+
+        root = parent.root
+        children: list[Entry] = [
+            Entry(parent.path / name, root, parts=parts + (name,), is_dir=True)
+            for name in sorted(self._subdirs.get(key, ()))
+        ]
+        children.extend(
+            ReusedEntry(parent.path / name, root, parts + (name,), record)
+            for name, record in self._children.get(key, ())
+        )
+        return children
@@ -0,0 +1,173 @@
+"""Join entries with the rows of an external database file (``--join``).
+
+A join is given as ``(file, remote_key, local_key)``, optionally followed by
+``as_key`` and ``columns``. ``remote_key`` and ``local_key`` may name several
+comma-separated keys, compared pairwise. The database is read once per run and
+indexed by its remote key values, so each entry is matched with one dict
+lookup instead of a scan of every row.
+
+Without ``as_key``, the first matching row is merged into the entry (all its
+keys but the remote ones). With ``as_key``, every matching row is collected,
+in file order, into a list stored under ``as_key`` (one-to-many join).
+``columns`` (comma-separated) restricts the keys taken from each row.
+
+The database format follows the file extension: ``.csv`` / ``.tsv`` (values
+are strings), ``.ndjson`` / ``.jsonl``, ``.db`` / ``.sqlite`` / ``.sqlite3``
+(``FILE#TABLE`` names the table, which defaults to the table named like the
+file or to the only table) and JSON otherwise (an array of objects or a
+single object). Rows are read one at a time and only the key and wanted
+columns are kept in the index. A missing or unreadable database matches
+nothing.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterator, Sequence
+
+JoinSpec = Sequence[str]
+
+
+class Join:
+    """One ``--join`` with its database indexed by remote key values."""
+
+    def __init__(self, spec: JoinSpec) -> None:
+        filename, remote_key, local_key, *rest = spec
+        self.filename = filename
+        self.remote_keys = _split_keys(remote_key)
+        self.local_keys = _split_keys(local_key)
+        if len(self.remote_keys) != len(self.local_keys):
+            raise ValueError(f"join {filename}: {remote_key!r} and {local_key!r} have different key counts")
+        self.as_key = rest[0] if rest and rest[0] else None
+        self.columns = _split_keys(rest[1]) if len(rest) > 1 and rest[1] else None
+        wanted = self.remote_keys + self.columns if self.columns is not None else None
+        self.index = _build_index(_load_rows(filename, wanted), self.remote_keys, wanted)
+
+    def apply(self, entry: dict[str, object]) -> None:
+        """Merge the matching rows into *entry* (in place)."""
+        values = []
+        for local_key in self.local_keys:
+            value = entry.get(local_key)
+            if value is None:
+                return
+            values.append(str(value))
+        rows = self.index.get(tuple(values))
+        if self.as_key is not None:
+            if rows:
+                entry[self.as_key] = [self._payload(row) for row in rows]
+            return
+        if rows:
+            entry.update(self._payload(rows[0]))
+
+    def _payload(self, row: dict[str, object]) -> dict[str, object]:
+        return {k: v for k, v in row.items() if k not in self.remote_keys}
+
+
+def prepare_joins(joins: Sequence[JoinSpec] | None) -> list[Join]:
+    """Load and index the databases of *joins*, in order."""
+    return [Join(spec) for spec in joins or ()]
+
+
+def _split_keys(keys: str) -> tuple[str, ...]:
+    return tuple(key.strip() for key in keys.split(","))
+
+
+def _load_rows(filename: str, columns: tuple[str, ...] | None) -> Iterator[dict[str, object]]:
+    """Yield the rows of the database *filename*, restricted to *columns* if possible."""
+    path_str, _, table = filename.partition("#")
+    path = Path(path_str).resolve()
+    suffix = path.suffix.lower()
+    try:
+        if suffix in (".csv", ".tsv"):
+            yield from _csv_rows(path, "\t" if suffix == ".tsv" else ",")
+        elif suffix in (".ndjson", ".jsonl"):
+            yield from _ndjson_rows(path)
+        elif suffix in (".db", ".sqlite", ".sqlite3"):
+            yield from _sqlite_rows(path, table or None, columns)
+        else:
+            yield from _json_rows(path)
+    except (OSError, UnicodeDecodeError, csv.Error, sqlite3.Error):
+        return
+
+
+def _json_rows(path: Path) -> Iterator[dict[str, object]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        return
+    if isinstance(data, dict):
+        yield data
+    elif isinstance(data, list):
+        yield from (row for row in data if isinstance(row, dict))
+
+
+def _ndjson_rows(path: Path) -> Iterator[dict[str, object]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict):
+                yield row
+
+
+def _csv_rows(path: Path, delimiter: str) -> Iterator[dict[str, object]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            # empty cells count as missing, like null values in JSON
+            yield {k: v for k, v in row.items() if k is not None and v not in (None, "")}
+
+
+def _sqlite_rows(path: Path, table: str | None, columns: tuple[str, ...] | None) -> Iterator[dict[str, object]]:
+    if not path.is_file():
+        return
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        if table is None:
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            if path.stem in tables:
+                table = path.stem
+            elif len(tables) == 1:
+                table = tables[0]
+            else:
+                return
+        available = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+        selected = [c for c in available if columns is None or c in columns]
+        if not selected:
+            return
+        cursor = conn.execute(f"SELECT {', '.join(map(_quote, selected))} FROM {_quote(table)}")
+        for values in cursor:
+            yield {k: v for k, v in zip(selected, values) if v is not None}
+    finally:
+        conn.close()
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _build_index(
+    rows: Iterator[dict[str, object]],
+    remote_keys: tuple[str, ...],
+    columns: tuple[str, ...] | None = None,
+) -> dict[tuple[str, ...], list[dict[str, object]]]:
+    index: dict[tuple[str, ...], list[dict[str, object]]] = {}
+    for row in rows:
+        values = []
+        for key in remote_keys:
+            value = row.get(key)
+            if value is None:
+                break
+            values.append(str(value))
+        else:
+            if columns is not None:
+                row = {k: v for k, v in row.items() if k in columns}
+            index.setdefault(tuple(values), []).append(row)
+    return index
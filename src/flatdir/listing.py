@@ -6,16 +6,27 @@ Each entry is a dict with keys determined by field plugins (defaults: name, type
 from __future__ import annotations
 
 import functools
+import itertools
 import json
 import os
 import re
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator, NamedTuple, TypeVar
 
+from .cache import FieldCache
+from .entry import Entry
+from .incremental import PreviousIndex, ReusedEntry
+from .joins import Join, JoinSpec, prepare_joins
 from .plugins import defaults as _defaults
-from .plugins_loader import load_fields_file
+from .plugins import options as plugin_options
+from .plugins_loader import field_source, load_fields_file, takes_entry
+from .sidecars import JsonCache, Pointer, parse_pointer
+from .sorting import sort_key, top_k
 
-FieldFunc = Callable[[Path, Path], object]
+FieldFunc = Callable[..., object]
+T = TypeVar("T")
 
 # built-in default fields, loaded once
 DEFAULT_FIELDS = load_fields_file(_defaults.__file__)
@@ -36,15 +47,99 @@ def list_entries(
     add_fields: dict[str, object] | None = None,
     dict_fields: list[tuple[str, str | None]] | None = None,
     include_jsons: list[tuple[str, str | None]] | None = None,
-    joins: list[tuple[str, str, str]] | None = None,
+    joins: list[JoinSpec] | None = None,
     match: str | None = None,
     sort_by: str | None = None,
     sort_desc: bool = False,
     ignore_typical: bool = False,
     use_defaults: bool = True,
     absolute: bool = False,
+    workers: int | None = None,
+    processes: int | None = None,
+    prune: bool = False,
+    cache: FieldCache | None = None,
+    previous: PreviousIndex | None = None,
+    json_cache: JsonCache | None = None,
 ) -> list[dict[str, object]]:
-    entries: list[dict[str, object]] = []
+    entries = iter_entries(
+        root,
+        depth=depth,
+        min_depth=min_depth,
+        add_depth=add_depth,
+        fields=fields,
+        exclude=exclude,
+        only=only,
+        add_fields=add_fields,
+        dict_fields=dict_fields,
+        include_jsons=include_jsons,
+        joins=joins,
+        match=match,
+        ignore_typical=ignore_typical,
+        use_defaults=use_defaults,
+        absolute=absolute,
+        workers=workers,
+        processes=processes,
+        prune=prune,
+        cache=cache,
+        previous=previous,
+        json_cache=json_cache,
+    )
+    key = sort_key(sort_by if sort_by else "name")
+
+    # with a limit, keep only the best entries on a bounded heap instead of
+    # sorting the whole list and slicing it
+    if limit is not None and limit >= 0:
+        return top_k(entries, key, limit, reverse=sort_desc)
+
+    # return a sorted list of entries
+    return sorted(entries, key=key, reverse=sort_desc)
+
+
+def iter_entries(
+    root: Path,
+    depth: int | None = None,
+    min_depth: int | None = None,
+    add_depth: int | None = None,
+    fields: dict[str, object] | None = None,
+    exclude: list[tuple[str, str]] | None = None,
+    only: list[tuple[str, str]] | None = None,
+    add_fields: dict[str, object] | None = None,
+    dict_fields: list[tuple[str, str | None]] | None = None,
+    include_jsons: list[tuple[str, str | None]] | None = None,
+    joins: list[JoinSpec] | None = None,
+    match: str | None = None,
+    ignore_typical: bool = False,
+    use_defaults: bool = True,
+    absolute: bool = False,
+    workers: int | None = None,
+    processes: int | None = None,
+    prune: bool = False,
+    cache: FieldCache | None = None,
+    previous: PreviousIndex | None = None,
+    json_cache: JsonCache | None = None,
+) -> Iterator[dict[str, object]]:
+    """Yield entries one by one in traversal order, without sorting them.
+
+    Takes the same options as :func:`list_entries` except ``limit`` and the
+    sort options; nothing is accumulated, so memory stays flat however large
+    the tree is.
+
+    With *prune*, the walk does not descend into directories excluded by an
+    ``exclude`` rule (their whole subtree is dropped) nor into directories
+    that cannot contain an entry allowed by an ``only`` rule on ``path``.
+
+    With a *cache* (see :class:`flatdir.cache.FieldCache`), plugin field values
+    of unchanged entries are read back from it instead of being recomputed,
+    and fresh values are stored for the next run.
+
+    With *previous* (see :class:`flatdir.incremental.PreviousIndex`), the
+    entries below directories whose mtime did not change since that output
+    are taken from it instead of being listed and computed again.
+
+    The sidecar files of *dict_fields* and *include_jsons* are read through
+    *json_cache* (see :class:`flatdir.sidecars.JsonCache`), by default a
+    cache with the default byte budget living for this call only.
+    """
     root = root.resolve()
 
     # merge default fields with custom fields (custom can override defaults)
@@ -60,193 +155,655 @@ def list_entries(
     if match:
         pattern = re.compile(match)
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        base = Path(dirpath)
-        # check depth constraint
-        current_depth = len(base.relative_to(root).parts)
-        if depth is not None and depth >= 0 and current_depth > depth:
-            continue
+    if workers is not None and workers > 1 and processes is not None and processes > 1:
+        raise ValueError("use either workers or processes, not both")
+
+    if json_cache is None and (dict_fields or include_jsons):
+        json_cache = JsonCache()
+
+    bound_fields = _bind_fields(all_fields)
+    plan = _plan_filters(bound_fields, exclude, only, pattern, add_fields, dict_fields, include_jsons, joins)
+
+    descend: Callable[[Entry], bool] | None = None
+    if prune:
+        path_is_default = all_fields.get("path", _defaults.path) in (_defaults.path, DEFAULT_FIELDS["path"])
+        # only a directory excluded by its own name takes its subtree along:
+        # a path rule matches the parent of an entry, so it never covers the
+        # entries further down, and a type rule would prune every directory
+        subtree_exclude = [rule for rule in plan.early_exclude if rule[0] in _SUBTREE_FIELDS]
+        descend = functools.partial(
+            _should_descend,
+            bound_fields=[field for field in bound_fields if field[0] in {name for name, _ in subtree_exclude}],
+            exclude=subtree_exclude,
+            allowed_paths=_allowed_paths(plan.early_only) if path_is_default else None,
+        )
+
+    sources: list[tuple[str, str, str]] = []
+    if processes is not None and processes > 1:
+        # the fields read by early filters are computed here, before shipping
+        bound_fields, sources = _split_shippable_fields(bound_fields, keep=plan.early_fields)
+
+    if cache is not None:
+        # fields shipped to worker processes are cached by the workers themselves
+        local_fields = {name: func for name, func, _ in bound_fields if func is not None}
+        cache.track(local_fields, root, skip=tuple(DEFAULT_FIELDS.values()))
+
+    prefilter = functools.partial(
+        _prefilter, bound_fields=bound_fields, min_depth=min_depth, plan=plan, cache=cache
+    )
+    process = functools.partial(
+        _process_entry,
+        bound_fields=bound_fields,
+        min_depth=min_depth,
+        add_fields=add_fields,
+        add_depth=add_depth,
+        dict_fields=dict_fields,
+        include_jsons=include_jsons,
+        joins=prepare_joins(joins),
+        plan=plan,
+        cache=cache,
+        json_cache=json_cache,
+    )
 
-        if ignore_typical:
-            dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS and not d.endswith(".egg-info")]
-            filenames = [f for f in filenames if f not in IGNORE_FILES and not f.endswith(".pyc")]
-
-        # process subdirectories at this level
-        # We use a copy of dirnames for iteration if we plan to prune it for os.walk
-        for dirname in list(dirnames):
-            p = (base / dirname).resolve()
-            entry = _process_entry(
-                p, root, all_fields, 
-                current_depth + 1, min_depth, 
-                add_fields, add_depth,
-                dict_fields=dict_fields,
-                include_jsons=include_jsons,
-                joins=joins,
-                exclude=exclude,
-                only=only,
-                pattern=pattern
+    try:
+        yield from _run(
+            root, depth, ignore_typical, descend, prefilter, process, sources, workers, processes, cache, previous
+        )
+    finally:
+        if cache is not None:
+            cache.commit()
+
+
+def _run(
+    root: Path,
+    depth: int | None,
+    ignore_typical: bool,
+    descend: Callable[[Entry], bool] | None,
+    prefilter: Callable[[Entry, int], _FieldValues | None],
+    process: Callable[..., dict[str, object] | None],
+    sources: list[tuple[str, str, str]],
+    workers: int | None,
+    processes: int | None,
+    cache: FieldCache | None,
+    previous: PreviousIndex | None,
+) -> Iterator[dict[str, object]]:
+    """Walk *root* and yield the processed entries, serially or on the requested pool."""
+    if workers is not None and workers > 1:
+        # scan directories and evaluate fields on a thread pool; results are
+        # collected in walk order so the output does not depend on scheduling
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            walked = _walk(
+                root, depth, ignore_typical, descend, previous, executor=executor, prefetch=workers * 2
             )
+            for entry in _ordered_map(executor, process, walked, window=workers * 4):
+                if entry:
+                    yield entry
+    elif sources:
+        # compute the fields of batches of entries in worker processes, the
+        # walk itself and the filters stay in this process
+        walked = _walk(root, depth, ignore_typical, descend, previous)
+        assert processes is not None
+        for entry in _process_in_workers(root, walked, prefilter, process, sources, processes, cache):
             if entry:
-                entries.append(entry)
-
-        # process files at this level
-        for filename in filenames:
-            p = (base / filename).resolve()
-            entry = _process_entry(
-                p, root, all_fields, 
-                current_depth + 1, min_depth, 
-                add_fields, add_depth,
-                joins=joins,
-                exclude=exclude,
-                only=only,
-                pattern=pattern
-            )
+                yield entry
+    else:
+        for entry_ctx, item_depth in _walk(root, depth, ignore_typical, descend, previous):
+            entry = process(entry_ctx, item_depth)
             if entry:
-                entries.append(entry)
+                yield entry
 
-        # prune dirnames for os.walk recursion if we've reached the depth limit
-        if depth is not None and depth >= 0 and current_depth == depth:
-            dirnames[:] = []
 
-    # return a sorted list of entries
-    sort_field = sort_by if sort_by else "name"
+def _walk(
+    root: Path,
+    depth: int | None,
+    ignore_typical: bool,
+    descend: Callable[[Entry], bool] | None = None,
+    previous: PreviousIndex | None = None,
+    executor: Executor | None = None,
+    prefetch: int = 0,
+) -> Iterator[tuple[Entry, int]]:
+    """Yield ``(entry, item_depth)`` for every node below *root*, top-down.
+
+    Each directory is listed once with ``os.scandir`` (see :meth:`Entry.children`,
+    whose cached listing is shared with plugins inspecting directory content),
+    so the file type comes from the listing and ``stat`` is only called when a
+    field asks for it. Directories are visited in the same order as ``os.walk``
+    (subdirectories first, then files, symlinked directories listed but not
+    followed).
+
+    Subdirectories for which *descend* returns False are listed but not
+    entered, the same way ``ignore_typical`` drops them.
+
+    Directories unchanged since the *previous* output are not listed: their
+    children are rebuilt from it (see :meth:`PreviousIndex.children`).
+
+    With an *executor*, the listings of the next *prefetch* directories waiting
+    on the stack are read ahead in the pool while the current one is processed.
+    """
+    stack: list[tuple[Entry, Future[None] | None]] = [(Entry(root, root, parts=()), None)]
+    while stack:
+        parent, pending = stack.pop()
+        if pending is not None:
+            pending.result()
+        children = previous.children(parent) if previous is not None else None
+        if children is None:
+            try:
+                children = parent.children()
+            except OSError:
+                continue
+
+        dirs: list[Entry] = []
+        files: list[Entry] = []
+        for child in children:
+            if child.is_dir():
+                dirs.append(child)
+            else:
+                files.append(child)
 
-    def _get_sort_key(entry: dict[str, object]) -> tuple[int, object]:
-        val = entry.get(sort_field)
-        if val is None:
-            return (0, "")
-        if isinstance(val, (int, float)):
-            return (1, val)
-        return (2, str(val).lower())
+        if ignore_typical:
+            dirs = [d for d in dirs if d.name not in IGNORE_DIRS and not d.name.endswith(".egg-info")]
+            files = [f for f in files if f.name not in IGNORE_FILES and not f.name.endswith(".pyc")]
+
+        current_depth = parent.depth
+        item_depth = current_depth + 1
+        for child in dirs:
+            yield child, item_depth
+        for child in files:
+            yield child, item_depth
+
+        # stop descending once the depth limit has been reached
+        if depth is not None and depth >= 0 and current_depth >= depth:
+            continue
+        stack.extend(
+            (child, None)
+            for child in reversed(dirs)
+            if not child.is_symlink() and (descend is None or descend(child))
+        )
+
+        if executor is not None:
+            for i in range(max(0, len(stack) - prefetch), len(stack)):
+                if stack[i][1] is None:
+                    stack[i] = (stack[i][0], executor.submit(_prefetch_children, stack[i][0], previous))
+
+
+# fields whose exclude rules stop --prune from entering a directory
+_SUBTREE_FIELDS = ("name",)
+
+
+def _should_descend(
+    entry_ctx: Entry,
+    bound_fields: list[tuple[str, FieldFunc, bool]],
+    exclude: list[tuple[str, str]],
+    allowed_paths: list[tuple[str, ...]] | None,
+) -> bool:
+    """Return False if nothing below the directory *entry_ctx* can be listed."""
+    if allowed_paths is not None:
+        # children of a directory have its relative parts as their path, so
+        # only directories on the way to an allowed path need to be entered
+        parts = entry_ctx.parts
+        if not any(allowed[: len(parts)] == parts for allowed in allowed_paths):
+            return False
+    if exclude:
+        p = entry_ctx.path
+        values: dict[str, object] = {}
+        for field_name, func, wants_entry in bound_fields:
+            value = func(p, entry_ctx.root, entry_ctx) if wants_entry else func(p, entry_ctx.root)
+            if value is not None:
+                values[field_name] = value
+        if _excluded(values, exclude, entry_ctx):
+            return False
+    return True
 
-    entries.sort(key=_get_sort_key, reverse=sort_desc)
 
-    # apply limit if provided
-    if limit is not None and limit >= 0:
-        entries = entries[:limit]
+def _allowed_paths(only: list[tuple[str, str]]) -> list[tuple[str, ...]] | None:
+    """Return the relative parts of the ``only path=...`` values, None if unconstrained."""
+    values = [value for field_name, value in only if field_name == "path"]
+    if not values or None in values:
+        return None
+    return [() if value == "." else Path(value).parts for value in values]
+
 
-    return entries
+def _prefetch_children(entry_ctx: Entry, previous: PreviousIndex | None = None) -> None:
+    """Read and cache a directory listing ahead of the walk (errors resurface later)."""
+    if previous is not None and previous.children(entry_ctx) is not None:
+        return
+    try:
+        entry_ctx.children()
+    except OSError:
+        pass
 
 
-def _process_entry(
-    p: Path,
+def _ordered_map(
+    executor: Executor,
+    func: Callable[[Entry, int], T],
+    items: Iterable[tuple[Entry, int]],
+    window: int,
+) -> Iterator[T]:
+    """Apply *func* to *items* on *executor*, yielding results in input order.
+
+    At most *window* calls are in flight, so memory stays bounded however many
+    items the walk produces.
+    """
+    in_flight: deque[Future[T]] = deque()
+    for item in items:
+        in_flight.append(executor.submit(func, *item))
+        if len(in_flight) >= window:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _bind_fields(all_fields: dict[str, FieldFunc]) -> list[tuple[str, FieldFunc, bool]]:
+    """Pair each field function with whether it accepts the :class:`Entry` context."""
+    return [(field_name, func, takes_entry(func)) for field_name, func in all_fields.items()]
+
+
+def _split_shippable_fields(
+    bound_fields: list[tuple[str, FieldFunc, bool]],
+    keep: Iterable[str] = (),
+) -> tuple[list[tuple[str, FieldFunc | None, bool]], list[tuple[str, str, str]]]:
+    """Separate fields that worker processes can reload from their fields file.
+
+    Shippable fields are replaced by a ``None`` function in the returned list
+    (their values come back from the workers); the others, such as lambdas,
+    the fields named in *keep* and the cheap fields whose function sets
+    ``shippable = False`` (the default fields), are still computed in this
+    process, where the entry's stat is already cached.
+    """
+    keep = set(keep)
+    local: list[tuple[str, FieldFunc | None, bool]] = []
+    sources: list[tuple[str, str, str]] = []
+    for field_name, func, wants_entry in bound_fields:
+        shippable = field_name not in keep and getattr(func, "shippable", True) is not False
+        source = field_source(func) if shippable else None
+        if source is None:
+            local.append((field_name, func, wants_entry))
+        else:
+            sources.append((field_name, *source))
+            local.append((field_name, None, False))
+    return local, sources
+
+
+def _process_in_workers(
     root: Path,
-    all_fields: dict[str, FieldFunc],
+    walked: Iterator[tuple[Entry, int]],
+    prefilter: Callable[[Entry, int], _FieldValues | None],
+    process: Callable[..., dict[str, object] | None],
+    sources: list[tuple[str, str, str]],
+    processes: int,
+    cache: FieldCache | None = None,
+) -> Iterator[dict[str, object] | None]:
+    """Evaluate shipped fields on a process pool, finishing each entry with *process*.
+
+    The early filters run here first (see :func:`_prefilter`), so only the
+    entries passing them are shipped. With a *cache*, each worker opens its
+    own connection to the same file, and its hits and misses are added to
+    the counters of *cache*.
+    """
+    passing = (
+        (entry_ctx, item_depth, values)
+        for entry_ctx, item_depth in walked
+        for values in (prefilter(entry_ctx, item_depth),)
+        if values is not None
+    )
+    in_flight: deque[tuple[list[tuple[Entry, int, _FieldValues]], Future[list[dict[str, object]]]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_field_worker,
+        initargs=(str(root), sources, plugin_options.get_options(), cache.path if cache is not None else None),
+    ) as executor:
+        while True:
+            batch = list(itertools.islice(passing, _PROCESS_BATCH_SIZE))
+            if batch:
+                payload = [
+                    (str(ctx.path), ctx.parts, ctx.is_dir())
+                    for ctx, _, _ in batch
+                    if not isinstance(ctx, ReusedEntry)
+                ]
+                in_flight.append((batch, executor.submit(_compute_field_batch, payload)))
+            if in_flight and (not batch or len(in_flight) >= processes * 2):
+                done, future = in_flight.popleft()
+                computed, hits, misses = future.result()
+                if cache is not None:
+                    cache.count(hits, misses)
+                results = iter(computed)
+                for entry_ctx, item_depth, values in done:
+                    if not isinstance(entry_ctx, ReusedEntry):
+                        values.computed = next(results)
+                    yield process(entry_ctx, item_depth, prefiltered=values)
+            elif not batch:
+                break
+
+
+_PROCESS_BATCH_SIZE = 64
+
+# per-process state of field worker processes, set by _init_field_worker
+_worker_root: Path | None = None
+_worker_fields: list[tuple[str, FieldFunc, bool]] = []
+_worker_cache: FieldCache | None = None
+
+
+def _init_field_worker(
+    root: str,
+    sources: list[tuple[str, str, str]],
+    options_values: dict[str, object],
+    cache_path: str | None = None,
+) -> None:
+    """Load the shipped fields from their fields files in a worker process."""
+    global _worker_root, _worker_fields, _worker_cache
+    plugin_options.restore_options(options_values)
+    loaded: dict[str, dict[str, FieldFunc]] = {}
+    fields: dict[str, FieldFunc] = {}
+    for field_name, filepath, func_name in sources:
+        if filepath not in loaded:
+            loaded[filepath] = load_fields_file(filepath)
+        fields[field_name] = loaded[filepath][func_name]
+    _worker_root = Path(root)
+    _worker_fields = _bind_fields(fields)
+    if cache_path is not None:
+        _worker_cache = FieldCache(cache_path)
+        _worker_cache.track(fields, _worker_root)
+
+
+def _compute_field_batch(
+    payload: list[tuple[str, tuple[str, ...], bool]],
+) -> tuple[list[dict[str, object]], int, int]:
+    """Compute the shipped fields for a batch of ``(path, parts, is_dir)`` items.
+
+    Returns the values of each item and the field cache hits and misses of the batch.
+    """
+    root = _worker_root
+    assert root is not None
+    cache = _worker_cache
+    results = []
+    hits = misses = 0
+    for path_str, parts, is_dir in payload:
+        p = Path(path_str)
+        entry_ctx = Entry(p, root, parts=parts, is_dir=is_dir)
+        cached = cache.lookup(entry_ctx) if cache is not None else {}
+        fresh: dict[str, object] = {}
+        values: dict[str, object] = {}
+        for field_name, func, wants_entry in _worker_fields:
+            identity = cache.identity(field_name) if cache is not None else None
+            if identity is not None and identity in cached:
+                hits += 1
+                value = cached[identity]
+            else:
+                value = func(p, root, entry_ctx) if wants_entry else func(p, root)
+                if identity is not None:
+                    misses += 1
+                    fresh[identity] = value
+            if value is not None:
+                values[field_name] = value
+        if cache is not None:
+            cache.store(entry_ctx, fresh)
+        results.append(values)
+    if cache is not None:
+        cache.commit()
+    return results, hits, misses
+
+
+class _FilterPlan(NamedTuple):
+    """Filter rules split by when they can be evaluated.
+
+    *Early* rules only read fields produced by plugins, so they run before any
+    other field is computed; *late* rules read keys that ``--add``,
+    ``--dict-field``, ``--include-json`` or ``--join`` may set and run on the
+    finished entry.
+    """
+
+    early_fields: tuple[str, ...]
+    early_exclude: list[tuple[str, str]]
+    early_only: list[tuple[str, str]]
+    early_pattern: re.Pattern[str] | None
+    late_exclude: list[tuple[str, str]]
+    late_only: list[tuple[str, str]]
+    late_pattern: re.Pattern[str] | None
+
+
+def _plan_filters(
+    bound_fields: list[tuple[str, FieldFunc | None, bool]],
+    exclude: list[tuple[str, str]] | None,
+    only: list[tuple[str, str]] | None,
+    pattern: re.Pattern[str] | None,
+    add_fields: dict[str, object] | None,
+    dict_fields: list[tuple[str, str | None]] | None,
+    include_jsons: list[tuple[str, str | None]] | None,
+    joins: list[JoinSpec] | None,
+) -> _FilterPlan:
+    """Decide which filter rules can run before the fields they do not need."""
+    late_keys = set(add_fields or ())
+    late_keys.update(key for key, _ in dict_fields or ())
+    late_keys.update(key for key, _ in include_jsons or ())
+
+    def early(field_name: str) -> bool:
+        # a join may copy any key from its database onto the entry
+        return not joins and field_name not in late_keys
+
+    early_exclude = [rule for rule in exclude or () if early(rule[0])]
+    early_only = [rule for rule in only or () if early(rule[0])]
+    early_pattern = pattern if pattern is not None and early("name") else None
+
+    referenced = {field_name for field_name, _ in early_exclude + early_only}
+    if early_pattern is not None:
+        referenced.add("name")
+    return _FilterPlan(
+        early_fields=tuple(name for name, _, _ in bound_fields if name in referenced),
+        early_exclude=early_exclude,
+        early_only=early_only,
+        early_pattern=early_pattern,
+        late_exclude=[rule for rule in exclude or () if rule not in early_exclude],
+        late_only=[rule for rule in only or () if rule not in early_only],
+        late_pattern=pattern if early_pattern is None else None,
+    )
+
+
+class _FieldValues:
+    """Field values of one entry, computed on demand through the field cache.
+
+    Values of fields whose function is ``None`` come from *computed*, the
+    values evaluated in a worker process. Cache hits and misses are counted
+    here and added to the cache's totals by :meth:`store`, since entries are
+    processed concurrently with ``--workers``.
+    """
+
+    def __init__(self, entry_ctx: Entry, cache: FieldCache | None) -> None:
+        self.entry_ctx = entry_ctx
+        self.cache = cache
+        self.cached = cache.lookup(entry_ctx) if cache is not None else {}
+        self.fresh: dict[str, object] = {}
+        self.values: dict[str, object] = {}
+        self.computed: dict[str, object] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, func: FieldFunc | None, field_name: str, wants_entry: bool) -> object:
+        if field_name in self.values:
+            return self.values[field_name]
+        value = self.values[field_name] = self._compute(func, field_name, wants_entry)
+        return value
+
+    def _compute(self, func: FieldFunc | None, field_name: str, wants_entry: bool) -> object:
+        if func is None:
+            return self.computed.get(field_name) if self.computed else None
+        p = self.entry_ctx.path
+        root = self.entry_ctx.root
+        cache = self.cache
+        identity = cache.identity(field_name) if cache is not None else None
+        if identity is None:
+            return func(p, root, self.entry_ctx) if wants_entry else func(p, root)
+        if identity in self.cached:
+            self.hits += 1
+            return self.cached[identity]
+        self.misses += 1
+        value = self.fresh[identity] = func(p, root, self.entry_ctx) if wants_entry else func(p, root)
+        return value
+
+    def store(self) -> None:
+        """Save the freshly computed values and the hit counts to the field cache."""
+        if self.cache is None:
+            return
+        if self.hits or self.misses:
+            self.cache.count(self.hits, self.misses)
+            self.hits = self.misses = 0
+        if self.fresh:
+            self.cache.store(self.entry_ctx, self.fresh)
+            self.fresh = {}
+
+
+def _prefilter(
+    entry_ctx: Entry,
     item_depth: int,
+    bound_fields: list[tuple[str, FieldFunc | None, bool]],
+    min_depth: int | None,
+    plan: _FilterPlan | None = None,
+    cache: FieldCache | None = None,
+) -> _FieldValues | None:
+    """Check *min_depth* and the early filters of the *plan*, computing only the fields they read.
+
+    Returns the field values computed so far, or None if the entry is filtered out.
+    """
+    if min_depth is not None and min_depth > 0 and item_depth < min_depth:
+        return None
+    if isinstance(entry_ctx, ReusedEntry):
+        return _FieldValues(entry_ctx, None)
+
+    plan = plan or _NO_FILTERS
+    values = _FieldValues(entry_ctx, cache)
+    if plan.early_fields or plan.early_exclude or plan.early_only or plan.early_pattern:
+        for field_name, func, wants_entry in bound_fields:
+            if field_name in plan.early_fields:
+                values.get(func, field_name, wants_entry)
+        partial = {k: v for k, v in values.values.items() if v is not None}
+        if (
+            _excluded(partial, plan.early_exclude, entry_ctx)
+            or not _included(partial, plan.early_only, entry_ctx)
+            or not _matched(partial, plan.early_pattern, entry_ctx)
+        ):
+            values.store()
+            return None
+    return values
+
+
+def _process_entry(
+    entry_ctx: Entry,
+    item_depth: int,
+    bound_fields: list[tuple[str, FieldFunc | None, bool]],
     min_depth: int | None,
     add_fields: dict[str, object] | None,
     add_depth: int | None,
     dict_fields: list[tuple[str, str | None]] | None = None,
     include_jsons: list[tuple[str, str | None]] | None = None,
-    joins: list[tuple[str, str, str]] | None = None,
-    exclude: list[tuple[str, str]] | None = None,
-    only: list[tuple[str, str]] | None = None,
-    pattern: re.Pattern[str] | None = None,
+    joins: list[Join] | None = None,
+    plan: _FilterPlan | None = None,
+    cache: FieldCache | None = None,
+    json_cache: JsonCache | None = None,
+    prefiltered: _FieldValues | None = None,
 ) -> dict[str, object] | None:
-    """Process a single file or directory and return its metadata entry if it passes filters."""
+    """Process a single file or directory and return its metadata entry if it passes filters.
+
+    Filters of the *plan* that only depend on plugin fields are checked first
+    (by :func:`_prefilter`, unless the entry is already *prefiltered*), so the
+    remaining (possibly expensive) fields are only computed for entries that
+    pass them. Values found in the *cache* are reused, fresh ones are stored
+    back. A :class:`ReusedEntry` returns its entry from the previous output as is.
+    """
+    if prefiltered is None:
+        prefiltered = _prefilter(entry_ctx, item_depth, bound_fields, min_depth, plan, cache)
+        if prefiltered is None:
+            return None
+    if isinstance(entry_ctx, ReusedEntry):
+        return dict(entry_ctx.record)
+
+    p = entry_ctx.path
+    plan = plan or _NO_FILTERS
     entry: dict[str, object] = {}
-    for field_name, func in all_fields.items():
-        value = func(p, root)
+    for field_name, func, wants_entry in bound_fields:
+        value = prefiltered.get(func, field_name, wants_entry)
         if value is not None:
             entry[field_name] = value
+    prefiltered.store()
 
     # Apply directory-only enhancements
-    if p.is_dir():
+    if entry_ctx.is_dir():
+        json_cache = json_cache or JsonCache()
+        # whole files are read first, so that keys extracted from the same
+        # files come from the cache instead of a second scan
+        included = _read_include_jsons(entry, p, include_jsons, json_cache) if include_jsons else {}
         if dict_fields:
-            _apply_dict_fields(entry, p, dict_fields)
-        if include_jsons:
-            _apply_include_jsons(entry, p, include_jsons)
+            _apply_dict_fields(entry, p, dict_fields, json_cache)
+        entry.update(included)
 
     if add_fields and (add_depth is None or item_depth == add_depth):
         entry.update(add_fields)
 
-    if joins:
-        _apply_joins(entry, joins)
+    for join in joins or ():
+        join.apply(entry)
 
-    if _excluded(entry, exclude, p, root) or not _included(entry, only, p, root) or not _matched(entry, pattern, p, root):
-        return None
-
-    if min_depth is not None and min_depth > 0 and item_depth < min_depth:
+    if (
+        _excluded(entry, plan.late_exclude, entry_ctx)
+        or not _included(entry, plan.late_only, entry_ctx)
+        or not _matched(entry, plan.late_pattern, entry_ctx)
+    ):
         return None
 
     return entry
 
 
-@functools.lru_cache(maxsize=1024)
-def _read_json_file(json_path: Path) -> object:
-    if not json_path.is_file():
-        return None
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
-        pass
-    return None
+_NO_FILTERS = _FilterPlan((), [], [], None, [], [], None)
 
 
 def _apply_dict_fields(
     entry: dict[str, object], 
     directory_path: Path, 
-    dict_fields: list[tuple[str, str | None]]
+    dict_fields: list[tuple[str, str | None]],
+    json_cache: JsonCache,
 ) -> None:
-    """Read dict_fields logic and apply standard modifications for matching directory values."""
+    """Read dict_fields logic and apply standard modifications for matching directory values.
+
+    Keys are JSON pointers (``meta/athlete/name``); the keys read from the
+    same file are extracted in a single pass that stops once all are found.
+    """
     node_name = str(entry.get("name", directory_path.name))
 
+    wanted: dict[str, list[Pointer]] = {}
     for key, custom_filename in dict_fields:
         target_file = custom_filename if custom_filename else f"{node_name}.json"
-        json_path = directory_path / target_file
-        
-        file_data = _read_json_file(json_path)
-        if isinstance(file_data, dict) and key in file_data:
-            entry[key] = file_data[key]
+        wanted.setdefault(target_file, []).append(parse_pointer(key))
+    found = {
+        target_file: json_cache.extract(directory_path / target_file, pointers)
+        for target_file, pointers in wanted.items()
+    }
 
+    for key, custom_filename in dict_fields:
+        values = found[custom_filename if custom_filename else f"{node_name}.json"]
+        pointer = parse_pointer(key)
+        if pointer in values:
+            entry[key] = values[pointer]
 
-def _apply_include_jsons(
+
+def _read_include_jsons(
     entry: dict[str, object], 
     directory_path: Path, 
-    include_jsons: list[tuple[str, str | None]]
-) -> None:
-    """Read full files and embed their entire parsed JSON dictionary under target key."""
+    include_jsons: list[tuple[str, str | None]],
+    json_cache: JsonCache,
+) -> dict[str, object]:
+    """Read full files and return their entire parsed JSON dictionary under target keys."""
     node_name = str(entry.get("name", directory_path.name))
+    included: dict[str, object] = {}
 
     for key, custom_filename in include_jsons:
         target_file = custom_filename if custom_filename else f"{node_name}.json"
         json_path = directory_path / target_file
         
-        file_data = _read_json_file(json_path)
+        file_data = json_cache.read(json_path)
         # If the file exists and is valid json, we inject the whole parsed object (list, dict, string...)
         if file_data is not None: 
-            entry[key] = file_data
+            included[key] = file_data
+    return included
 
 
-def _apply_joins(
-    entry: dict[str, object], 
-    joins: list[tuple[str, str, str]]
-) -> None:
-    """Enrich the entry with matching properties from an external JSON database file."""
-    for filename, remote_key, local_key in joins:
-        local_val = entry.get(local_key)
-        if local_val is None:
-            continue
-            
-        json_path = Path(filename).resolve()
-        db_data = _read_json_file(json_path)
-        
-        if isinstance(db_data, list):
-            for obj in db_data:
-                if isinstance(obj, dict) and obj.get(remote_key) is not None and str(obj.get(remote_key)) == str(local_val):
-                    for k, v in obj.items():
-                        if k != remote_key:
-                            entry[k] = v
-                    break
-        elif isinstance(db_data, dict):
-            if db_data.get(remote_key) is not None and str(db_data.get(remote_key)) == str(local_val):
-                for k, v in db_data.items():
-                    if k != remote_key:
-                        entry[k] = v
-
-
-def _excluded(entry: dict[str, object], exclude: list[tuple[str, str]] | None, p: Path, root: Path) -> bool:
+def _excluded(entry: dict[str, object], exclude: list[tuple[str, str]] | None, entry_ctx: Entry) -> bool:
     """Return True if *entry* matches any of the exclude rules."""
     if not exclude:
         return False
@@ -255,13 +812,13 @@ def _excluded(entry: dict[str, object], exclude: list[tuple[str, str]] | None, p
         if entry_val is None and field_name in _defaults.__dict__:
             func = getattr(_defaults, field_name)
             if callable(func):
-                entry_val = func(p, root)
+                entry_val = func(entry_ctx.path, entry_ctx.root, entry_ctx)
         if str(entry_val if entry_val is not None else "") == value:
             return True
     return False
 
 
-def _included(entry: dict[str, object], only: list[tuple[str, str]] | None, p: Path, root: Path) -> bool:
+def _included(entry: dict[str, object], only: list[tuple[str, str]] | None, entry_ctx: Entry) -> bool:
     """Return True if *entry* matches the inclusive rules.
     If multiple fields are provided, it must match ALL fields (AND logic).
     If multiple values are provided for the same field, it must match ANY of them (OR logic).
@@ -279,7 +836,7 @@ def _included(entry: dict[str, object], only: list[tuple[str, str]] | None, p: P
         if entry_val is None and f in _defaults.__dict__:
             func = getattr(_defaults, f)
             if callable(func):
-                entry_val = func(p, root)
+                entry_val = func(entry_ctx.path, entry_ctx.root, entry_ctx)
         
         # If None is in values, it means we only require the field to exist (not be None)
         if None in values:
@@ -294,11 +851,11 @@ def _included(entry: dict[str, object], only: list[tuple[str, str]] | None, p: P
     return True
 
 
-def _matched(entry: dict[str, object], pattern: re.Pattern[str] | None, p: Path, root: Path) -> bool:
+def _matched(entry: dict[str, object], pattern: re.Pattern[str] | None, entry_ctx: Entry) -> bool:
     """Return True if *entry* name matches the given regex pattern."""
     if pattern is None:
         return True
     name_val = entry.get("name")
     if name_val is None:
-        name_val = _defaults.name(p, root)
+        name_val = entry_ctx.name
     return pattern.search(str(name_val)) is not None
@@ -0,0 +1,186 @@
+"""Serialise flatdir results to a text stream.
+
+``json`` writes the usual indented document, ``ndjson`` writes one compact
+JSON object per line. The ``*_stream`` writers consume an iterable of entries
+and write each one as soon as it is produced, so the full list never has to
+be held in memory.
+
+Passing an *encode* function from :func:`get_encoder` to the writers makes
+the output compact: no indentation and no spaces after separators. Compact
+values are serialised by an accelerated library when one is installed
+(``orjson``, then ``msgspec``), the standard :mod:`json` module otherwise;
+indented output always uses the standard module, for a stable layout.
+
+Writers gather the serialised text and hand it to the stream in chunks of
+about :data:`CHUNK_SIZE` characters rather than entry by entry, and
+:func:`open_output` opens files with a buffer of the same size.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Callable, Iterable, TextIO
+
+FORMATS = ("json", "ndjson")
+
+ENCODERS = ("auto", "orjson", "msgspec", "json")
+
+Encode = Callable[[object], str]
+
+# characters gathered before each write to the output stream
+CHUNK_SIZE = 1 << 20
+
+
+def get_encoder(name: str = "auto") -> Encode:
+    """Return a function serialising a value to compact JSON with the backend *name*.
+
+    ``auto`` picks the first installed of ``orjson`` and ``msgspec`` and
+    falls back to ``json``; naming a backend that is not installed raises
+    ImportError. The accelerated backends fall back to ``json`` for the
+    values they cannot encode, such as integers beyond 64 bits.
+    """
+    if name not in ENCODERS:
+        raise ValueError(f"unknown encoder {name!r}, expected one of: {', '.join(ENCODERS)}")
+    for backend in ("orjson", "msgspec") if name == "auto" else (name,):
+        if backend == "json":
+            break
+        try:
+            return _ENCODER_FACTORIES[backend]()
+        except ImportError:
+            if name != "auto":
+                raise ImportError(f"the {backend} encoder needs the {backend} package") from None
+    return _json_encode
+
+
+_compact_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_encode(value: object) -> str:
+    return _compact_encoder.encode(value)
+
+
+_json_encode.backend = "json"  # type: ignore[attr-defined]
+
+
+def _orjson_encoder() -> Encode:
+    import orjson
+
+    def encode(value: object) -> str:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:  # orjson.JSONEncodeError
+            return _json_encode(value)
+
+    encode.backend = "orjson"  # type: ignore[attr-defined]
+    return encode
+
+
+def _msgspec_encoder() -> Encode:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+
+    def encode(value: object) -> str:
+        try:
+            return encoder.encode(value).decode("utf-8")
+        except (TypeError, ValueError, OverflowError):
+            return _json_encode(value)
+
+    encode.backend = "msgspec"  # type: ignore[attr-defined]
+    return encode
+
+
+_ENCODER_FACTORIES: dict[str, Callable[[], Encode]] = {
+    "orjson": _orjson_encoder,
+    "msgspec": _msgspec_encoder,
+}
+
+
+def open_output(path: str) -> IO[str]:
+    """Open *path* for writing UTF-8 text with a :data:`CHUNK_SIZE` buffer."""
+    return open(path, "w", encoding="utf-8", buffering=CHUNK_SIZE)
+
+
+class ChunkedWriter:
+    """Gather text written piece by piece and pass it on to *fp* in large chunks."""
+
+    def __init__(self, fp: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self._fp.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+
+def write_output(data: object, fp: TextIO, fmt: str = "json", encode: Encode | None = None) -> None:
+    """Write an already materialised result (list, tree or envelope) in *fmt*.
+
+    With *encode*, the output is compact (see :func:`get_encoder`).
+    """
+    if isinstance(data, list):
+        write_stream(data, fp, fmt, encode)
+        return
+    if encode is not None:
+        fp.write(encode(data) + "\n")
+        return
+    if fmt == "ndjson":
+        fp.write(json.dumps(data, ensure_ascii=False) + "\n")
+        return
+    writer = ChunkedWriter(fp)
+    for chunk in json.JSONEncoder(ensure_ascii=False, indent=4).iterencode(data):
+        writer.write(chunk)
+    writer.write("\n")
+    writer.flush()
+
+
+def write_stream(
+    entries: Iterable[dict[str, object]], fp: TextIO, fmt: str = "json", encode: Encode | None = None
+) -> int:
+    """Write *entries* one by one in *fmt* and return how many were written."""
+    if fmt == "ndjson":
+        return write_ndjson_stream(entries, fp, encode)
+    return write_json_stream(entries, fp, encode)
+
+
+def write_json_stream(entries: Iterable[dict[str, object]], fp: TextIO, encode: Encode | None = None) -> int:
+    """Write *entries* as an indented JSON array, byte-identical to ``json.dump(..., indent=4)``.
+
+    With *encode*, the array is written compact on a single line instead.
+    """
+    writer = ChunkedWriter(fp)
+    count = 0
+    if encode is not None:
+        for entry in entries:
+            writer.write(("[" if count == 0 else ",") + encode(entry))
+            count += 1
+        writer.write("]\n" if count else "[]\n")
+    else:
+        for entry in entries:
+            body = json.dumps(entry, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            writer.write(("[\n    " if count == 0 else ",\n    ") + body)
+            count += 1
+        writer.write("\n]\n" if count else "[]\n")
+    writer.flush()
+    return count
+
+
+def write_ndjson_stream(entries: Iterable[dict[str, object]], fp: TextIO, encode: Encode | None = None) -> int:
+    """Write *entries* as newline-delimited JSON, one compact object per line."""
+    writer = ChunkedWriter(fp)
+    count = 0
+    for entry in entries:
+        writer.write((encode(entry) if encode is not None else json.dumps(entry, ensure_ascii=False)) + "\n")
+        count += 1
+    writer.flush()
+    return count
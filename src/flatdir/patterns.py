@@ -0,0 +1,237 @@
+"""Declarative pattern fields, defined in a TOML or JSON file instead of Python.
+
+A pattern file lists naming conventions, each a regular expression with named
+groups and the fields it provides::
+
+    [[patterns]]
+    regex = '(?P<prefix>[A-Za-z0-9]+)-(?P<year1>\\d{2})-(?P<year2>\\d{2})$'
+    [patterns.fields]
+    pattern_prefix = "prefix"                          # value of a group
+    pattern_years = { format = "20{year1}-20{year2}" } # groups in a template
+    pattern_ids = { group = "prefix", split = "_" }    # group split in a list
+    pattern_num = { group = "year1", type = "int" }    # group as an integer
+
+Regexes are matched from the start of the name (add ``.*`` to search further
+in it); ``target = "parent"`` matches the name of the parent directory
+instead, and ``ignore_case = true`` matches case-insensitively. A JSON file
+holds the same structure, ``{"patterns": [...]}``.
+
+All the patterns of a file (per target) are compiled into a single regex in
+which each pattern is an optional lookahead, so one match call per name finds
+every pattern that applies and captures all their groups. When several
+matching patterns provide the same field, the first one in the file wins.
+Results are memoised by name in :mod:`flatdir.plugins.parse_cache`.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Callable
+
+from .plugins.parse_cache import cached_parse
+
+FieldFunc = Callable[..., object]
+
+TARGETS = ("name", "parent")
+
+_GROUP = re.compile(r"\(\?P<([A-Za-z_]\w*)>")
+_BACKREF = re.compile(r"\(\?P=([A-Za-z_]\w*)\)")
+_CONDITIONAL = re.compile(r"\(\?\(([A-Za-z_]\w*)\)")
+# escaped characters, among them numbered backreferences (``\1``), and numbered
+# conditionals; escapes are read in pairs so that ``\\1`` is a backslash then 1
+_NUMBERED = re.compile(r"\\.|\(\?\(\d")
+
+
+def load_pattern_file(filepath: str) -> dict[str, FieldFunc]:
+    """Read the pattern file *filepath* and return its ``{field: func}`` mapping."""
+    path = Path(filepath).resolve()
+    try:
+        if path.suffix.lower() == ".toml":
+            data: object = _load_toml(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except ValueError as exc:  # TOMLDecodeError and JSONDecodeError are ValueErrors
+        raise ValueError(f"invalid pattern file {filepath}: {exc}") from exc
+    definitions = data.get("patterns") if isinstance(data, dict) else data
+    if not isinstance(definitions, list):
+        raise ValueError(f"invalid pattern file {filepath}: expected a list of patterns")
+    return PatternSet(definitions, str(path)).fields()
+
+
+def _load_toml(path: Path) -> object:
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            raise ImportError("TOML pattern files need Python 3.11 or the tomli package") from None
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+class PatternSet:
+    """The compiled patterns of one definition file."""
+
+    def __init__(self, definitions: list[object], source: str = "<patterns>") -> None:
+        self.source = source
+        self._matchers = {target: _Matcher() for target in TARGETS}
+        self._field_targets: dict[str, str] = {}
+        for index, definition in enumerate(definitions):
+            if not isinstance(definition, dict):
+                raise ValueError(f"{source}: pattern #{index + 1} is not a table")
+            label = str(definition.get("name", f"#{index + 1}"))
+            target = definition.get("target", "name")
+            if target not in TARGETS:
+                raise ValueError(f"{source}: pattern {label}: target must be one of {', '.join(TARGETS)}")
+            fields = definition.get("fields")
+            if not isinstance(fields, dict) or not fields:
+                raise ValueError(f"{source}: pattern {label} has no fields")
+            for field_name in fields:
+                if self._field_targets.setdefault(field_name, target) != target:
+                    raise ValueError(f"{source}: field {field_name} is read from both name and parent")
+            ignore_case = bool(definition.get("ignore_case", False))
+            self._matchers[target].add(definition.get("regex"), ignore_case, fields, f"{source}: pattern {label}")
+        for matcher in self._matchers.values():
+            matcher.compile()
+
+    def parse(self, name: str, target: str = "name") -> dict[str, object]:
+        """Return the field values that the patterns for *target* extract from *name*."""
+        return cached_parse(self._matchers[target], name)
+
+    def fields(self) -> dict[str, FieldFunc]:
+        """Return one field function per field defined in the file."""
+        return {
+            field_name: _field_function(self._matchers[target], field_name, target, self.source)
+            for field_name, target in self._field_targets.items()
+        }
+
+
+class _Matcher:
+    """Patterns of one target, combined into a single regex of optional lookaheads."""
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        # per pattern: its group name, its (group, renamed group) pairs and (field, extractor) pairs
+        self._patterns: list[
+            tuple[str, list[tuple[str, str]], list[tuple[str, Callable[[dict[str, str]], object]]]]
+        ] = []
+        self._regex: re.Pattern[str] | None = None
+
+    def add(self, regex: object, ignore_case: bool, fields: dict[str, object], label: str) -> None:
+        if not isinstance(regex, str):
+            raise ValueError(f"{label} has no regex")
+        try:
+            groups = list(re.compile(regex).groupindex)
+        except re.error as exc:
+            raise ValueError(f"{label}: invalid regex: {exc}") from exc
+        # group numbers shift once the patterns are combined, names do not
+        if any(ref.group()[-1].isdigit() and ref.group()[-1] != "0" for ref in _NUMBERED.finditer(regex)):
+            raise ValueError(f"{label}: numbered group references are not supported, use (?P=name) or (?(name)...)")
+        extractors = [
+            (field_name, _extractor(spec, groups, f"{label}, field {field_name}"))
+            for field_name, spec in fields.items()
+        ]
+
+        # group names are prefixed so that patterns can reuse the same names
+        index = len(self._patterns)
+        renamed = _GROUP.sub(rf"(?P<_p{index}_\1>", regex)
+        renamed = _BACKREF.sub(rf"(?P=_p{index}_\1)", renamed)
+        renamed = _CONDITIONAL.sub(rf"(?(_p{index}_\1)", renamed)
+        if ignore_case:
+            renamed = f"(?i:{renamed})"
+        self._parts.append(f"(?:(?=(?P<_p{index}>{renamed})))?")
+        self._patterns.append((f"_p{index}", [(group, f"_p{index}_{group}") for group in groups], extractors))
+
+    def compile(self) -> None:
+        self._regex = re.compile("".join(self._parts)) if self._parts else None
+
+    def __call__(self, name: str) -> dict[str, object]:
+        values: dict[str, object] = {}
+        if self._regex is None:
+            return values
+        match = self._regex.match(name)
+        assert match is not None  # every lookahead is optional
+        for pattern_group, groups, extractors in self._patterns:
+            if match.group(pattern_group) is None:
+                continue
+            captured = {}
+            for group, renamed in groups:
+                value = match.group(renamed)
+                if value is not None:
+                    captured[group] = value
+            for field_name, extract in extractors:
+                if field_name not in values:
+                    value = extract(captured)
+                    if value is not None:
+                        values[field_name] = value
+        return values
+
+
+def _extractor(spec: object, groups: list[str], label: str) -> Callable[[dict[str, str]], object]:
+    """Build the function computing a field from the captured groups of its pattern."""
+    if isinstance(spec, str):
+        spec = {"group": spec}
+    if not isinstance(spec, dict):
+        raise ValueError(f"{label}: expected a group name or a table")
+
+    template = spec.get("format")
+    if template is not None:
+        if not isinstance(template, str):
+            raise ValueError(f"{label}: format must be a string")
+
+        def formatted(captured: dict[str, str]) -> object:
+            try:
+                return template.format(**captured)
+            except (KeyError, IndexError):
+                return None
+
+        return formatted
+
+    group = spec.get("group")
+    if group not in groups:
+        raise ValueError(f"{label}: unknown group {group!r}")
+    separator = spec.get("split")
+    if spec.get("type", "str") not in ("str", "int"):
+        raise ValueError(f"{label}: type must be str or int")
+    as_int = spec.get("type") == "int"
+
+    def extract(captured: dict[str, str]) -> object:
+        value = captured.get(group)  # type: ignore[arg-type]
+        if value is None:
+            return None
+        if separator is not None:
+            return [part for part in value.split(separator) if part]
+        if as_int:
+            try:
+                return int(value)
+            except ValueError:
+                return None
+        return value
+
+    return extract
+
+
+def _field_function(matcher: _Matcher, field_name: str, target: str, source: str) -> FieldFunc:
+    if target == "parent":
+
+        def field(path: Path, root: Path) -> object:
+            return _copy(cached_parse(matcher, path.parent.name).get(field_name))
+
+    else:
+
+        def field(path: Path, root: Path) -> object:
+            return _copy(cached_parse(matcher, path.name).get(field_name))
+
+    field.__name__ = field.__qualname__ = field_name
+    # lets field_source() reload the field from its file in worker processes
+    field.fields_file = source  # type: ignore[attr-defined]
+    return field
+
+
+def _copy(value: object) -> object:
+    # parse results are shared by every entry with the same name
+    return list(value) if isinstance(value, list) else value
@@ -1,7 +1,9 @@
 """Default field plugins for flatdir.
 
 These functions produce the built-in fields: name, type, mtime, size.
-Each function receives the file path and the root directory path.
+Each function receives the file path and the root directory path, and
+optionally the :class:`~flatdir.entry.Entry` built by the traversal so that
+``type``, ``mtime`` and ``size`` share a single ``stat`` call.
 """
 
 from __future__ import annotations
@@ -10,40 +12,51 @@ import os
 import time
 from pathlib import Path
 
+from flatdir.entry import Entry
 
-def name(path: Path, root: Path) -> str:
+
+def name(path: Path, root: Path, entry: Entry | None = None) -> str:
     """The filename or directory name (basename)."""
     return path.name
 
 
-def path(path: Path, root: Path) -> str:
+def path(path: Path, root: Path, entry: Entry | None = None) -> str:
     """Relative path from the listing root (excluding the filename)."""
+    if entry is not None:
+        return entry.parent_path
     try:
         return str(path.parent.relative_to(root))
     except ValueError:
         return str(os.path.relpath(str(path.parent), str(root)))
 
 
-def type(path: Path, root: Path) -> str:
+def type(path: Path, root: Path, entry: Entry | None = None) -> str:
     """Entry type: 'file' or 'directory'."""
-    return "directory" if path.is_dir() else "file"
+    entry = entry or Entry(path, root)
+    return "directory" if entry.is_dir() else "file"
 
 
-def mtime(path: Path, root: Path) -> str | None:
+def mtime(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Last modification time in HTTP-date format."""
-    try:
-        st = path.stat()
-        t = time.gmtime(st.st_mtime)
-        return time.strftime("%a, %d %b %Y %H:%M:%S GMT", t)
-    except OSError:
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
         return None
+    t = time.gmtime(st.st_mtime)
+    return time.strftime("%a, %d %b %Y %H:%M:%S GMT", t)
 
 
-def size(path: Path, root: Path) -> int | None:
+def size(path: Path, root: Path, entry: Entry | None = None) -> int | None:
     """File size in bytes. Returns None for directories (omitted from output)."""
-    if path.is_dir():
+    entry = entry or Entry(path, root)
+    if entry.is_dir():
         return None
-    try:
-        return int(path.stat().st_size)
-    except OSError:
+    st = entry.stat()
+    if st is None:
         return None
+    return int(st.st_size)
+
+
+# cheap, and reading the stat already cached on the entry: they are computed
+# where the walk runs, never shipped to --processes worker processes
+for _field in (name, path, type, mtime, size):
+    _field.shippable = False  # type: ignore[attr-defined]
@@ -4,13 +4,17 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from flatdir.entry import Entry
 
-def depth(path: Path, root: Path) -> int:
+
+def depth(path: Path, root: Path, entry: Entry | None = None) -> int:
     """Return the depth of the file relative to the listed root directory.
     
     The root directory itself (if listed) is depth 0. Files directly inside
     the root directory are depth 1.
     """
+    if entry is not None:
+        return entry.depth
     try:
         return len(path.relative_to(root).parts)
     except ValueError:
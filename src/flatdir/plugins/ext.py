@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from flatdir.entry import Entry
 
-def ext(path: Path, root: Path) -> str | None:
+
+def ext(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Return the file extension (e.g. '.csv', '.mp4'). None for directories."""
-    if path.is_dir():
+    if (entry or Entry(path, root)).is_dir():
         return None
     return path.suffix.lower() if path.suffix else ""
@@ -13,6 +13,8 @@ import hashlib
 import datetime
 from pathlib import Path
 
+from flatdir.entry import Entry
+
 # Initialize standard mimes
 mimetypes.init()
 
@@ -22,51 +24,53 @@ def file_uuid(path: Path, root: Path) -> str:
     return str(uuid.uuid4())
 
 
-def extension(path: Path, root: Path) -> str | None:
+# a fresh value is expected on every run, never reuse it from a field cache
+file_uuid.cacheable = False  # type: ignore[attr-defined]
+
+
+def extension(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Return the file extension without the dot."""
-    if path.is_dir():
+    if (entry or Entry(path, root)).is_dir():
         return None
     ext = path.suffix
     return ext.lstrip(".") if ext else ""
 
 
-def mime_type(path: Path, root: Path) -> str | None:
+def mime_type(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Return the MIME type based on the file extension."""
-    if path.is_dir():
+    if (entry or Entry(path, root)).is_dir():
         return None
     mime, _ = mimetypes.guess_type(str(path))
     return mime or "application/octet-stream"
 
 
-def created_at(path: Path, root: Path) -> str | None:
+def created_at(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Creation time in strict ISO 8601 format."""
-    try:
-        st = path.stat()
-        # st_birthtime is available on macOS/Windows. Fallback to ctime on Linux.
-        ctime = getattr(st, 'st_birthtime', st.st_ctime)
-        dt = datetime.datetime.fromtimestamp(ctime, datetime.timezone.utc)
-        return dt.isoformat().replace("+00:00", "Z")
-    except OSError:
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
         return None
+    # st_birthtime is available on macOS/Windows. Fallback to ctime on Linux.
+    ctime = getattr(st, 'st_birthtime', st.st_ctime)
+    dt = datetime.datetime.fromtimestamp(ctime, datetime.timezone.utc)
+    return dt.isoformat().replace("+00:00", "Z")
 
 
-def modified_at(path: Path, root: Path) -> str | None:
+def modified_at(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Modification time in strict ISO 8601 format."""
-    try:
-        st = path.stat()
-        dt = datetime.datetime.fromtimestamp(st.st_mtime, datetime.timezone.utc)
-        return dt.isoformat().replace("+00:00", "Z")
-    except OSError:
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
         return None
+    dt = datetime.datetime.fromtimestamp(st.st_mtime, datetime.timezone.utc)
+    return dt.isoformat().replace("+00:00", "Z")
 
 
-def sha256(path: Path, root: Path) -> str | None:
+def sha256(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """SHA-256 cryptographic hash of the file.
     
     Reads in 8KB chunks. Capped at reading the first 100MB to prevent the 
     directory mapper from freezing when encountering massive video files.
     """
-    if path.is_dir():
+    if (entry or Entry(path, root)).is_dir():
         return None
         
     try:
@@ -86,23 +90,27 @@ def sha256(path: Path, root: Path) -> str | None:
         return None
 
 
-def signature(path: Path, root: Path) -> str | None:
+def signature(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Alias for the SHA-256 hash checksum."""
-    return sha256(path, root)
+    return sha256(path, root, entry)
 
 
-def permissions(path: Path, root: Path) -> str | None:
+def permissions(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """File permissions mapped in CHMOD octal format (e.g. '755', '644')."""
-    try:
-        st = path.stat()
-        return oct(st.st_mode)[-3:]
-    except OSError:
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
         return None
+    return oct(st.st_mode)[-3:]
 
 
-def owner_id(path: Path, root: Path) -> int | None:
+def owner_id(path: Path, root: Path, entry: Entry | None = None) -> int | None:
     """Operating System User UID string bounding ownership."""
-    try:
-        return path.stat().st_uid
-    except OSError:
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
         return None
+    return st.st_uid
+
+
+# like the default fields, these only read the name or the entry's cached stat
+for _field in (extension, mime_type, created_at, modified_at, permissions, owner_id):
+    _field.shippable = False  # type: ignore[attr-defined]
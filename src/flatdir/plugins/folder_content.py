@@ -5,8 +5,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from flatdir.entry import Entry
 
-def has_postfix(path: Path, root: Path) -> list[str] | None:
+
+def has_postfix(path: Path, root: Path, entry: Entry | None = None) -> list[str] | None:
     """Return a list of postfixes for files matching `{dirname}_{postfix}.{ext}` in a directory.
     
     If `path` is a file, returns None.
@@ -14,7 +16,8 @@ def has_postfix(path: Path, root: Path) -> list[str] | None:
     For a directory named "toto", a file named "toto_tata.json" yields the postfix "tata".
     Returns a sorted list of unique postfixes.
     """
-    if not path.is_dir():
+    entry = entry or Entry(path, root)
+    if not entry.is_dir():
         return None
 
     dirname = path.name
@@ -22,11 +25,11 @@ def has_postfix(path: Path, root: Path) -> list[str] | None:
     prefix = f"{dirname}_"
 
     try:
-        for child in path.iterdir():
+        for child in entry.children():
             if not child.is_file():
                 continue
             
-            filename = child.stem
+            filename = child.path.stem
             if filename.startswith(prefix) and len(filename) > len(prefix):
                 postfix = filename[len(prefix):]
                 postfixes.add(postfix)
@@ -36,7 +39,7 @@ def has_postfix(path: Path, root: Path) -> list[str] | None:
     return sorted(list(postfixes))
 
 
-def has_ext(path: Path, root: Path) -> list[str] | None:
+def has_ext(path: Path, root: Path, entry: Entry | None = None) -> list[str] | None:
     """Return a list of extensions for files matching `{dirname}.{ext}` or `{dirname}_{postfix}.{ext}` in a directory.
     
     If `path` is a file, returns None.
@@ -44,7 +47,8 @@ def has_ext(path: Path, root: Path) -> list[str] | None:
     For a directory named "toto", files "toto.json" and "toto_tata.xml" yield extensions "json" and "xml".
     Returns a sorted list of unique extensions without the leading dot.
     """
-    if not path.is_dir():
+    entry = entry or Entry(path, root)
+    if not entry.is_dir():
         return None
 
     dirname = path.name
@@ -53,12 +57,12 @@ def has_ext(path: Path, root: Path) -> list[str] | None:
     exact_match = dirname
 
     try:
-        for child in path.iterdir():
+        for child in entry.children():
             if not child.is_file():
                 continue
             
-            filename = child.stem
-            ext = child.suffix.lstrip('.')
+            filename = child.path.stem
+            ext = child.path.suffix.lstrip('.')
             
             if not ext:
                 continue
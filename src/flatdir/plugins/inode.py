@@ -0,0 +1,23 @@
+"""Plugin: returns the inode number of the entry, read from its cached stat.
+
+Loaded on both runs, it lets ``--diff`` report a renamed or moved entry as
+``moved`` even when no content hash is available.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from flatdir.entry import Entry
+
+
+def inode(path: Path, root: Path, entry: Entry | None = None) -> int | None:
+    """Inode number, stable across renames and moves within a filesystem."""
+    st = (entry or Entry(path, root)).stat()
+    if st is None:
+        return None
+    return st.st_ino
+
+
+# it only reads the stat cached by the walk: not worth a worker process
+inode.shippable = False  # type: ignore[attr-defined]
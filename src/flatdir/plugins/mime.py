@@ -5,12 +5,14 @@ from __future__ import annotations
 import mimetypes
 from pathlib import Path
 
+from flatdir.entry import Entry
+
 # Initialize standard system mimes (reads from common OS locations)
 mimetypes.init()
 
-def mime_type(path: Path, root: Path) -> str | None:
+def mime_type(path: Path, root: Path, entry: Entry | None = None) -> str | None:
     """Return the MIME type based on the file extension. Returns None for directories."""
-    if path.is_dir():
+    if (entry or Entry(path, root)).is_dir():
         return None
         
     mime, _ = mimetypes.guess_type(str(path))
@@ -21,6 +21,19 @@ def set_options(
     )
 
 
+def get_options() -> dict[str, object]:
+    """Return the current option values, e.g. to replay them in a worker process."""
+    return {
+        "subfolders_whitelist": subfolders_whitelist,
+        "subfolders_separator": subfolders_separator,
+        "pattern_id_separator": pattern_id_separator,
+    }
+
+
+def restore_options(values: dict[str, object]) -> None:
+    globals().update(values)
+
+
 def split_values(value: str | None, separator: str) -> tuple[str, ...]:
     if value is None:
         return ()
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from flatdir.entry import Entry
 
-def parent(path: Path, root: Path) -> str:
+
+def parent(path: Path, root: Path, entry: Entry | None = None) -> str:
     """Return the parent directory of the file or directory, relative to root."""
+    if entry is not None:
+        return entry.parent_path
     try:
         # If the path is the root itself, parent is "."
         if path.resolve() == root.resolve():
@@ -0,0 +1,56 @@
+"""Bounded parse cache shared by the pattern_* plugins.
+
+A pattern plugin parses a name once and exposes its parts as several fields,
+so the parse result is cached between the calls of those fields. Results only
+depend on the name, so they are keyed by ``(parser, name)`` rather than by
+path: entries with the same name in different directories share one parse.
+The cache keeps at most ``max_entries`` results, least recently used first
+out, so it does not grow with the runs of a long-lived process. It is shared
+by concurrent listings and never emptied behind their back: :func:`reset` is
+left to the caller.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 4096
+
+max_entries = DEFAULT_MAX_ENTRIES
+
+_results: OrderedDict[tuple[Callable[[str], object], str], object] = OrderedDict()
+_lock = threading.Lock()
+
+
+def cached_parse(parser: Callable[[str], T], name: str) -> T:
+    """Return ``parser(name)``, computed once while it stays in the cache."""
+    key = (parser, name)
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]  # type: ignore[return-value]
+    result = parser(name)
+    with _lock:
+        _results[key] = result
+        while len(_results) > max_entries:
+            _results.popitem(last=False)
+    return result
+
+
+def reset(limit: int | None = None) -> None:
+    """Empty the cache and, if *limit* is given, change its maximum size."""
+    global max_entries
+    with _lock:
+        _results.clear()
+        if limit is not None:
+            max_entries = limit
+
+
+def size() -> int:
+    """Return the number of cached parse results."""
+    with _lock:
+        return len(_results)
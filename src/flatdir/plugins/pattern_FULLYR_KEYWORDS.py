@@ -10,8 +10,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-# Cache to avoid re-parsing the same path
-_cache: dict[Path, dict[str, object] | None] = {}
+from flatdir.plugins.parse_cache import cached_parse
 
 
 def _parse_pattern(name: str) -> dict[str, object] | None:
@@ -33,11 +32,7 @@ def _parse_pattern(name: str) -> dict[str, object] | None:
 
 
 def _get_parsed_data(path: Path) -> dict[str, object] | None:
-    if path in _cache:
-        return _cache[path]
-    res = _parse_pattern(path.name)
-    _cache[path] = res
-    return res
+    return cached_parse(_parse_pattern, path.name)
 
 
 def pattern_year(path: Path, root: Path) -> str | None:
@@ -49,7 +44,8 @@ def pattern_year(path: Path, root: Path) -> str | None:
 def pattern_keywords(path: Path, root: Path) -> list[str] | None:
     """Return the list of keywords after the year (e.g., ['keyword1', 'keyword2'])."""
     res = _get_parsed_data(path)
-    return res["keywords"] if res else None  # type: ignore[return-value]
+    # parse results are shared by every entry with this name
+    return list(res["keywords"]) if res else None  # type: ignore[call-overload]
 
 
 def pattern_date(path: Path, root: Path) -> str | None:
@@ -8,8 +8,9 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-# Cache to avoid re-parsing the regex for the same path
-_cache: dict[Path, dict[str, str | None] | None] = {}
+from flatdir.plugins.parse_cache import cached_parse
+
+_PATTERN = re.compile(r'^([A-Za-z0-9]+)-(\d{2})-(\d{2})$')
 
 
 def _parse_generic_pattern(name: str) -> dict[str, str | None] | None:
@@ -18,7 +19,7 @@ def _parse_generic_pattern(name: str) -> dict[str, str | None] | None:
     Matches patterns like: [Prefix]-[Year1]-[Year2]
     Extracts the parts.
     """
-    match = re.search(r'^([A-Za-z0-9]+)-(\d{2})-(\d{2})$', name)
+    match = _PATTERN.search(name)
     if not match:
         return None
         
@@ -32,12 +33,7 @@ def _parse_generic_pattern(name: str) -> dict[str, str | None] | None:
 
 
 def _get_parsed_data(path: Path) -> dict[str, str | None] | None:
-    if path in _cache:
-        return _cache[path]
-    
-    res = _parse_generic_pattern(path.name)
-    _cache[path] = res
-    return res
+    return cached_parse(_parse_generic_pattern, path.name)
 
 
 def pattern_prefix(path: Path, root: Path) -> str | None:
@@ -8,8 +8,9 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-# Cache to avoid re-parsing the regex for the same path
-_cache: dict[Path, dict[str, str | list[str] | None] | None] = {}
+from flatdir.plugins.parse_cache import cached_parse
+
+_PATTERN = re.compile(r'^(\d{2})-(\d{2})-(\d{2})-(.+)$')
 
 
 def _parse_generic_pattern(name: str) -> dict[str, str | list[str] | None] | None:
@@ -17,7 +18,7 @@ def _parse_generic_pattern(name: str) -> dict[str, str | list[str] | None] | Non
     
     Extracts the parts and groups the rest into keywords.
     """
-    match = re.search(r'^(\d{2})-(\d{2})-(\d{2})-(.+)$', name)
+    match = _PATTERN.search(name)
     if not match:
         return None
         
@@ -34,12 +35,7 @@ def _parse_generic_pattern(name: str) -> dict[str, str | list[str] | None] | Non
 
 
 def _get_parsed_data(path: Path) -> dict[str, str | list[str] | None] | None:
-    if path in _cache:
-        return _cache[path]
-    
-    res = _parse_generic_pattern(path.name)
-    _cache[path] = res
-    return res
+    return cached_parse(_parse_generic_pattern, path.name)
 
 
 def pattern_year(path: Path, root: Path) -> str | None:
@@ -63,7 +59,8 @@ def pattern_day(path: Path, root: Path) -> str | None:
 def pattern_kw(path: Path, root: Path) -> list[str] | None:
     """Return the keywords as a list of strings."""
     res = _get_parsed_data(path)
-    return res["kw"] if res else None
+    # parse results are shared by every entry with this name
+    return list(res["kw"]) if res else None  # type: ignore[arg-type]
 
 
 def parsed_date(path: Path, root: Path) -> str | None:
@@ -9,13 +9,14 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-# Cache to avoid re-parsing the regex for the same parent path
-_cache: dict[Path, dict[str, str | None] | None] = {}
+from flatdir.plugins.parse_cache import cached_parse
+
+_PATTERN = re.compile(r'^([A-Za-z0-9]+)-(\d{2})-(\d{2})$')
 
 
 def _parse_generic_pattern(name: str) -> dict[str, str | None] | None:
     """A generic parser for [Prefix]-[Year1]-[Year2]."""
-    match = re.search(r'^([A-Za-z0-9]+)-(\d{2})-(\d{2})$', name)
+    match = _PATTERN.search(name)
     if not match:
         return None
         
@@ -29,13 +30,7 @@ def _parse_generic_pattern(name: str) -> dict[str, str | None] | None:
 
 
 def _get_parsed_data(path: Path) -> dict[str, str | None] | None:
-    parent_path = path.parent
-    if parent_path in _cache:
-        return _cache[parent_path]
-    
-    res = _parse_generic_pattern(parent_path.name)
-    _cache[parent_path] = res
-    return res
+    return cached_parse(_parse_generic_pattern, path.parent.name)
 
 
 def parent_pattern_prefix(path: Path, root: Path) -> str | None:
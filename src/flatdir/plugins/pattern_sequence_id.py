@@ -8,16 +8,18 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-_cache: dict[Path, dict[str, int | str | None] | None] = {}
+from flatdir.plugins.parse_cache import cached_parse
+
+_PATTERN = re.compile(r'^([0-9]+)_(.*)$')
 
 
 def _get_parsed_data(path: Path) -> dict[str, int | str | None] | None:
-    if path in _cache:
-        return _cache[path]
-        
-    match = re.search(r'^([0-9]+)_(.*)$', path.name)
+    return cached_parse(_parse_sequence, path.name)
+
+
+def _parse_sequence(name: str) -> dict[str, int | str | None] | None:
+    match = _PATTERN.search(name)
     if not match:
-        _cache[path] = None
         return None
         
     raw_str = match.group(1)
@@ -31,7 +33,6 @@ def _get_parsed_data(path: Path) -> dict[str, int | str | None] | None:
         leading_zeros = len(raw_str) - len(raw_str.lstrip('0'))
         
     if leading_zeros > 10:
-        _cache[path] = None
         return None
         
     res_id = int(raw_str)
@@ -40,7 +41,6 @@ def _get_parsed_data(path: Path) -> dict[str, int | str | None] | None:
         "sequence_id": res_id,
         "sequence_name": name_part
     }
-    _cache[path] = res
     return res
 
 
@@ -4,15 +4,17 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from flatdir.entry import Entry
 from flatdir.plugins import options
 
 
-def subfolders(path: Path, root: Path) -> list[str] | None:
-    if not path.is_dir():
+def subfolders(path: Path, root: Path, entry: Entry | None = None) -> list[str] | None:
+    entry = entry or Entry(path, root)
+    if not entry.is_dir():
         return None
 
     try:
-        folders = [child.name for child in path.iterdir() if child.is_dir()]
+        folders = [child.name for child in entry.children() if child.is_dir()]
     except OSError:
         return None
 
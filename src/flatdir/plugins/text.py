@@ -15,7 +15,8 @@ TEXT_EXTENSIONS = {
 @functools.lru_cache(maxsize=128)
 def _get_text(path: Path) -> str | None:
     """Helper to safely read and cache text content."""
-    if path.is_dir() or path.suffix.lower() not in TEXT_EXTENSIONS:
+    # check the suffix first: it costs no syscall and rules out most entries
+    if path.suffix.lower() not in TEXT_EXTENSIONS or path.is_dir():
         return None
         
     try:
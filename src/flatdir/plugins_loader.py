@@ -3,9 +3,17 @@
 A fields file is a plain Python module where each **public** function
 (i.e. whose name does not start with ``_``) is treated as a field provider.
 
-Each function must accept a single :class:`pathlib.Path` argument (the file
-being listed) and return a JSON-serialisable value. The function name becomes
-the field key in the output.
+Each function receives the :class:`pathlib.Path` being listed and the listing
+root, and returns a JSON-serialisable value (``None`` omits the field). The
+function name becomes the field key in the output.
+
+A function may accept a third ``entry`` argument to receive the
+:class:`~flatdir.entry.Entry` context built by the traversal (cached stat
+result, type, relative parts, depth and child listing) instead of querying the
+filesystem again. Plain ``(path, root)`` functions keep working unchanged.
+
+A ``.toml`` or ``.json`` file is read as declarative pattern definitions
+instead (see :mod:`flatdir.patterns`).
 """
 
 from __future__ import annotations
@@ -16,21 +24,28 @@ import sys
 from pathlib import Path
 from typing import Callable
 
-FieldFunc = Callable[[Path], object]
+FieldFunc = Callable[..., object]
+
+_MODULE_PREFIX = "_flatdir_fields_"
 
 
 def load_fields_file(filepath: str) -> dict[str, FieldFunc]:
     """Import *filepath* as a module and return its public callables.
 
     Returns a ``{name: func}`` mapping for every public, non-class callable
-    defined in the file.
+    defined in the file. Whether a function uses the ``(path, root, entry)``
+    signature is detected with :func:`takes_entry`.
     """
     path = Path(filepath).resolve()
     if not path.is_file():
         raise FileNotFoundError(f"fields file not found: {filepath}")
+    if path.suffix.lower() in (".toml", ".json"):
+        from .patterns import load_pattern_file
+
+        return load_pattern_file(str(path))
 
     # import the file as a temporary module with a unique name
-    module_name = f"_flatdir_fields_{path.stem}_{hash(str(path)) & 0xFFFFFFFF:08x}"
+    module_name = f"{_MODULE_PREFIX}{path.stem}_{hash(str(path)) & 0xFFFFFFFF:08x}"
     spec = importlib.util.spec_from_file_location(module_name, str(path))
     if spec is None or spec.loader is None:
         raise ImportError(f"cannot load fields file: {filepath}")
@@ -51,3 +66,39 @@ def load_fields_file(filepath: str) -> dict[str, FieldFunc]:
         fields[name] = obj
 
     return fields
+
+
+def field_source(func: Callable[..., object]) -> tuple[str, str] | None:
+    """Return ``(filepath, function_name)`` for a field loaded by :func:`load_fields_file`.
+
+    This is enough to load the same field again in another process. Returns
+    None for any other callable (lambdas, functions defined in regular modules).
+    """
+    fields_file = getattr(func, "fields_file", None)
+    if fields_file is not None:
+        # a field generated from a pattern file
+        return fields_file, getattr(func, "__name__", "")
+    module_name = getattr(func, "__module__", None) or ""
+    qualname = getattr(func, "__qualname__", "")
+    if not module_name.startswith(_MODULE_PREFIX) or not qualname.isidentifier():
+        return None
+    module = sys.modules.get(module_name)
+    filepath = getattr(module, "__file__", None)
+    if filepath is None:
+        return None
+    return filepath, qualname
+
+
+def takes_entry(func: Callable[..., object]) -> bool:
+    """Return True if *func* accepts the third positional ``entry`` argument."""
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    positional = 0
+    for param in params:
+        if param.kind is inspect.Parameter.VAR_POSITIONAL:
+            return True
+        if param.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+            positional += 1
+    return positional >= 3
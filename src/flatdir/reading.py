@@ -0,0 +1,192 @@
+"""Read flatdir results back from a text stream, one entry at a time.
+
+:func:`read_entries` accepts everything :mod:`flatdir.output` writes: an
+indented JSON array, a ``--with-headers`` envelope (its ``entries`` array is
+streamed, the other keys are skipped) or newline-delimited JSON. Entries are
+decoded one by one from buffered chunks, so reading never holds more than
+one entry and one chunk in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterator, TextIO
+
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def read_entries(fp: TextIO) -> Iterator[dict[str, object]]:
+    """Yield the entries of a flatdir JSON, envelope or NDJSON document."""
+    reader = _JsonReader(fp)
+    first = reader.peek()
+    if first == "":
+        return
+    if first == "[":
+        yield from _read_array(reader)
+        return
+    if first != "{":
+        raise ValueError("flatdir input must be a JSON array, object or NDJSON")
+
+    # an envelope starts with one of its keys, an NDJSON line with an entry field
+    reader.expect("{")
+    key = reader.value() if reader.peek() == '"' else None
+    if key in ("headers", "entries"):
+        yield from _read_envelope(reader, key)
+        return
+    fp.seek(0)
+    for line in fp:
+        if line.strip():
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError("NDJSON lines must be JSON objects")
+            yield entry
+
+
+def _read_array(reader: _JsonReader) -> Iterator[dict[str, object]]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+    while True:
+        entry = reader.value()
+        if not isinstance(entry, dict):
+            raise ValueError("flatdir entries must be JSON objects")
+        yield entry
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("]")
+        return
+
+
+def _read_envelope(reader: _JsonReader, key: object) -> Iterator[dict[str, object]]:
+    found = False
+    while True:
+        reader.expect(":")
+        if key == "entries":
+            yield from _read_array(reader)
+            found = True
+        else:
+            reader.value()
+        if reader.peek() == ",":
+            reader.expect(",")
+            key = reader.value()
+            continue
+        reader.expect("}")
+        break
+    if not found:
+        raise ValueError("flatdir JSON object has no 'entries' list")
+
+
+class _JsonReader:
+    """Decode consecutive JSON tokens from a text stream read in chunks."""
+
+    def __init__(self, fp: TextIO) -> None:
+        self._fp = fp
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int = 0) -> bool:
+        """Read at least a chunk, or *size* characters, more into the buffer."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(size, _CHUNK_SIZE))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at the end of the stream)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"invalid flatdir JSON: expected {char!r}, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> object:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                # the value may be incomplete: read at least as much again as
+                # is buffered, so decoding a large value restarts a logarithmic
+                # number of times and stays linear in its size
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise ValueError(f"invalid flatdir JSON: {exc}") from exc
+                continue
+            # a number may continue in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and not self._eof
+                and _NUMBER_TAIL.fullmatch(self._buffer, end)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def skip(self) -> None:
+        """Skip the next JSON value without decoding it.
+
+        Containers and strings are scanned for their closing character only,
+        so skipping a large value costs no allocation beyond the read chunks.
+        """
+        if self.peek() not in '[{"':
+            self.value()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while True:
+                found = (_STRING_SPECIAL if in_string else _STRUCTURAL).search(buffer, pos)
+                if found is None:
+                    pos = len(buffer)
+                    break
+                char = found.group()
+                pos = found.end()
+                if in_string:
+                    if char == "\\":
+                        if pos == len(buffer):
+                            # the escaped character is in the next chunk
+                            pos -= 1
+                            break
+                        pos += 1
+                        continue
+                    in_string = False
+                    if depth == 0:
+                        self._pos = pos
+                        return
+                elif char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos
+                        return
+            self._pos = pos
+            if not self._fill():
+                raise ValueError("invalid flatdir JSON: unexpected end of input")
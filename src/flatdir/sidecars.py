@@ -0,0 +1,211 @@
+"""Cache of the JSON sidecar files read by ``--dict-field`` and ``--include-json``.
+
+Parsed documents are kept in least-recently-used order within a byte budget
+measured on the file sizes, so a few large payloads cannot pin an unbounded
+amount of memory, and a document larger than the whole budget is parsed
+again on each use rather than cached. Each lookup stats the file: a cached
+document is only reused while the file keeps the same size and modification
+time, so a sidecar edited during a long-running process is read again.
+
+:meth:`JsonCache.extract` reads only some values of a file, addressed by
+JSON pointers such as ``meta/athlete/name``. Unless the whole document is
+already cached, the file is scanned as a stream: the values on the way to
+the wanted keys are skipped without being decoded, and reading stops as soon
+as every wanted value has been found.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from .reading import _JsonReader
+
+Pointer = tuple[str, ...]
+
+# default byte budget of a JsonCache, in bytes of JSON source
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class JsonCache:
+    """Bounded cache of parsed JSON files, invalidated on size or mtime change.
+
+    ``hits`` counts lookups answered from the cache, ``misses`` the files
+    parsed (missing files count as neither).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._used = 0
+        # path -> (size, mtime_ns, parsed document), least recently used first
+        self._documents: OrderedDict[Path, tuple[int, int, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, json_path: Path) -> object:
+        """Return the parsed content of *json_path*, None if missing or invalid."""
+        st, document = self._lookup(json_path)
+        if st is None or document is not _MISSING:
+            return None if document is _MISSING else document
+
+        document = _parse(json_path)
+        if st.st_size <= self.max_bytes:
+            with self._lock:
+                self._discard(json_path)
+                self._documents[json_path] = (st.st_size, st.st_mtime_ns, document)
+                self._used += st.st_size
+                while self._used > self.max_bytes:
+                    self._discard(next(iter(self._documents)))
+        return document
+
+    def extract(self, json_path: Path, pointers: Iterable[Pointer]) -> dict[Pointer, object]:
+        """Return the values of *json_path* found at *pointers* (see :func:`parse_pointer`).
+
+        Pointers with no value in the file are left out of the result, as is
+        everything if the file is missing or not valid JSON up to the values.
+        """
+        st, document = self._lookup(json_path)
+        if st is None:
+            return {}
+        if document is not _MISSING:
+            found = {pointer: resolve_pointer(document, pointer) for pointer in pointers}
+            return {pointer: value for pointer, value in found.items() if value is not _MISSING}
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                return _extract(f, pointers)
+        except (OSError, UnicodeDecodeError, ValueError):
+            return {}
+
+    def clear(self) -> None:
+        """Drop every cached document (the counters are kept)."""
+        with self._lock:
+            self._documents.clear()
+            self._used = 0
+
+    def _lookup(self, json_path: Path) -> tuple[os.stat_result | None, object]:
+        """Stat *json_path* and return its valid cached document (``_MISSING`` if none).
+
+        The stat result is None for missing files and non-regular files.
+        """
+        try:
+            st = os.stat(json_path)
+        except OSError:
+            return None, _MISSING
+        if not stat.S_ISREG(st.st_mode):
+            return None, _MISSING
+        with self._lock:
+            cached = self._documents.get(json_path)
+            if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                self._documents.move_to_end(json_path)
+                self.hits += 1
+                return st, cached[2]
+            self.misses += 1
+        return st, _MISSING
+
+    def _discard(self, json_path: Path) -> None:
+        cached = self._documents.pop(json_path, None)
+        if cached is not None:
+            self._used -= cached[0]
+
+
+def _parse(json_path: Path) -> object:
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+
+
+_MISSING = object()
+
+
+def parse_pointer(pointer: str) -> Pointer:
+    """Split a JSON pointer such as ``meta/athlete/name`` into its keys.
+
+    A leading ``/`` is optional; ``~1`` and ``~0`` stand for ``/`` and ``~``
+    inside a key, and a key made of digits also indexes a list. A plain
+    key without ``/`` is a pointer to a top-level key.
+    """
+    if pointer.startswith("/"):
+        pointer = pointer[1:]
+    return tuple(part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/"))
+
+
+def resolve_pointer(document: object, pointer: Pointer) -> object:
+    """Return the value of *document* at *pointer*, ``_MISSING`` if there is none."""
+    for key in pointer:
+        if isinstance(document, dict):
+            if key not in document:
+                return _MISSING
+            document = document[key]
+        elif isinstance(document, list) and key.isdigit() and int(key) < len(document):
+            document = document[int(key)]
+        else:
+            return _MISSING
+    return document
+
+
+def _extract(fp: TextIO, pointers: Iterable[Pointer]) -> dict[Pointer, object]:
+    """Scan the JSON document of *fp* for the values at *pointers*."""
+    extraction = _Extraction(pointers)
+    reader = _JsonReader(fp)
+    if reader.peek() in ("{", "["):
+        extraction.container(reader, ())
+    return extraction.found
+
+
+class _Extraction:
+    """State of one streaming extraction: the pointers still wanted and the values found."""
+
+    def __init__(self, pointers: Iterable[Pointer]) -> None:
+        self.pending = set(pointers)
+        self.found: dict[Pointer, object] = {}
+
+    def _below(self, prefix: Pointer) -> list[Pointer]:
+        return [pointer for pointer in self.pending if pointer[: len(prefix)] == prefix]
+
+    def container(self, reader: _JsonReader, prefix: Pointer) -> None:
+        """Walk the object or list at the reader, stopping once nothing is pending."""
+        is_object = reader.peek() == "{"
+        closing = "}" if is_object else "]"
+        reader.expect("{" if is_object else "[")
+        if reader.peek() == closing:
+            reader.expect(closing)
+        else:
+            index = 0
+            while True:
+                if is_object:
+                    key = reader.value()
+                    reader.expect(":")
+                else:
+                    key = str(index)
+                    index += 1
+                self.member(reader, prefix + (str(key),))
+                if not self.pending:
+                    return
+                if reader.peek() == ",":
+                    reader.expect(",")
+                    continue
+                reader.expect(closing)
+                break
+        # the container is over: what was wanted below it is not in the file
+        self.pending.difference_update(self._below(prefix))
+
+    def member(self, reader: _JsonReader, path: Pointer) -> None:
+        if path in self.pending:
+            value = reader.value()
+            for pointer in self._below(path):
+                found = resolve_pointer(value, pointer[len(path) :])
+                if found is not _MISSING:
+                    self.found[pointer] = found
+                self.pending.discard(pointer)
+        elif self._below(path) and reader.peek() in ("{", "["):
+            self.container(reader, path)
+        else:
+            reader.skip()
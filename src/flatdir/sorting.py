@@ -0,0 +1,103 @@
+"""Sort flatdir entries, spilling to temporary files when they do not fit in memory.
+
+Entries are ordered with :func:`sort_key`: missing values first, then
+numbers, then strings compared case-insensitively. :func:`external_sort`
+sorts runs of at most ``buffer_size`` entries in memory, writes each run to
+a temporary file and k-way merges the runs, so only one run plus one entry
+per run is held in memory at a time. When only the first entries of the
+sorted order are needed, :func:`top_k` keeps a bounded heap instead.
+"""
+
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from typing import IO, Callable, Iterable, Iterator
+
+SortKey = Callable[[dict[str, object]], tuple[int, object]]
+
+DEFAULT_BUFFER_SIZE = 100_000
+
+
+def sort_key(field: str) -> SortKey:
+    """Return the key function ordering entries by *field* (None < numbers < strings)."""
+
+    def _get_sort_key(entry: dict[str, object]) -> tuple[int, object]:
+        val = entry.get(field)
+        if val is None:
+            return (0, "")
+        if isinstance(val, (int, float)):
+            return (1, val)
+        return (2, str(val).lower())
+
+    return _get_sort_key
+
+
+def external_sort(
+    entries: Iterable[dict[str, object]],
+    key: SortKey,
+    reverse: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[dict[str, object]]:
+    """Yield *entries* sorted by *key*, holding at most *buffer_size* of them in memory.
+
+    The sort is stable like ``list.sort``: entries with equal keys keep their
+    input order, with or without *reverse*.
+    """
+    runs: list[IO[bytes]] = []
+    buffer: list[dict[str, object]] = []
+    try:
+        for entry in entries:
+            buffer.append(entry)
+            if len(buffer) >= buffer_size:
+                buffer.sort(key=key, reverse=reverse)
+                runs.append(_spill(buffer))
+                buffer = []
+        buffer.sort(key=key, reverse=reverse)
+        if not runs:
+            yield from buffer
+            return
+        streams = [_read_run(run) for run in runs]
+        streams.append(iter(buffer))
+        yield from heapq.merge(*streams, key=key, reverse=reverse)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def top_k(
+    entries: Iterable[dict[str, object]],
+    key: SortKey,
+    k: int,
+    reverse: bool = False,
+) -> list[dict[str, object]]:
+    """Return ``sorted(entries, key=key, reverse=reverse)[:k]`` using O(k) memory.
+
+    Selection runs on a heap of *k* entries in O(n log k); ties keep their
+    input order exactly as the full stable sort would.
+    """
+    if reverse:
+        return heapq.nlargest(k, entries, key=key)
+    return heapq.nsmallest(k, entries, key=key)
+
+
+def _spill(entries: list[dict[str, object]]) -> IO[bytes]:
+    """Write a sorted run to an anonymous temporary file and rewind it."""
+    run = tempfile.TemporaryFile()
+    pickler = pickle.Pickler(run, protocol=pickle.HIGHEST_PROTOCOL)
+    for entry in entries:
+        pickler.dump(entry)
+        # entries are independent, do not keep them all alive in the memo
+        pickler.clear_memo()
+    run.seek(0)
+    return run
+
+
+def _read_run(run: IO[bytes]) -> Iterator[dict[str, object]]:
+    unpickler = pickle.Unpickler(run)
+    while True:
+        try:
+            yield unpickler.load()
+        except EOFError:
+            return
@@ -0,0 +1,180 @@
+"""Tests for --cache (persistent field values reused across runs)."""
+
+import json
+import sys
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.cache import FieldCache
+from flatdir.listing import list_entries
+from flatdir.plugins_loader import load_fields_file
+
+PLUGINS = Path(__file__).resolve().parents[1] / "src" / "flatdir" / "plugins"
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path, Path]:
+    root = tmp_path / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("aaa")
+    (root / "sub" / "b.txt").write_text("bb")
+    log = tmp_path / "calls.log"
+    fields_file = tmp_path / "fields.py"
+    fields_file.write_text(
+        "def upper(path, root):\n"
+        f"    with open({str(log)!r}, 'a') as f:\n"
+        "        f.write(path.name + '\\n')\n"
+        "    return path.name.upper()\n"
+    )
+    return root, fields_file, log
+
+
+def _calls(log: Path) -> list[str]:
+    if not log.exists():
+        return []
+    calls = log.read_text().split()
+    log.unlink()
+    return sorted(calls)
+
+
+def test_unchanged_entries_are_not_recomputed(tmp_path: Path):
+    root, fields_file, log = _setup(tmp_path)
+    fields = load_fields_file(str(fields_file))
+
+    cache = FieldCache(tmp_path / "cache.db")
+    first = list_entries(root, fields=fields, cache=cache)
+    assert _calls(log) == ["a.txt", "b.txt", "sub"]
+    assert cache.misses == 3 and cache.hits == 0
+    cache.close()
+
+    cache = FieldCache(tmp_path / "cache.db")
+    second = list_entries(root, fields=fields, cache=cache)
+    assert _calls(log) == []
+    assert cache.hits == 3 and cache.misses == 0
+    assert second == first
+    cache.close()
+
+
+def test_changed_entry_is_recomputed(tmp_path: Path):
+    root, fields_file, log = _setup(tmp_path)
+    fields = load_fields_file(str(fields_file))
+    list_entries(root, fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    _calls(log)
+
+    (root / "a.txt").write_text("changed")
+    entries = list_entries(root, fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    assert _calls(log) == ["a.txt"]
+    assert {e["name"]: e["upper"] for e in entries}["a.txt"] == "A.TXT"
+
+
+def test_plugin_change_invalidates_values(tmp_path: Path):
+    root, fields_file, log = _setup(tmp_path)
+    list_entries(root, fields=load_fields_file(str(fields_file)), cache=FieldCache(tmp_path / "cache.db"))
+    _calls(log)
+
+    fields_file.write_text(fields_file.read_text().replace(".upper()", ".lower()"))
+    entries = list_entries(
+        root, fields=load_fields_file(str(fields_file)), cache=FieldCache(tmp_path / "cache.db")
+    )
+    assert _calls(log) == ["a.txt", "b.txt", "sub"]
+    assert {e["name"]: e["upper"] for e in entries}["a.txt"] == "a.txt"
+
+
+def test_uncacheable_fields_are_always_computed(tmp_path: Path):
+    root, _, _ = _setup(tmp_path)
+    calls = []
+
+    def inline(p, root):
+        calls.append(p.name)
+        return 1
+
+    extended = load_fields_file(str(PLUGINS / "extended.py"))
+    fields = {"inline": inline, "file_uuid": extended["file_uuid"]}
+    first = list_entries(root, fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    second = list_entries(root, fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    assert len(calls) == 6
+    assert {e["file_uuid"] for e in first}.isdisjoint(e["file_uuid"] for e in second)
+
+
+def test_cache_with_processes(tmp_path: Path):
+    root, fields_file, log = _setup(tmp_path)
+    fields = load_fields_file(str(fields_file))
+    first = list_entries(root, fields=fields, processes=2, cache=FieldCache(tmp_path / "cache.db"))
+    assert _calls(log) == ["a.txt", "b.txt", "sub"]
+    second = list_entries(root, fields=fields, processes=2, cache=FieldCache(tmp_path / "cache.db"))
+    assert _calls(log) == []
+    assert second == first
+
+
+def test_counts_of_worker_threads_add_up(tmp_path: Path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    for i in range(400):
+        (root / f"{i:03d}.txt").write_text(str(i))
+    fields = load_fields_file(str(PLUGINS / "extended.py"))
+    # switch threads as often as possible to expose unsynchronised updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for expected in ((0, 400), (400, 0)):
+            cache = FieldCache(tmp_path / "cache.db")
+            list_entries(root, fields={"sha256": fields["sha256"]}, workers=8, cache=cache)
+            assert (cache.hits, cache.misses) == expected
+            cache.close()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_cli_cache_reports_hits_in_headers(tmp_path: Path, capsys):
+    root, fields_file, log = _setup(tmp_path)
+    argv = [str(root), "--fields", str(fields_file), "--cache", str(tmp_path / "cache.db"), "--with-headers"]
+
+    assert main(argv) == 0
+    headers = json.loads(capsys.readouterr().out)["headers"]
+    assert (headers["cache_hits"], headers["cache_misses"]) == (0, 3)
+
+    assert main(argv) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert (data["headers"]["cache_hits"], data["headers"]["cache_misses"]) == (3, 0)
+    assert {e["name"]: e["upper"] for e in data["entries"]}["b.txt"] == "B.TXT"
+    assert _calls(log) == ["a.txt", "b.txt", "sub"]
+
+
+def test_root_relative_fields_are_keyed_by_root(tmp_path: Path):
+    root, _, _ = _setup(tmp_path)
+    fields = {**load_fields_file(str(PLUGINS / "depth.py")), **load_fields_file(str(PLUGINS / "parent.py"))}
+    list_entries(root, fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    entries = list_entries(root / "sub", fields=fields, cache=FieldCache(tmp_path / "cache.db"))
+    assert [(e["name"], e["depth"], e["parent"]) for e in entries] == [("b.txt", 1, ".")]
+    assert entries == list_entries(root / "sub", fields=fields)
+
+
+def test_plugin_options_are_part_of_the_key(tmp_path: Path, capsys):
+    root, _, _ = _setup(tmp_path)
+    (root / "sub" / "x").mkdir()
+    (root / "sub" / "y").mkdir()
+    fields = str(PLUGINS / "subfolders.py")
+    argv = [str(root), "--fields", fields, "--cache", str(tmp_path / "cache.db"), "--depth", "0"]
+
+    assert main(argv + ["--subfolders-whitelist", "x"]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    assert {e["name"]: e.get("subfolders") for e in entries}["sub"] == ["x"]
+    assert main(argv + ["--subfolders-whitelist", "y"]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    assert {e["name"]: e.get("subfolders") for e in entries}["sub"] == ["y"]
+
+
+def test_cli_cache_counts_hits_of_worker_processes(tmp_path: Path, capsys):
+    root, fields_file, _ = _setup(tmp_path)
+    argv = [str(root), "--fields", str(fields_file), "--cache", str(tmp_path / "cache.db"), "--with-headers"]
+
+    assert main(argv + ["--processes", "2"]) == 0
+    headers = json.loads(capsys.readouterr().out)["headers"]
+    assert (headers["cache_hits"], headers["cache_misses"]) == (0, 3)
+    assert main(argv + ["--processes", "2"]) == 0
+    headers = json.loads(capsys.readouterr().out)["headers"]
+    assert (headers["cache_hits"], headers["cache_misses"]) == (3, 0)
+
+
+def test_cli_cache_requires_a_path(capsys):
+    assert main([".", "--cache"]) == 1
+    assert "--cache requires" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+"""Tests for the columnar output formats (--format csv|parquet|arrow)."""
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.columnar import field_schema, write_columnar
+from flatdir.listing import DEFAULT_FIELDS
+
+
+def test_field_schema_reads_plugin_annotations():
+    def tags(path: Path, root: Path) -> list[str]:
+        return []
+
+    def anything(path, root):
+        return None
+
+    schema = field_schema({**DEFAULT_FIELDS, "tags": tags, "anything": anything})
+    assert schema["name"] == "string"
+    assert schema["size"] == "int"
+    assert schema["mtime"] == "string"
+    assert schema["tags"] == "json"
+    assert schema["anything"] is None
+
+
+def test_csv_columns_types_and_nested_values():
+    entries = [
+        {"name": "a", "size": 3, "flag": True, "meta": {"k": 1}},
+        {"name": "b", "ratio": 0.5},
+        {"name": "c", "size": "big", "late": 1},
+    ]
+    out = io.StringIO()
+    assert write_columnar(entries, out, "csv", {"name": "string", "size": "int"}, batch_size=2) == 3
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    # columns come from the first batch; "late" is only met in the second one
+    assert list(rows[0]) == ["name", "size", "flag", "meta", "ratio"]
+    assert rows[0] == {"name": "a", "size": "3", "flag": "true", "meta": '{"k": 1}', "ratio": ""}
+    assert rows[1]["ratio"] == "0.5"
+    # a value that does not fit its typed column is left empty
+    assert rows[2]["size"] == ""
+
+
+def test_csv_with_no_entries():
+    out = io.StringIO()
+    assert write_columnar([], out, "csv", {"name": "string", "path": "string"}) == 0
+    assert out.getvalue().strip() == "name,path"
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_formats(tmp_path: Path, fmt: str):
+    pa = pytest.importorskip("pyarrow")
+    entries = [{"name": f"f{i}", "size": i, "tags": ["x"]} for i in range(5)] + [{"name": "dir"}]
+    target = tmp_path / f"index.{fmt}"
+    assert write_columnar(entries, str(target), fmt, {"name": "string", "size": "int"}, batch_size=4) == 6
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(target)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(target))).read_all()
+    assert table.schema.field("size").type == pa.int64()
+    assert table.column("size").to_pylist() == [0, 1, 2, 3, 4, None]
+    assert table.column("tags").to_pylist()[0] == '["x"]'
+
+
+def test_cli_csv(tmp_path: Path, capsys):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "a.txt").write_text("abc")
+    (root / "b.txt").write_text("b")
+
+    out_file = tmp_path / "index.csv"
+    assert main([str(root), "--format", "csv", "--sort", "name", "--output", str(out_file)]) == 0
+    with open(out_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["name"] for row in rows] == ["a.txt", "b.txt", "sub"]
+    assert rows[0]["size"] == "3" and rows[2]["size"] == ""
+
+    assert main([str(root), "--format", "csv", "--stream", "--add", "tag=x"]) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert len(rows) == 3 and {row["tag"] for row in rows} == {"x"}
+    assert json.dumps(sorted(row["name"] for row in rows)) == '["a.txt", "b.txt", "sub"]'
+
+
+def test_cli_columnar_errors(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--format", "csv", "--tree"]) == 1
+    assert main([str(tmp_path), "--format", "parquet"]) == 1
+    _, err = capsys.readouterr()
+    assert "--format csv cannot be combined with --tree" in err
+    assert "--format parquet requires --output" in err
@@ -0,0 +1,114 @@
+"""Tests for --compact output and the pluggable JSON encoders."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.output import ChunkedWriter, get_encoder, write_output, write_stream
+
+ENTRIES = [
+    {"name": "été.txt", "type": "file", "size": 3, "tags": ["a", "b"], "meta": {"k": None, "f": 1.5}},
+    {"name": "big", "type": "file", "size": 2**70},
+]
+
+
+def _compact(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_json_encoder_matches_stdlib():
+    encode = get_encoder("json")
+    assert encode.backend == "json"
+    for entry in ENTRIES:
+        assert encode(entry) == _compact(entry)
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec"])
+def test_accelerated_encoders_round_trip(backend: str):
+    pytest.importorskip(backend)
+    encode = get_encoder(backend)
+    assert encode.backend == backend
+    for entry in ENTRIES:
+        # integers beyond 64 bits fall back to the standard module
+        assert json.loads(encode(entry)) == entry
+    assert "été" in encode(ENTRIES[0])
+
+
+def test_unknown_or_missing_encoder(monkeypatch):
+    with pytest.raises(ValueError):
+        get_encoder("yaml")
+    monkeypatch.setitem(__import__("sys").modules, "msgspec", None)
+    with pytest.raises(ImportError):
+        get_encoder("msgspec")
+
+
+def test_compact_writers_match_stdlib():
+    encode = get_encoder("json")
+    out = io.StringIO()
+    assert write_stream(ENTRIES, out, "json", encode) == 2
+    assert out.getvalue() == _compact(ENTRIES) + "\n"
+
+    out = io.StringIO()
+    write_stream(ENTRIES, out, "ndjson", encode)
+    assert out.getvalue() == "".join(_compact(entry) + "\n" for entry in ENTRIES)
+
+    out = io.StringIO()
+    write_output({"entries": []}, out, "json", encode)
+    assert out.getvalue() == '{"entries":[]}\n'
+
+
+def test_indented_output_unchanged():
+    out = io.StringIO()
+    write_output({"headers": {"n": 2}, "entries": ENTRIES}, out)
+    assert out.getvalue() == json.dumps({"headers": {"n": 2}, "entries": ENTRIES}, ensure_ascii=False, indent=4) + "\n"
+
+
+def test_chunked_writer_batches_writes():
+    class Recorder(io.StringIO):
+        calls = 0
+
+        def write(self, text):
+            Recorder.calls += 1
+            return super().write(text)
+
+    out = Recorder()
+    writer = ChunkedWriter(out, chunk_size=10)
+    for piece in ["abc", "defg", "hij", "k"]:
+        writer.write(piece)
+    assert Recorder.calls == 1  # "abcdefghij" reached the chunk size
+    writer.flush()
+    assert out.getvalue() == "abcdefghijk" and Recorder.calls == 2
+
+
+def test_cli_compact(tmp_path: Path, capsys):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "a.txt").write_text("a")
+    (root / "b.txt").write_text("bb")
+
+    assert main([str(root), "--sort", "name"]) == 0
+    expected = json.loads(capsys.readouterr().out)
+
+    out_file = tmp_path / "out.json"
+    assert main([str(root), "--sort", "name", "--compact", "--output", str(out_file)]) == 0
+    text = out_file.read_text(encoding="utf-8")
+    assert text.count("\n") == 1 and "\", " not in text and "\": " not in text
+    assert json.loads(text) == expected
+
+    assert main([str(root), "--sort", "name", "--compact", "--encoder", "json", "--stream"]) == 0
+    assert capsys.readouterr().out == _compact(expected) + "\n"
+
+    assert main([str(root), "--tree", "--compact", "--stream"]) == 0
+    tree = json.loads(capsys.readouterr().out)
+    assert tree["name"] == "root"
+
+
+def test_cli_encoder_errors(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--encoder", "json"]) == 1
+    assert main([str(tmp_path), "--compact", "--encoder", "yaml"]) == 1
+    _, err = capsys.readouterr()
+    assert "--encoder requires --compact" in err
+    assert "--encoder must be one of" in err
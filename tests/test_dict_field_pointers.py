@@ -0,0 +1,82 @@
+"""Tests for --dict-field JSON pointers and partial sidecar extraction."""
+
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.sidecars import JsonCache, parse_pointer
+
+
+def test_parse_pointer():
+    assert parse_pointer("year") == ("year",)
+    assert parse_pointer("meta/athlete/name") == ("meta", "athlete", "name")
+    assert parse_pointer("/meta/a~1b/c~0d") == ("meta", "a/b", "c~d")
+
+
+def test_extract_nested_values_and_list_indexes(tmp_path: Path):
+    doc = tmp_path / "doc.json"
+    doc.write_text(json.dumps({
+        "skip": {"deep": ["x", {"y": 'a " string } with ] brackets \\'}]},
+        "meta": {"athlete": {"name": "Ada", "club": "ECL"}, "tags": ["a", "b"]},
+        "year": 2024,
+    }))
+    found = JsonCache().extract(doc, [("meta", "athlete", "name"), ("meta", "tags", "1"), ("year",), ("nope",)])
+    assert found == {("meta", "athlete", "name"): "Ada", ("meta", "tags", "1"): "b", ("year",): 2024}
+
+
+def test_extract_stops_at_the_last_wanted_key(tmp_path: Path):
+    doc = tmp_path / "dump.json"
+    # everything after the wanted key is invalid: it must never be read
+    doc.write_text('{"year": 2024, "annotations": [' + "{" * 10)
+    assert JsonCache().extract(doc, [("year",)]) == {("year",): 2024}
+    assert JsonCache().extract(doc, [("annotations", "0")]) == {}
+
+
+def test_extract_skips_large_values_across_chunks(tmp_path: Path):
+    doc = tmp_path / "big.json"
+    frames = [{"i": i, "label": f'frame "{i}" {{[ \\', "points": list(range(20))} for i in range(5000)]
+    doc.write_text(json.dumps({"frames": frames, "meta": {"author": "Ada"}}))
+    assert doc.stat().st_size > 1 << 17
+    assert JsonCache().extract(doc, [("meta", "author")]) == {("meta", "author"): "Ada"}
+
+
+def test_extract_whole_subtree_and_deeper_pointer(tmp_path: Path):
+    doc = tmp_path / "doc.json"
+    doc.write_text(json.dumps({"meta": {"athlete": {"name": "Ada"}}}))
+    found = JsonCache().extract(doc, [("meta",), ("meta", "athlete", "name")])
+    assert found == {("meta",): {"athlete": {"name": "Ada"}}, ("meta", "athlete", "name"): "Ada"}
+
+
+def test_dict_field_pointer_in_listing(tmp_path: Path):
+    course = tmp_path / "ALG"
+    course.mkdir()
+    (course / "ALG.json").write_text(json.dumps({"meta": {"athlete": {"name": "Ada"}}, "year": 2024}))
+    (course / "other.json").write_text(json.dumps({"version": 3}))
+    entries = list_entries(
+        tmp_path,
+        dict_fields=[("meta/athlete/name", None), ("version", "other.json"), ("year", None)],
+    )
+    alg = next(e for e in entries if e["name"] == "ALG")
+    assert alg["meta/athlete/name"] == "Ada"
+    assert alg["version"] == 3 and alg["year"] == 2024
+    assert list(alg)[-3:] == ["meta/athlete/name", "version", "year"]
+
+
+def test_cli_dict_field_pointer(tmp_path: Path, capsys):
+    course = tmp_path / "ALG"
+    course.mkdir()
+    (course / "ALG.json").write_text(json.dumps({"meta": {"athlete": {"name": "Ada"}}}))
+    assert main([str(tmp_path), "--dict-field", "meta/athlete/name", "--only", "meta/athlete/name=Ada"]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    assert [e["name"] for e in entries] == ["ALG"]
+
+
+def test_extract_with_values_split_across_chunks(tmp_path: Path, monkeypatch):
+    from flatdir import reading
+
+    monkeypatch.setattr(reading, "_CHUNK_SIZE", 3)
+    doc = tmp_path / "doc.json"
+    doc.write_text(json.dumps({"a": ['x\\"]}', {"b": "\\\\"}], "k": {"z": [1, {"w": 2.5}]}, "m": -12.5e3}))
+    found = JsonCache().extract(doc, [("k", "z", "1", "w"), ("m",)])
+    assert found == {("k", "z", "1", "w"): 2.5, ("m",): -12500.0}
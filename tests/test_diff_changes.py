@@ -0,0 +1,144 @@
+"""Tests for change classification, changed fields and move detection in diffs."""
+
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.compare import compare_entries, iter_changes
+
+PLUGINS = Path(__file__).resolve().parents[1] / "src" / "flatdir" / "plugins"
+EXTENDED = PLUGINS / "extended.py"
+
+
+def test_modified_entries_list_changed_fields():
+    old = [{"path": ".", "name": "a", "size": 1, "mtime": "x", "owner": 1}]
+    new = [{"path": ".", "name": "a", "size": 2, "mtime": "y", "tag": "t"}]
+    (change,) = compare_entries(old, new)
+    assert change["change"] == "modified"
+    assert change["changed_fields"] == ["mtime", "owner", "size", "tag"]
+
+
+def test_moves_detected_by_identity_field():
+    old = [
+        {"path": ".", "name": "a.txt", "type": "file", "sha256": "h1"},
+        {"path": "old", "name": "b.txt", "type": "file", "sha256": "h2"},
+    ]
+    new = [
+        {"path": ".", "name": "renamed.txt", "type": "file", "sha256": "h1"},
+        {"path": "new", "name": "b.txt", "type": "file", "sha256": "h2"},
+    ]
+    changes = compare_entries(old, new, move_fields=("sha256",))
+    assert [(c["name"], c["change"], c["moved_from"], c["changed_fields"]) for c in changes] == [
+        ("renamed.txt", "moved", "a.txt", ["name"]),
+        ("b.txt", "moved", "old/b.txt", ["path"]),
+    ]
+    # without identity fields the same snapshots are two removals and two additions
+    assert sorted(c["change"] for c in compare_entries(old, new)) == ["added", "added", "removed", "removed"]
+
+
+def test_moves_require_same_type_and_identity():
+    old = [
+        {"path": ".", "name": "d", "type": "directory", "inode": 7},
+        {"path": ".", "name": "x", "type": "file", "inode": 8},
+    ]
+    new = [
+        {"path": ".", "name": "e", "type": "file", "inode": 7},
+        {"path": ".", "name": "y", "type": "file", "inode": 9},
+    ]
+    changes = compare_entries(old, new, move_fields=("inode",))
+    assert [(c["name"], c["change"]) for c in changes] == [
+        ("d", "removed"),
+        ("e", "added"),
+        ("x", "removed"),
+        ("y", "added"),
+    ]
+
+
+def test_hash_moves_need_a_unique_hash_and_skip_empty_files():
+    old = [
+        {"path": "a", "name": "copy1", "type": "file", "size": 4, "sha256": "dup"},
+        {"path": "a", "name": "copy2", "type": "file", "size": 4, "sha256": "dup"},
+        {"path": "a", "name": "empty", "type": "file", "size": 0, "sha256": "e3b0"},
+        {"path": "a", "name": "solo", "type": "file", "size": 4, "sha256": "one"},
+    ]
+    new = [
+        {"path": "b", "name": "copy3", "type": "file", "size": 4, "sha256": "dup"},
+        {"path": "b", "name": "other_empty", "type": "file", "size": 0, "sha256": "e3b0"},
+        {"path": "b", "name": "solo", "type": "file", "size": 4, "sha256": "one"},
+    ]
+    changes = compare_entries(old, new, move_fields=("sha256",))
+    # copies and empty files share a hash: they are not paired
+    assert [(c["name"], c["change"]) for c in changes] == [
+        ("copy1", "removed"),
+        ("copy2", "removed"),
+        ("empty", "removed"),
+        ("copy3", "added"),
+        ("other_empty", "added"),
+        ("solo", "moved"),
+    ]
+
+
+def test_matched_entries_are_not_kept():
+    from flatdir.compare import _MoveMatcher
+
+    matcher = _MoveMatcher(("inode",))
+    for i in range(100):
+        assert list(matcher.removed({"path": "a", "name": str(i), "type": "file", "inode": i})) == []
+        (moved,) = matcher.added({"path": "b", "name": str(i), "type": "file", "inode": i})
+        assert moved["change"] == "moved"
+    assert matcher._waiting == {}
+    assert list(matcher.unmatched()) == []
+
+
+def test_streamed_moves_wait_for_their_counterpart():
+    old = [{"path": "a", "name": "f", "type": "file", "inode": 1}, {"path": "b", "name": "g", "type": "file"}]
+    new = [{"path": "a", "name": "h", "type": "file"}, {"path": "z", "name": "f", "type": "file", "inode": 1}]
+    changes = list(iter_changes(old, new, ("inode",)))
+    assert [(c["path"], c["name"], c["change"]) for c in changes] == [
+        ("a", "h", "added"),
+        ("b", "g", "removed"),
+        ("z", "f", "moved"),
+    ]
+
+
+def test_cli_diff_detects_moves_with_extended_fields(tmp_path: Path, capsys):
+    scan_dir = tmp_path / "data"
+    (scan_dir / "in").mkdir(parents=True)
+    (scan_dir / "out").mkdir()
+    (scan_dir / "in" / "report.txt").write_text("quarterly numbers")
+    (scan_dir / "notes.txt").write_text("notes")
+
+    baseline = tmp_path / "baseline.json"
+    argv = [str(scan_dir), "--fields", str(EXTENDED), "--exclude", "type=directory"]
+    assert main(argv + ["--output", str(baseline)]) == 0
+
+    (scan_dir / "in" / "report.txt").rename(scan_dir / "out" / "report.txt")
+    (scan_dir / "notes.txt").write_text("more notes")
+
+    for extra in ([], ["--stream"]):
+        assert main(argv + ["--diff", str(baseline)] + extra) == 0
+        changes = {c["name"]: c for c in json.loads(capsys.readouterr().out)}
+        assert changes["report.txt"]["change"] == "moved"
+        assert changes["report.txt"]["moved_from"] == "in/report.txt"
+        assert "path" in changes["report.txt"]["changed_fields"]
+        assert changes["notes.txt"]["change"] == "modified"
+        assert {"sha256", "size"} <= set(changes["notes.txt"]["changed_fields"])
+
+
+def test_cli_diff_detects_moves_with_the_inode_plugin(tmp_path: Path, capsys):
+    scan_dir = tmp_path / "data"
+    scan_dir.mkdir()
+    (scan_dir / "draft.txt").write_text("text")
+    baseline = tmp_path / "baseline.json"
+    argv = [str(scan_dir), "--fields", str(PLUGINS / "inode.py")]
+    assert main(argv + ["--output", str(baseline)]) == 0
+    assert "inode" in json.loads(baseline.read_text())[0]
+
+    (scan_dir / "draft.txt").rename(scan_dir / "final.txt")
+    assert main(argv + ["--diff", str(baseline)]) == 0
+    (change,) = json.loads(capsys.readouterr().out)
+    assert (change["name"], change["change"], change["moved_from"]) == ("final.txt", "moved", "draft.txt")
+
+    # extended.py keeps its own set of fields
+    assert main([str(scan_dir), "--fields", str(EXTENDED)]) == 0
+    assert "inode" not in json.loads(capsys.readouterr().out)[0]
@@ -56,3 +56,47 @@ def test_diff_option_requires_file_argument(capsys):
 
     _, err = capsys.readouterr()
     assert "--diff requires a file path argument" in err
+
+
+def test_diff_subcommand_lists_with_stored_command(tmp_path: Path, capsys, monkeypatch):
+    scan_dir = tmp_path / "data"
+    scan_dir.mkdir()
+    (scan_dir / "a.txt").write_text("a")
+    (scan_dir / "skip.log").write_text("x")
+
+    baseline = tmp_path / "baseline.json"
+    rc = main([str(scan_dir), "--exclude", "name=skip.log", "--with-headers", "--output", str(baseline)])
+    assert rc == 0
+    written = baseline.read_text()
+
+    (scan_dir / "b.txt").write_text("b")
+    (scan_dir / "other.log").write_text("x")
+    monkeypatch.chdir(tmp_path)
+
+    rc = main(["diff", str(baseline)])
+    assert rc == 0
+
+    data = json.loads(capsys.readouterr().out)
+    assert sorted(entry["name"] for entry in data) == ["b.txt", "other.log"]
+    # the stored --output is not written again while computing the diff
+    assert baseline.read_text() == written
+
+
+def test_diff_subcommand_ignores_stored_tree_layout(tmp_path: Path, capsys):
+    scan_dir = tmp_path / "data"
+    scan_dir.mkdir()
+    (scan_dir / "a.txt").write_text("a")
+
+    baseline = tmp_path / "baseline.json"
+    rc = main([str(scan_dir), "--with-headers", "--output", str(baseline)])
+    assert rc == 0
+    data = json.loads(baseline.read_text())
+    data["headers"]["command"] += " --tree"
+    baseline.write_text(json.dumps(data))
+
+    (scan_dir / "a.txt").write_text("changed")
+    rc = main(["diff", str(baseline)])
+    assert rc == 0
+    changed = json.loads(capsys.readouterr().out)
+    assert [entry["name"] for entry in changed] == ["a.txt"]
+    assert changed[0]["size"] == 7
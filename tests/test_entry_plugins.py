@@ -0,0 +1,94 @@
+"""Tests for the (path, root, entry) field plugin protocol."""
+
+from pathlib import Path
+
+from flatdir.entry import Entry
+from flatdir.listing import list_entries
+from flatdir.plugins_loader import load_fields_file, takes_entry
+
+PLUGINS = Path(__file__).resolve().parents[1] / "src" / "flatdir" / "plugins"
+
+
+def test_takes_entry_detects_signatures():
+    assert not takes_entry(lambda p, root: None)
+    assert takes_entry(lambda p, root, entry: None)
+    assert takes_entry(lambda p, root, entry=None: None)
+    assert takes_entry(lambda *args: None)
+    assert not takes_entry(lambda p, root, *, entry=None: None)
+
+
+def test_entry_plugin_receives_context(tmp_path: Path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.txt").write_text("abc")
+    fields_file = tmp_path.parent / f"{tmp_path.name}_fields.py"
+    fields_file.write_text(
+        "def ctx_depth(path, root, entry):\n"
+        "    return entry.depth\n"
+        "def ctx_parts(path, root, entry):\n"
+        "    return list(entry.parts)\n"
+        "def ctx_size(path, root, entry):\n"
+        "    st = entry.stat()\n"
+        "    return None if entry.is_dir() else st.st_size\n"
+        "def legacy(path, root):\n"
+        "    return path.name.upper()\n"
+    )
+    fields = load_fields_file(str(fields_file))
+
+    entries = list_entries(tmp_path, fields=fields)
+    by_name = {e["name"]: e for e in entries}
+    assert by_name["a.txt"]["ctx_depth"] == 2
+    assert by_name["a.txt"]["ctx_parts"] == ["sub", "a.txt"]
+    assert by_name["a.txt"]["ctx_size"] == 3
+    assert by_name["a.txt"]["legacy"] == "A.TXT"
+    assert by_name["sub"]["ctx_depth"] == 1
+    assert "ctx_size" not in by_name["sub"]
+
+
+def test_bundled_plugins_still_accept_two_arguments(tmp_path: Path):
+    """Calling a context-aware plugin without an entry falls back to the filesystem."""
+    f = tmp_path / "sub" / "a.txt"
+    f.parent.mkdir()
+    f.write_text("abc")
+
+    extended = load_fields_file(str(PLUGINS / "extended.py"))
+    depth = load_fields_file(str(PLUGINS / "depth.py"))
+    assert extended["owner_id"](f, tmp_path) == f.stat().st_uid
+    assert extended["extension"](f, tmp_path) == "txt"
+    assert depth["depth"](f, tmp_path) == 2
+
+
+def test_extended_fields_share_one_stat(tmp_path: Path, monkeypatch):
+    f = tmp_path / "a.txt"
+    f.write_text("abc")
+    extended = load_fields_file(str(PLUGINS / "extended.py"))
+    ctx = Entry(f, tmp_path)
+    first = ctx.stat()
+
+    def _fail(self, *args, **kwargs):
+        raise AssertionError(f"unexpected Path.stat() on {self}")
+
+    # once cached, no further filesystem stat is needed for any stat-based field
+    with monkeypatch.context() as m:
+        m.setattr(Path, "stat", _fail)
+        values = {
+            field: extended[field](f, tmp_path, ctx)
+            for field in ("permissions", "owner_id", "created_at", "modified_at")
+        }
+
+    assert values["owner_id"] == first.st_uid
+    assert values["permissions"] == oct(first.st_mode)[-3:]
+    assert values["modified_at"].endswith("Z")
+
+
+def test_folder_content_uses_cached_children(tmp_path: Path):
+    d = tmp_path / "toto"
+    d.mkdir()
+    (d / "toto_tata.json").write_text("{}")
+    (d / "toto.xml").write_text("<x/>")
+    folder_content = load_fields_file(str(PLUGINS / "folder_content.py"))
+    ctx = Entry(d, tmp_path)
+
+    assert folder_content["has_postfix"](d, tmp_path, ctx) == ["tata"]
+    listed = ctx.children()
+    assert folder_content["has_ext"](d, tmp_path, ctx) == ["json", "xml"]
+    assert ctx.children() is listed
@@ -0,0 +1,50 @@
+"""Tests for the external merge sort used by --stream --sort."""
+
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.sorting import external_sort, sort_key
+
+
+def _entries():
+    values = [5, None, "beta", 2, "Alpha", 5, None, 3.5, "alpha", 1]
+    return [{"name": f"e{i}", "v": v} for i, v in enumerate(values)]
+
+
+def test_external_sort_matches_list_sort():
+    key = sort_key("v")
+    for reverse in (False, True):
+        expected = sorted(_entries(), key=key, reverse=reverse)
+        for buffer_size in (1, 2, 3, 100):
+            result = list(external_sort(iter(_entries()), key, reverse=reverse, buffer_size=buffer_size))
+            assert result == expected, (reverse, buffer_size)
+
+
+def test_sort_key_orders_none_numbers_then_strings():
+    ordered = [e["v"] for e in external_sort(_entries(), sort_key("v"), buffer_size=2)]
+    assert ordered == [None, None, 1, 2, 3.5, 5, 5, "Alpha", "alpha", "beta"]
+
+
+def test_external_sort_empty_input():
+    assert list(external_sort(iter([]), sort_key("v"), buffer_size=2)) == []
+
+
+def test_stream_sort_cli_matches_in_memory_sort(tmp_path: Path, capsys):
+    for i in range(12):
+        (tmp_path / f"f{i:02d}.txt").write_text("x" * ((i * 7) % 5))
+
+    rc = main([str(tmp_path), "--stream", "--format", "ndjson", "--sort", "size", "--desc", "--sort-buffer", "4"])
+    assert rc == 0
+    out, _ = capsys.readouterr()
+    streamed = [json.loads(line) for line in out.splitlines()]
+    expected = list_entries(tmp_path, sort_by="size", sort_desc=True)
+    assert [e["size"] for e in streamed] == [e["size"] for e in expected]
+    assert [e["name"] for e in streamed] == [e["name"] for e in expected]
+
+
+def test_sort_buffer_requires_positive_integer(capsys):
+    assert main(["--sort-buffer", "0"]) == 1
+    _, err = capsys.readouterr()
+    assert "--sort-buffer must be at least 1" in err
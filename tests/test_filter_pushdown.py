@@ -0,0 +1,73 @@
+"""Tests for evaluating filters before computing the remaining fields."""
+
+import json
+from pathlib import Path
+
+from flatdir.listing import list_entries
+
+
+def _make_tree(root: Path) -> None:
+    for name in ("clip.mp4", "notes.txt", "other.mp4", "readme.md"):
+        (root / name).write_text(name)
+
+
+def _counting_field(calls: list[str]):
+    def expensive(path, root):
+        calls.append(path.name)
+        return "hash"
+    return expensive
+
+
+def test_match_skips_expensive_fields_for_rejected_entries(tmp_path: Path):
+    _make_tree(tmp_path)
+    calls: list[str] = []
+    entries = list_entries(tmp_path, fields={"expensive": _counting_field(calls)}, match=r"\.mp4$")
+    assert [e["name"] for e in entries] == ["clip.mp4", "other.mp4"]
+    assert sorted(calls) == ["clip.mp4", "other.mp4"]
+
+
+def test_exclude_and_only_on_cheap_fields_run_first(tmp_path: Path):
+    _make_tree(tmp_path)
+    (tmp_path / "sub").mkdir()
+    calls: list[str] = []
+    entries = list_entries(
+        tmp_path,
+        fields={"expensive": _counting_field(calls)},
+        exclude=[("name", "readme.md")],
+        only=[("type", "file")],
+    )
+    assert [e["name"] for e in entries] == ["clip.mp4", "notes.txt", "other.mp4"]
+    assert sorted(calls) == ["clip.mp4", "notes.txt", "other.mp4"]
+    # field order in the output is unchanged
+    unfiltered = list_entries(tmp_path, fields={"expensive": _counting_field([])})
+    assert list(entries[0]) == list(unfiltered[0])
+
+
+def test_filters_on_added_fields_still_see_final_entry(tmp_path: Path):
+    _make_tree(tmp_path)
+    entries = list_entries(tmp_path, add_fields={"name": "same"}, only=[("name", "same")])
+    assert len(entries) == 4
+
+
+def test_filters_on_joined_fields_are_evaluated_late(tmp_path: Path):
+    scan = tmp_path / "scan"
+    scan.mkdir()
+    _make_tree(scan)
+    db = tmp_path / "db.json"
+    db.write_text(json.dumps([{"name": "notes.txt", "type": "joined"}]))
+
+    entries = list_entries(scan, joins=[(str(db), "name", "name")], exclude=[("type", "joined")])
+    assert sorted(e["name"] for e in entries) == ["clip.mp4", "other.mp4", "readme.md"]
+
+
+def test_filter_on_plugin_field_without_defaults(tmp_path: Path):
+    _make_tree(tmp_path)
+    calls: list[str] = []
+    entries = list_entries(
+        tmp_path,
+        use_defaults=False,
+        fields={"ext": lambda p, root: p.suffix, "expensive": _counting_field(calls)},
+        only=[("ext", ".txt")],
+    )
+    assert entries == [{"ext": ".txt", "expensive": "hash"}]
+    assert calls == ["notes.txt"]
@@ -0,0 +1,47 @@
+"""Tests for the --tree and --nested builders of flatdir.hierarchy."""
+
+from flatdir.hierarchy import build_nested, build_tree
+
+
+def test_build_tree_intermediate_and_root_entries():
+    entries = [
+        {"name": "file.txt", "path": "a/b", "size": 1},
+        {"name": "a", "path": ".", "type": "directory"},
+        {"name": "root", "path": ".", "type": "directory"},
+        {"name": "other.txt", "path": "a", "size": 2},
+    ]
+    assert build_tree(entries, "root") == {
+        "name": "root",
+        "type": "directory",
+        "children": [
+            {
+                "name": "a",
+                "children": [
+                    {"name": "b", "children": [{"name": "file.txt", "size": 1}]},
+                    {"name": "other.txt", "size": 2},
+                ],
+                "type": "directory",
+            }
+        ],
+    }
+
+
+def test_build_tree_skips_entries_without_path_or_name():
+    assert build_tree([{"name": "x"}, {"path": "."}], "root") == {"name": "root"}
+
+
+def test_build_tree_wide_directory():
+    entries = [{"name": f"f{i}", "path": "big", "size": i} for i in range(50_000)]
+    entries.append({"name": "f7", "path": "big", "type": "file"})
+    tree = build_tree(entries, "root")
+    (big,) = tree["children"]
+    assert len(big["children"]) == 50_000
+    assert big["children"][7] == {"name": "f7", "size": 7, "type": "file"}
+
+
+def test_build_nested_accepts_iterables():
+    entries = iter([
+        {"name": "b.txt", "path": "a", "size": 1},
+        {"name": "a", "path": ".", "type": "directory"},
+    ])
+    assert build_nested(entries) == {"a": {"b.txt": {"size": 1}, "type": "directory"}}
@@ -0,0 +1,144 @@
+"""Tests for --incremental (reuse entries of directories whose mtime did not change)."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.incremental import PreviousIndex
+from flatdir.listing import list_entries
+
+OLD = time.time() - 3600
+
+
+def _make_tree(root: Path) -> None:
+    (root / "a" / "deep").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "one.txt").write_text("1")
+    (root / "a" / "deep" / "two.txt").write_text("22")
+    (root / "b" / "three.txt").write_text("333")
+    (root / "top.txt").write_text("t")
+    _age(root)
+
+
+def _age(root: Path) -> None:
+    """Move every mtime an hour back, as after a previous nightly run."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.utime(Path(dirpath) / name, (OLD, OLD))
+
+
+def _by_name(entries):
+    return {e["name"]: e for e in entries}
+
+
+def test_unchanged_tree_gives_same_result(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path)
+    assert list_entries(tmp_path, previous=PreviousIndex(first, time.time())) == first
+
+
+def test_files_of_unchanged_directories_are_reused(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path)
+
+    # rewritten in place: the directory listing, hence its mtime, is unchanged
+    (tmp_path / "b" / "three.txt").write_text("33333")
+    os.utime(tmp_path / "b", (OLD, OLD))
+    scanned = []
+    fields = {"seen": lambda p, root: scanned.append(p.name)}
+    entries = list_entries(tmp_path, previous=PreviousIndex(first, time.time()), fields=fields)
+
+    assert _by_name(entries)["three.txt"]["size"] == 3
+    assert not {"one.txt", "two.txt", "three.txt"} & set(scanned)
+    # the root listing and the directories themselves are always computed again
+    assert {"top.txt", "a", "b", "deep"} <= set(scanned)
+
+
+def test_changed_directories_are_listed_again(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path)
+
+    (tmp_path / "a" / "deep" / "new.txt").write_text("new")
+    (tmp_path / "b" / "three.txt").unlink()
+    entries = _by_name(list_entries(tmp_path, previous=PreviousIndex(first, time.time())))
+
+    assert "new.txt" in entries and "three.txt" not in entries
+    assert "one.txt" in entries and "two.txt" in entries
+    assert entries["deep"]["mtime"] != _by_name(first)["deep"]["mtime"]
+
+
+def test_reuse_with_workers_and_processes(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path)
+    (tmp_path / "b" / "three.txt").write_text("33333")
+    os.utime(tmp_path / "b", (OLD, OLD))
+
+    expected = list_entries(tmp_path, previous=PreviousIndex(first, time.time()))
+    assert list_entries(tmp_path, previous=PreviousIndex(first, time.time()), workers=4) == expected
+    assert list_entries(tmp_path, previous=PreviousIndex(first, time.time()), processes=2) == expected
+
+
+def test_directories_modified_after_previous_run_are_not_trusted(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path)
+    (tmp_path / "b" / "three.txt").write_text("33333")
+
+    # b was modified during the second the previous run finished
+    os.utime(tmp_path / "b", (OLD, OLD))
+    entries = list_entries(tmp_path, previous=PreviousIndex(first, generated_at=OLD))
+    assert _by_name(entries)["three.txt"]["size"] == 5
+
+
+def test_cli_incremental_from_headers_output(tmp_path: Path, capsys):
+    root = tmp_path / "tree"
+    root.mkdir()
+    _make_tree(root)
+    previous = tmp_path / "index.json"
+    assert main([str(root), "--with-headers", "--output", str(previous)]) == 0
+
+    (root / "b" / "four.txt").write_text("4444")
+    assert main([str(root), "--incremental", str(previous)]) == 0
+    entries = _by_name(json.loads(capsys.readouterr().out))
+    assert entries["four.txt"]["size"] == 4
+    assert set(entries) == {"a", "b", "deep", "one.txt", "two.txt", "three.txt", "four.txt", "top.txt"}
+
+
+def test_cli_incremental_rejects_filtered_runs(tmp_path: Path, capsys):
+    previous = tmp_path / "index.json"
+    previous.write_text(json.dumps({"headers": {"generated_at": "2026-01-01T00:00:00+00:00"}, "entries": []}))
+    assert main([str(tmp_path), "--incremental", str(previous), "--only", "type=file"]) == 1
+    assert "--incremental cannot be combined with --only" in capsys.readouterr().err
+    assert main([str(tmp_path), "--incremental", str(previous), "--exclude", "name=x", "--prune"]) == 0
+    capsys.readouterr()
+    assert main([str(tmp_path), "--incremental", str(previous), "--exclude", "path=x", "--prune"]) == 1
+    assert "--exclude (other than name= with --prune)" in capsys.readouterr().err
+
+
+def test_cli_incremental_requires_headers(tmp_path: Path, capsys):
+    """Without generated_at, an edit within the mtime granularity would go unnoticed."""
+    root = tmp_path / "tree"
+    root.mkdir()
+    _make_tree(root)
+    previous = tmp_path / "index.json"
+    assert main([str(root), "--output", str(previous)]) == 0
+    assert main([str(root), "--incremental", str(previous)]) == 1
+    assert "--with-headers" in capsys.readouterr().err
+
+
+def test_absolute_paths_are_reused(tmp_path: Path):
+    _make_tree(tmp_path)
+    first = list_entries(tmp_path, absolute=True)
+    scanned = []
+    fields = {"seen": lambda p, root: scanned.append(p.name)}
+    entries = list_entries(tmp_path, absolute=True, previous=PreviousIndex(first, time.time()), fields=fields)
+    assert entries == list_entries(tmp_path, absolute=True)
+    assert not {"one.txt", "two.txt", "three.txt"} & set(scanned)
+
+
+def test_cli_incremental_rejects_hierarchical_output(tmp_path: Path, capsys):
+    previous = tmp_path / "tree.json"
+    previous.write_text(json.dumps({"name": "tree", "children": []}))
+    assert main([str(tmp_path), "--incremental", str(previous)]) == 1
+    assert "flat flatdir list" in capsys.readouterr().err
@@ -0,0 +1,86 @@
+"""Tests for the indexed --join engine (multi-key and one-to-many joins)."""
+
+import json
+from pathlib import Path
+
+from flatdir import joins as joins_module
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+
+
+def _scan_dir(tmp_path: Path) -> Path:
+    scan_dir = tmp_path / "data"
+    for name in ("MSO", "ALG", "NONE"):
+        (scan_dir / name).mkdir(parents=True)
+    return scan_dir
+
+
+def _by_name(entries):
+    return {e["name"]: e for e in entries}
+
+
+def test_join_keeps_first_matching_row(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "db.json"
+    db.write_text(json.dumps([
+        {"cours": "MSO", "credits": 5},
+        {"cours": "MSO", "credits": 9},
+        {"cours": 7, "credits": 1},
+        {"credits": 0},
+    ]))
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name")]))
+    assert entries["MSO"]["credits"] == 5
+    assert "cours" not in entries["MSO"]
+    assert "credits" not in entries["ALG"]
+
+
+def test_join_database_is_loaded_once(tmp_path: Path, monkeypatch):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "db.json"
+    db.write_text(json.dumps([{"cours": "ALG", "credits": 3}]))
+    loads = []
+    original = joins_module._load_rows
+
+    def counting(path, columns):
+        loads.append(path)
+        return original(path, columns)
+
+    monkeypatch.setattr(joins_module, "_load_rows", counting)
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name")]))
+    assert entries["ALG"]["credits"] == 3
+    assert len(loads) == 1
+
+
+def test_multi_key_join(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "db.json"
+    db.write_text(json.dumps([
+        {"cours": "MSO", "year": 2024, "room": "A"},
+        {"cours": "MSO", "year": 2025, "room": "B"},
+    ]))
+    entries = list_entries(
+        scan_dir,
+        add_fields={"year": 2025},
+        joins=[(str(db), "cours,year", "name,year")],
+    )
+    assert _by_name(entries)["MSO"]["room"] == "B"
+
+
+def test_one_to_many_join(tmp_path: Path, capsys):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "results.json"
+    db.write_text(json.dumps([
+        {"cours": "MSO", "student": "ada", "grade": 18},
+        {"cours": "ALG", "student": "bob", "grade": 12},
+        {"cours": "MSO", "student": "cy", "grade": 15},
+    ]))
+    assert main([str(scan_dir), "--join", f"{db}:cours:name:results"]) == 0
+    entries = _by_name(json.loads(capsys.readouterr().out))
+    assert entries["MSO"]["results"] == [{"student": "ada", "grade": 18}, {"student": "cy", "grade": 15}]
+    assert entries["ALG"]["results"] == [{"student": "bob", "grade": 12}]
+    assert "results" not in entries["NONE"]
+
+
+def test_cli_join_rejects_mismatched_keys(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--join", "db.json:a,b:name"]) == 1
+    assert "same number of keys" in capsys.readouterr().err
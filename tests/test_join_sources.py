@@ -0,0 +1,99 @@
+"""Tests for --join databases in CSV, NDJSON and SQLite formats."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+
+
+def _scan_dir(tmp_path: Path) -> Path:
+    scan_dir = tmp_path / "scan"
+    for name in ("ALG", "MSO"):
+        (scan_dir / name).mkdir(parents=True)
+    return scan_dir
+
+
+def _by_name(entries):
+    return {e["name"]: e for e in entries}
+
+
+def test_join_csv(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "courses.csv"
+    db.write_text("cours,credits,room\nALG,3,\nMSO,5,B12\n")
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name")]))
+    assert entries["ALG"]["credits"] == "3"
+    assert "room" not in entries["ALG"]
+    assert entries["MSO"]["room"] == "B12"
+
+
+def test_join_tsv_with_columns(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "courses.tsv"
+    db.write_text("cours\tcredits\troom\nMSO\t5\tB12\n")
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name", "", "room")]))
+    assert entries["MSO"]["room"] == "B12"
+    assert "credits" not in entries["MSO"]
+
+
+def test_join_ndjson_one_to_many(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "results.ndjson"
+    rows = [{"cours": "MSO", "score": 12, "who": "a"}, {"cours": "MSO", "score": 15, "who": "b"}]
+    db.write_text("\n".join(json.dumps(r) for r in rows) + "\n\nnot json\n")
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name", "results", "score")]))
+    assert entries["MSO"]["results"] == [{"score": 12}, {"score": 15}]
+    assert "results" not in entries["ALG"]
+
+
+def test_join_sqlite_tables(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "school.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE courses (cours TEXT, credits INTEGER, room TEXT)")
+    conn.execute("CREATE TABLE teachers (cours TEXT, teacher TEXT)")
+    conn.execute("INSERT INTO courses VALUES ('ALG', 3, NULL), ('MSO', 5, 'B12')")
+    conn.execute("INSERT INTO teachers VALUES ('ALG', 'Ada')")
+    conn.commit()
+    conn.close()
+
+    entries = _by_name(list_entries(scan_dir, joins=[(f"{db}#courses", "cours", "name", "", "credits")]))
+    assert entries["ALG"]["credits"] == 3 and "room" not in entries["ALG"]
+    assert "room" not in entries["MSO"]
+
+    entries = _by_name(list_entries(scan_dir, joins=[(f"{db}#teachers", "cours", "name")]))
+    assert entries["ALG"]["teacher"] == "Ada"
+
+    # several tables and none named like the file: nothing to join on
+    assert "credits" not in _by_name(list_entries(scan_dir, joins=[(str(db), "cours", "name")]))["ALG"]
+
+
+def test_join_sqlite_single_table_default(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "roster.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE anything (code TEXT, label TEXT)")
+    conn.execute("INSERT INTO anything VALUES ('MSO', 'Mesures')")
+    conn.commit()
+    conn.close()
+    entries = _by_name(list_entries(scan_dir, joins=[(str(db), "code", "name")]))
+    assert entries["MSO"]["label"] == "Mesures"
+
+
+def test_join_missing_sources_match_nothing(tmp_path: Path):
+    scan_dir = _scan_dir(tmp_path)
+    for name in ("missing.csv", "missing.db", "missing.ndjson"):
+        entries = list_entries(scan_dir, joins=[(str(tmp_path / name), "cours", "name")])
+        assert {e["name"] for e in entries} >= {"ALG", "MSO"}
+
+
+def test_cli_join_columns(tmp_path: Path, capsys):
+    scan_dir = _scan_dir(tmp_path)
+    db = tmp_path / "courses.csv"
+    db.write_text("cours,credits,room\nMSO,5,B12\n")
+    assert main([str(scan_dir), "--join", f"{db}:cours:name::room"]) == 0
+    entries = _by_name(json.loads(capsys.readouterr().out))
+    assert entries["MSO"]["room"] == "B12" and "credits" not in entries["MSO"]
+    assert main([str(scan_dir), "--join", f"{db}:a:b:c:d:e"]) == 1
@@ -0,0 +1,56 @@
+"""Tests for the parse cache shared by the pattern_* plugins."""
+
+from pathlib import Path
+
+from flatdir.listing import list_entries
+from flatdir.plugins import parse_cache
+from flatdir.plugins.pattern_FULLYR_KEYWORDS import pattern_keywords
+from flatdir.plugins.pattern_PRE_YR1_YR2 import pattern_prefix, pattern_year1
+from flatdir.plugins.pattern_parent_PRE_YR1_YR2 import parent_pattern_prefix
+
+
+def test_results_are_keyed_by_name(tmp_path: Path):
+    parse_cache.reset()
+    calls = []
+
+    def parser(name):
+        calls.append(name)
+        return name.upper()
+
+    assert parse_cache.cached_parse(parser, "abc") == "ABC"
+    assert parse_cache.cached_parse(parser, "abc") == "ABC"
+    assert calls == ["abc"]
+
+    parse_cache.reset()
+    pattern_prefix(tmp_path / "x" / "ABC-19-20", tmp_path)
+    pattern_year1(tmp_path / "y" / "ABC-19-20", tmp_path)
+    parent_pattern_prefix(tmp_path / "ABC-19-20" / "file.txt", tmp_path)
+    # one parse per (parser, name): the two plugins have their own parser
+    assert parse_cache.size() == 2
+
+
+def test_cache_is_bounded(tmp_path: Path):
+    parse_cache.reset(limit=3)
+    try:
+        for i in range(10):
+            pattern_prefix(tmp_path / f"A{i}-19-20", tmp_path)
+        assert parse_cache.size() == 3
+    finally:
+        parse_cache.reset(limit=parse_cache.DEFAULT_MAX_ENTRIES)
+
+
+def test_shared_lists_are_not_exposed(tmp_path: Path):
+    parse_cache.reset()
+    first = pattern_keywords(tmp_path / "2022-a-b", tmp_path)
+    first.append("c")
+    assert pattern_keywords(tmp_path / "other" / "2022-a-b", tmp_path) == ["a", "b"]
+
+
+def test_listing_keeps_the_parses_of_other_runs(tmp_path: Path):
+    """Another listing (e.g. in another thread) may still use them."""
+    (tmp_path / "ABC-19-20").mkdir()
+    parse_cache.reset()
+    pattern_prefix(tmp_path / "unrelated-00-00", tmp_path)
+    entries = list_entries(tmp_path, fields={"pattern_prefix": pattern_prefix})
+    assert entries[0]["pattern_prefix"] == "ABC"
+    assert parse_cache.size() == 2
@@ -0,0 +1,135 @@
+"""Tests for declarative pattern files (flatdir.patterns)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.patterns import PatternSet, load_pattern_file
+from flatdir.plugins_loader import field_source, load_fields_file
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "examples" / "patterns.toml"
+
+
+def test_all_patterns_are_matched_in_one_pass():
+    patterns = PatternSet([
+        {"regex": r"(?P<prefix>[A-Z]+)-(?P<year>\d{2})", "fields": {"prefix": "prefix"}},
+        {"regex": r".*-(?P<year>\d{2})$", "fields": {"year": {"group": "year", "type": "int"}}},
+        {"regex": r"(?P<other>[a-z]+)", "fields": {"other": "other"}},
+    ])
+    assert patterns.parse("ABC-19") == {"prefix": "ABC", "year": 19}
+    assert patterns.parse("abc-20") == {"year": 20, "other": "abc"}
+    assert patterns.parse("???") == {}
+
+
+def test_first_matching_pattern_wins_and_group_names_can_repeat():
+    patterns = PatternSet([
+        {"regex": r"(?P<a>\d+)-(?P<b>\d+)$", "fields": {"value": {"format": "{a}/{b}"}}},
+        {"regex": r"(?P<a>\w+)", "fields": {"value": "a"}},
+    ])
+    assert patterns.parse("12-34") == {"value": "12/34"}
+    assert patterns.parse("word") == {"value": "word"}
+
+
+def test_split_ignore_case_and_backreferences():
+    patterns = PatternSet([
+        {"regex": r"kw_(?P<kw>.+)", "ignore_case": True, "fields": {"kw": {"group": "kw", "split": "-"}}},
+        {"regex": r"(?P<x>[a-z])(?P=x)", "fields": {"double": "x"}},
+    ])
+    assert patterns.parse("KW_a-b--c") == {"kw": ["a", "b", "c"]}
+    assert patterns.parse("ccd") == {"double": "c"}
+
+
+def test_named_references_follow_renamed_groups():
+    patterns = PatternSet([
+        {"regex": r"(?P<x>\d)(?P<y>[a-z])", "fields": {"first": "x"}},
+        {"regex": r"(?P<q>')?(?P<x>[a-z]+)(?(q)')(?P=x)$", "fields": {"twice": "x"}},
+    ])
+    assert patterns.parse("abab") == {"twice": "ab"}
+    assert patterns.parse("'ab'ab") == {"twice": "ab"}
+    assert patterns.parse("'abab") == {}
+    assert patterns.parse("1a") == {"first": "1"}
+
+
+@pytest.mark.parametrize("regex", [r"(?P<x>[a-z])\1", r"(?P<q>')?(?P<x>.)(?(1)')"])
+def test_numbered_references_are_rejected(regex):
+    with pytest.raises(ValueError, match="numbered group references"):
+        PatternSet([{"regex": r"(?P<a>.)", "fields": {"a": "a"}}, {"regex": regex, "fields": {"x": "x"}}])
+    # an escaped backslash followed by a digit is no reference
+    assert PatternSet([{"regex": r"(?P<x>a)\\1", "fields": {"x": "x"}}]).parse("a\\1") == {"x": "a"}
+
+
+@pytest.mark.parametrize(
+    "definition, message",
+    [
+        ({"fields": {"a": "a"}}, "has no regex"),
+        ({"regex": "(", "fields": {"a": "a"}}, "invalid regex"),
+        ({"regex": "(?P<a>.)"}, "has no fields"),
+        ({"regex": "(?P<a>.)", "fields": {"x": "b"}}, "unknown group"),
+        ({"regex": "(?P<a>.)", "target": "grandparent", "fields": {"x": "a"}}, "target must be"),
+        ({"regex": "(?P<a>.)", "fields": {"x": {"group": "a", "type": "float"}}}, "type must be"),
+    ],
+)
+def test_invalid_definitions(definition, message):
+    with pytest.raises(ValueError, match=message):
+        PatternSet([definition])
+
+
+def test_example_file_matches_bundled_plugins(tmp_path: Path):
+    from flatdir.plugins import (
+        pattern_PRE_YR1_YR2,
+        pattern_PRE_YR1_YR2_ID_NAME,
+        pattern_YR_MON_DAY_KW,
+        pattern_sequence_id,
+    )
+
+    fields = load_fields_file(str(EXAMPLE))
+    assert "pattern_ids" not in fields
+    for name, module, plugin_fields in [
+        ("PE-25-26-70-Competition", pattern_PRE_YR1_YR2_ID_NAME, ("pattern_prefix", "pattern_id", "pattern_name")),
+        ("ABC-19-20", pattern_PRE_YR1_YR2, ("pattern_prefix", "pattern_year2")),
+        ("ABC-19-20-notes", pattern_PRE_YR1_YR2, ("pattern_prefix", "pattern_year2")),
+        ("25-09-06-AAA-BBB", pattern_YR_MON_DAY_KW, ("pattern_kw", "parsed_date")),
+        ("007_bond", pattern_sequence_id, ("sequence_id", "sequence_name")),
+        ("00000000001_max", pattern_sequence_id, ("sequence_id", "sequence_name")),
+        ("000000000001_over", pattern_sequence_id, ("sequence_id", "sequence_name")),
+        ("00000000000_zero", pattern_sequence_id, ("sequence_id",)),
+        ("000000000000_zero", pattern_sequence_id, ("sequence_id",)),
+    ]:
+        path = tmp_path / name
+        for field_name in plugin_fields:
+            assert fields[field_name](path, tmp_path) == getattr(module, field_name)(path, tmp_path)
+    assert fields["parent_pattern_year2"](tmp_path / "ABC-19-20" / "x", tmp_path) == "20"
+
+
+def test_json_pattern_file_in_listing_with_processes(tmp_path: Path):
+    spec = tmp_path / "patterns.json"
+    spec.write_text(json.dumps({"patterns": [
+        {"regex": r"(?P<n>\d+)_", "fields": {"seq": {"group": "n", "type": "int"}}},
+    ]}))
+    root = tmp_path / "tree"
+    root.mkdir()
+    for name in ("01_intro", "02_setup", "notes"):
+        (root / name).mkdir()
+    fields = load_pattern_file(str(spec))
+    assert field_source(fields["seq"]) == (str(spec.resolve()), "seq")
+
+    expected = {"01_intro": 1, "02_setup": 2, "notes": None}
+    for kwargs in ({}, {"processes": 2}):
+        entries = list_entries(root, fields=fields, **kwargs)
+        assert {e["name"]: e.get("seq") for e in entries} == expected
+
+
+def test_cli_pattern_file(tmp_path: Path, capsys):
+    root = tmp_path / "tree"
+    (root / "ABC-19-20").mkdir(parents=True)
+    assert main([str(root), "--fields", str(EXAMPLE), "--only", "pattern_prefix=ABC"]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    assert [(e["pattern_year1"], e["pattern_year2"]) for e in entries] == [("19", "20")]
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps([{"regex": "("}]))
+    assert main([str(root), "--fields", str(bad)]) == 1
+    assert "error:" in capsys.readouterr().err
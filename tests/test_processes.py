@@ -0,0 +1,121 @@
+"""Tests for --processes (field evaluation in worker processes)."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.plugins_loader import field_source, load_fields_file
+
+PLUGINS = Path(__file__).resolve().parents[1] / "src" / "flatdir" / "plugins"
+
+
+def _make_tree(root: Path) -> None:
+    for i in range(3):
+        sub = root / f"dir{i}"
+        sub.mkdir()
+        for j in range(40):
+            (sub / f"{j:02d}_note.txt").write_text(f"line {i}\nword {j}\n")
+
+
+def test_field_source_only_for_loaded_fields():
+    fields = load_fields_file(str(PLUGINS / "extended.py"))
+    filepath, func_name = field_source(fields["sha256"])
+    assert Path(filepath) == PLUGINS / "extended.py"
+    assert func_name == "sha256"
+    assert field_source(lambda p, root: None) is None
+    assert field_source(len) is None
+
+
+def test_processes_output_matches_sequential(tmp_path: Path):
+    _make_tree(tmp_path)
+    fields: dict = {}
+    for plugin in ("extended.py", "text.py", "pattern_sequence_id.py"):
+        fields.update(load_fields_file(str(PLUGINS / plugin)))
+    fields.pop("file_uuid")  # random per call
+
+    sequential = list_entries(tmp_path, fields=fields)
+    parallel = list_entries(tmp_path, fields=fields, processes=2)
+    assert parallel == sequential
+    assert all("sha256" in e for e in parallel if e["type"] == "file")
+
+
+def test_processes_keep_inline_fields_in_parent(tmp_path: Path):
+    _make_tree(tmp_path)
+    fields = {"upper": lambda p, root: p.name.upper()}
+    entries = list_entries(tmp_path, fields=fields, processes=2, depth=0)
+    assert [e["upper"] for e in entries] == ["DIR0", "DIR1", "DIR2"]
+
+
+def test_processes_and_workers_are_exclusive(tmp_path: Path, capsys):
+    with pytest.raises(ValueError):
+        list_entries(tmp_path, workers=2, processes=2)
+    assert main([str(tmp_path), "--workers", "2", "--processes", "2"]) == 1
+    _, err = capsys.readouterr()
+    assert "either --workers or --processes" in err
+
+
+def test_processes_cli_forwards_plugin_options(tmp_path: Path, capsys):
+    (tmp_path / "parent").mkdir()
+    for name in ("keep", "drop"):
+        (tmp_path / "parent" / name).mkdir()
+
+    rc = main([
+        str(tmp_path),
+        "--fields", str(PLUGINS / "subfolders.py"),
+        "--subfolders-whitelist", "keep",
+        "--processes", "2",
+        "--depth", "0",
+    ])
+    assert rc == 0
+    out, _ = capsys.readouterr()
+    assert json.loads(out)[0]["subfolders"] == ["keep"]
+
+
+def test_processes_ship_only_entries_passing_early_filters(tmp_path: Path):
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    _make_tree(tree)
+    log = tmp_path / "computed.log"
+    plugin = tmp_path / "logged.py"
+    plugin.write_text(
+        "from pathlib import Path\n"
+        "def logged(path, root):\n"
+        f"    with open({str(log)!r}, 'a') as f:\n"
+        "        f.write(path.name + '\\n')\n"
+        "    return 1\n"
+    )
+    fields = {**load_fields_file(str(plugin)), **load_fields_file(str(PLUGINS / "extended.py"))}
+
+    entries = list_entries(
+        tree, fields=fields, processes=2, match=r"0[01]_", exclude=[("extension", "md")]
+    )
+    assert len(entries) == 6
+    assert all(e["logged"] == 1 for e in entries)
+    # the expensive field only ran for the entries that passed the filters
+    assert sorted(log.read_text().split()) == sorted(e["name"] for e in entries)
+
+
+def test_processes_leave_default_and_stat_fields_in_parent(tmp_path: Path, monkeypatch, capsys):
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    _make_tree(tree)
+    log = tmp_path / "stat.log"
+    real_stat = os.stat
+
+    def logged_stat(path, *args, **kwargs):
+        # appended from the parent and from the (forked) worker processes alike
+        if str(path).startswith(str(tree) + os.sep):
+            with open(log, "a") as f:
+                f.write(f"{path}\n")
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", logged_stat)
+    assert main([str(tree), "--fields", str(PLUGINS / "extended.py"), "--processes", "2"]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    assert all("sha256" in e and "modified_at" in e and "size" in e for e in entries if e["type"] == "file")
+    # the walk stats each entry once through its directory listing, nothing stats it again
+    assert not log.exists()
@@ -0,0 +1,78 @@
+"""Tests for --prune (stop descending into filtered-out directories)."""
+
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+
+
+def _make_tree(root: Path) -> None:
+    (root / "keep").mkdir()
+    (root / "keep" / "a.txt").write_text("a")
+    (root / "keep" / "deep").mkdir()
+    (root / "keep" / "deep" / "b.txt").write_text("b")
+    (root / "raw_footage").mkdir()
+    (root / "raw_footage" / "huge.mov").write_text("x")
+    (root / "raw_footage" / "nested").mkdir()
+    (root / "raw_footage" / "nested" / "more.mov").write_text("x")
+    (root / "top.txt").write_text("t")
+
+
+def _names(entries):
+    return sorted(e["name"] for e in entries)
+
+
+def test_exclude_without_prune_still_lists_subtree(tmp_path: Path):
+    _make_tree(tmp_path)
+    entries = list_entries(tmp_path, exclude=[("name", "raw_footage")])
+    assert "huge.mov" in _names(entries)
+
+
+def test_prune_skips_excluded_directory_subtree(tmp_path: Path):
+    _make_tree(tmp_path)
+    scanned = []
+    fields = {"seen": lambda p, root: scanned.append(p.name)}
+    entries = list_entries(tmp_path, exclude=[("name", "raw_footage")], prune=True, fields=fields)
+    assert _names(entries) == ["a.txt", "b.txt", "deep", "keep", "top.txt"]
+    assert "huge.mov" not in scanned and "more.mov" not in scanned
+
+
+def test_prune_exclude_type_directory_still_lists_files_below(tmp_path: Path):
+    """A rule on the directory's type says nothing about the files below it."""
+    _make_tree(tmp_path)
+    entries = list_entries(tmp_path, exclude=[("type", "directory")], prune=True)
+    assert _names(entries) == ["a.txt", "b.txt", "huge.mov", "more.mov", "top.txt"]
+    assert entries == list_entries(tmp_path, exclude=[("type", "directory")])
+
+
+def test_prune_exclude_path_keeps_deeper_entries(tmp_path: Path):
+    """A path rule drops the entries directly inside a directory, not further down."""
+    _make_tree(tmp_path)
+    entries = list_entries(tmp_path, exclude=[("path", "keep")], prune=True)
+    assert "b.txt" in _names(entries)
+    assert entries == list_entries(tmp_path, exclude=[("path", "keep")])
+
+
+def test_prune_only_path_enters_directories_on_the_way(tmp_path: Path):
+    _make_tree(tmp_path)
+    scanned = []
+    fields = {"seen": lambda p, root: scanned.append(p.name)}
+    entries = list_entries(tmp_path, only=[("path", "keep/deep")], prune=True, fields=fields)
+    assert _names(entries) == ["b.txt"]
+    assert "huge.mov" not in scanned
+    assert entries == list_entries(tmp_path, only=[("path", "keep/deep")], fields=fields)
+
+
+def test_prune_ignores_rules_on_late_keys(tmp_path: Path):
+    """Rules that --add may satisfy cannot be decided before the walk."""
+    _make_tree(tmp_path)
+    entries = list_entries(tmp_path, add_fields={"name": "x"}, exclude=[("name", "raw_footage")], prune=True)
+    assert len(entries) == len(list_entries(tmp_path))
+
+
+def test_prune_cli(tmp_path: Path, capsys):
+    _make_tree(tmp_path)
+    assert main([str(tmp_path), "--exclude", "name=raw_footage", "--prune", "--workers", "2"]) == 0
+    out, _ = capsys.readouterr()
+    assert "more.mov" not in {e["name"] for e in json.loads(out)}
@@ -0,0 +1,88 @@
+"""Tests for the scandir-based traversal engine and the per-entry context."""
+
+from pathlib import Path
+
+from flatdir import listing
+from flatdir.entry import Entry
+
+
+def _make_tree(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("hello")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "b.txt").write_text("world!")
+    (sub / "deeper").mkdir()
+    (sub / "deeper" / "c.txt").write_text("c")
+
+
+def test_default_fields_do_not_use_path_stat(tmp_path: Path, monkeypatch):
+    """Default fields must be served from the DirEntry listing and its single stat."""
+    _make_tree(tmp_path)
+    root = tmp_path.resolve()
+
+    real_stat = Path.stat
+
+    def _fail(self, *args, **kwargs):
+        # resolving the listing root itself is allowed, per-entry stats are not
+        if self == root:
+            return real_stat(self, *args, **kwargs)
+        raise AssertionError(f"unexpected Path.stat() on {self}")
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "stat", _fail)
+        entries = listing.list_entries(root)
+
+    by_name = {e["name"]: e for e in entries}
+    assert set(by_name) == {"a.txt", "sub", "b.txt", "deeper", "c.txt"}
+    assert by_name["a.txt"]["size"] == 5
+    assert by_name["b.txt"]["size"] == 6
+    assert by_name["sub"]["type"] == "directory"
+    assert "size" not in by_name["sub"]
+    assert "mtime" in by_name["deeper"]
+
+
+def test_entry_caches_stat(tmp_path: Path):
+    f = tmp_path / "a.txt"
+    f.write_text("abc")
+    ctx = Entry(f, tmp_path)
+
+    first = ctx.stat()
+    assert first is not None and first.st_size == 3
+    f.write_text("abcdef")
+    assert ctx.stat() is first
+    assert not ctx.is_dir()
+
+
+def test_entry_stat_missing_path_returns_none(tmp_path: Path):
+    ctx = Entry(tmp_path / "missing.txt", tmp_path)
+    assert ctx.stat() is None
+    assert ctx.is_dir() is False
+
+
+def test_walk_order_matches_os_walk(tmp_path: Path):
+    """Entries come out in the same order os.walk would visit them."""
+    _make_tree(tmp_path)
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "d.txt").write_text("d")
+    root = tmp_path.resolve()
+
+    walked = [ctx.path for ctx, _ in listing._walk(root, None, False)]
+
+    import os
+    expected = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        expected.extend(Path(dirpath) / d for d in dirnames)
+        expected.extend(Path(dirpath) / f for f in filenames)
+    assert walked == expected
+
+
+def test_symlinked_directory_is_listed_but_not_followed(tmp_path: Path):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "inside.txt").write_text("x")
+    scan = tmp_path / "scan"
+    scan.mkdir()
+    (scan / "link").symlink_to(target, target_is_directory=True)
+
+    entries = listing.list_entries(scan)
+    assert [(e["name"], e["type"]) for e in entries] == [("link", "directory")]
@@ -0,0 +1,82 @@
+"""Tests for the bounded JSON sidecar cache of --dict-field and --include-json."""
+
+import json
+import os
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.sidecars import JsonCache
+
+
+def test_hits_misses_and_invalidation(tmp_path: Path):
+    doc = tmp_path / "a.json"
+    doc.write_text(json.dumps({"v": 1}))
+    cache = JsonCache()
+    assert cache.read(doc) == {"v": 1}
+    assert cache.read(doc) == {"v": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    doc.write_text(json.dumps({"v": 22}))
+    os.utime(doc, ns=(0, 10**18))
+    assert cache.read(doc) == {"v": 22}
+    assert cache.misses == 2
+
+    assert cache.read(tmp_path / "missing.json") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path: Path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"pad": "x" * 80}))
+        paths.append(path)
+    size = paths[0].stat().st_size
+    cache = JsonCache(max_bytes=2 * size)
+    a, b, c = paths
+    cache.read(a)
+    cache.read(b)
+    cache.read(a)  # b is now the least recently used
+    cache.read(c)
+    cache.read(a)
+    cache.read(b)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_documents_over_budget_are_not_kept(tmp_path: Path):
+    doc = tmp_path / "big.json"
+    doc.write_text(json.dumps(list(range(100))))
+    cache = JsonCache(max_bytes=10)
+    assert cache.read(doc) == list(range(100))
+    assert cache.read(doc) == list(range(100))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_list_entries_reads_each_sidecar_once(tmp_path: Path):
+    course = tmp_path / "ALG"
+    course.mkdir()
+    (course / "ALG.json").write_text(json.dumps({"author": "Ada", "version": 2}))
+    cache = JsonCache()
+    entries = list_entries(
+        tmp_path,
+        dict_fields=[("author", None), ("version", None)],
+        include_jsons=[("include", None)],
+        json_cache=cache,
+    )
+    alg = next(e for e in entries if e["name"] == "ALG")
+    assert alg["author"] == "Ada" and alg["include"]["version"] == 2
+    # both keys are extracted from the document cached by --include-json
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cli_reports_json_cache_counters(tmp_path: Path, capsys):
+    course = tmp_path / "ALG"
+    course.mkdir()
+    (course / "ALG.json").write_text(json.dumps({"author": "Ada"}))
+    assert main([str(tmp_path), "--dict-field", "author", "--include-json", "--with-headers"]) == 0
+    headers = json.loads(capsys.readouterr().out)["headers"]
+    assert (headers["json_cache_hits"], headers["json_cache_misses"]) == (1, 1)
+
+    assert main([str(tmp_path), "--include-json", "--json-cache-size", "-1"]) == 1
+    assert "--json-cache-size" in capsys.readouterr().err
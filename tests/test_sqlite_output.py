@@ -0,0 +1,130 @@
+"""Tests for --format sqlite: entries upserted into an indexed SQLite table."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.columnar import write_columnar
+
+
+def _rows(db: Path, table: str = "entries") -> dict[tuple[str, str], dict[str, object]]:
+    conn = sqlite3.connect(db)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {(row["path"], row["name"]): dict(row) for row in conn.execute(f"SELECT * FROM {table}")}
+    finally:
+        conn.close()
+
+
+def test_table_columns_and_indexes(tmp_path: Path):
+    db = tmp_path / "index.db"
+    entries = [
+        {"name": "a.txt", "path": ".", "type": "file", "size": 3, "meta": {"k": [1, 2]}},
+        {"name": "sub", "path": ".", "type": "directory"},
+        {"name": "b.txt", "path": "sub", "type": "file", "size": 1, "late": True},
+    ]
+    assert write_columnar(entries, str(db), "sqlite", {"name": "string", "path": "string"}, batch_size=2) == 3
+
+    conn = sqlite3.connect(db)
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(entries)")}
+    assert {"entries_path_name", "entries_name", "entries_type"} <= indexes
+    # nested values are JSON text, usable with SQLite's JSON functions
+    assert conn.execute("SELECT json_extract(meta, '$.k[1]') FROM entries WHERE name = 'a.txt'").fetchone() == (2,)
+    # a key met after the first batch gets its own column
+    assert conn.execute("SELECT late FROM entries WHERE name = 'b.txt'").fetchone() == (1,)
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM entries WHERE path = 'sub'").fetchall()
+    assert "entries_path_name" in str(plan)
+    conn.close()
+
+
+def test_upsert_updates_changed_rows_only_and_deletes_missing(tmp_path: Path):
+    db = tmp_path / "index.db"
+    first = [{"name": f"f{i}", "path": ".", "size": i} for i in range(4)]
+    write_columnar(first, str(db), "sqlite")
+
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        "CREATE TABLE updates (n INTEGER); INSERT INTO updates VALUES (0);"
+        "CREATE TRIGGER count_updates AFTER UPDATE ON entries BEGIN UPDATE updates SET n = n + 1; END;"
+    )
+    rowid = conn.execute("SELECT rowid FROM entries WHERE name = 'f0'").fetchone()
+    conn.close()
+
+    second = [
+        {"name": "f0", "path": ".", "size": 0},
+        {"name": "f1", "path": ".", "size": 10},
+        {"name": "new", "path": "."},
+    ]
+    write_columnar(second, str(db), "sqlite")
+
+    rows = _rows(db)
+    assert set(rows) == {(".", "f0"), (".", "f1"), (".", "new")}
+    assert rows[(".", "f1")]["size"] == 10
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT n FROM updates").fetchone() == (1,)  # only f1 was rewritten
+    assert conn.execute("SELECT rowid FROM entries WHERE name = 'f0'").fetchone() == rowid
+    conn.close()
+
+
+def test_failed_run_keeps_previous_table(tmp_path: Path):
+    db = tmp_path / "index.db"
+    write_columnar([{"name": "kept", "path": "."}], str(db), "sqlite")
+
+    def broken():
+        yield {"name": "other", "path": "."}
+        raise OSError("walk failed")
+
+    with pytest.raises(OSError):
+        write_columnar(broken(), str(db), "sqlite", batch_size=1)
+    assert set(_rows(db)) == {(".", "kept")}
+
+
+def test_entries_without_key_are_rejected(tmp_path: Path):
+    db = tmp_path / "index.db"
+    write_columnar([{"name": "kept", "path": "."}], str(db), "sqlite")
+    # a NULL key would skip the upsert and wipe every row in the cleanup
+    with pytest.raises(ValueError, match="path and a name"):
+        write_columnar([{"name": "kept", "path": "."}, {"UID": "event"}], str(db), "sqlite")
+    assert set(_rows(db)) == {(".", "kept")}
+
+
+def test_cli_sqlite_incremental_runs(tmp_path: Path):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "a.txt").write_text("abc")
+    (root / "b.txt").write_text("b")
+    (root / "sub" / "sub.json").write_text(json.dumps({"athlete": {"name": "x"}}))
+    db = tmp_path / "index.db"
+
+    assert main([str(root), "--format", "sqlite", "--output", f"{db}#files", "--include-json"]) == 0
+    rows = _rows(db, "files")
+    assert rows[("sub", "a.txt")]["size"] == 3
+    assert rows[(".", "sub")]["type"] == "directory"
+    assert json.loads(rows[(".", "sub")]["include"]) == {"athlete": {"name": "x"}}
+
+    (root / "b.txt").unlink()
+    (root / "sub" / "a.txt").write_text("abcdef")
+    assert main([str(root), "--format", "sqlite", "--stream", "--output", f"{db}#files"]) == 0
+    rows = _rows(db, "files")
+    assert (".", "b.txt") not in rows
+    assert rows[("sub", "a.txt")]["size"] == 6
+
+    assert main([str(root), "--format", "sqlite", "--no-defaults", "--output", str(tmp_path / "names.db")]) == 0
+    assert set(_rows(tmp_path / "names.db")) == {(".", "sub"), ("sub", "sub.json"), ("sub", "a.txt")}
+
+
+def test_cli_sqlite_requires_output(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--format", "sqlite"]) == 1
+    assert "--format sqlite requires --output" in capsys.readouterr().err
+
+
+def test_cli_sqlite_rejects_ics(tmp_path: Path, capsys):
+    ics_path = tmp_path / "cal.ics"
+    ics_path.write_text("BEGIN:VCALENDAR\nBEGIN:VEVENT\nUID:one\nEND:VEVENT\nEND:VCALENDAR\n", encoding="utf-8")
+    db = tmp_path / "cal.db"
+    assert main([str(ics_path), "--format", "sqlite", "--output", str(db)]) == 1
+    assert "--format sqlite cannot be combined with --ics" in capsys.readouterr().err
+    assert not db.exists()
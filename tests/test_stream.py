@@ -0,0 +1,82 @@
+"""Tests for --format ndjson, --stream and the iter_entries generator."""
+
+import io
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import iter_entries, list_entries
+from flatdir.output import write_json_stream
+
+
+def _make_tree(root: Path) -> None:
+    (root / "b.txt").write_text("b")
+    (root / "a.txt").write_text("a")
+    (root / "sub").mkdir()
+    (root / "sub" / "c.txt").write_text("c")
+
+
+def test_iter_entries_yields_same_entries_as_list_entries(tmp_path: Path):
+    _make_tree(tmp_path)
+    streamed = list(iter_entries(tmp_path))
+    key = lambda e: (e["path"], e["name"])
+    assert sorted(streamed, key=key) == sorted(list_entries(tmp_path), key=key)
+
+
+def test_iter_entries_is_lazy(tmp_path: Path):
+    for i in range(20):
+        (tmp_path / f"f{i}.txt").write_text("x")
+    calls = []
+    gen = iter_entries(tmp_path, fields={"seen": lambda p, root: calls.append(p) or True})
+    next(gen)
+    assert len(calls) == 1
+    gen.close()
+
+
+def test_write_json_stream_matches_json_dump():
+    entries = [{"name": "a", "nested": {"k": [1, 2]}}, {"name": "é\nx"}]
+    buf = io.StringIO()
+    assert write_json_stream(iter(entries), buf) == 2
+    assert buf.getvalue() == json.dumps(entries, ensure_ascii=False, indent=4) + "\n"
+
+    empty = io.StringIO()
+    write_json_stream(iter([]), empty)
+    assert empty.getvalue() == "[]\n"
+
+
+def test_format_ndjson_writes_one_entry_per_line(tmp_path: Path, capsys):
+    _make_tree(tmp_path)
+    assert main([str(tmp_path), "--format", "ndjson"]) == 0
+    out, _ = capsys.readouterr()
+    lines = out.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["a.txt", "b.txt", "c.txt", "sub"]
+
+
+def test_stream_ndjson_with_limit_and_id(tmp_path: Path, capsys):
+    _make_tree(tmp_path)
+    out_file = tmp_path.parent / f"{tmp_path.name}.ndjson"
+    rc = main([str(tmp_path), "--format", "ndjson", "--stream", "--limit", "2", "--id", "--output", str(out_file)])
+    assert rc == 0
+    rows = [json.loads(line) for line in out_file.read_text().splitlines()]
+    assert [row["id"] for row in rows] == [1, 2]
+
+
+def test_stream_json_is_valid_array(tmp_path: Path, capsys):
+    _make_tree(tmp_path)
+    assert main([str(tmp_path), "--stream"]) == 0
+    out, _ = capsys.readouterr()
+    assert {e["name"] for e in json.loads(out)} == {"a.txt", "b.txt", "c.txt", "sub"}
+
+
+def test_stream_rejects_global_operations(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--stream", "--with-headers"]) == 1
+    assert main([str(tmp_path), "--stream", "--tree", "--sort", "size"]) == 1
+    _, err = capsys.readouterr()
+    assert "--stream cannot be combined with --with-headers" in err
+    assert "--stream cannot be combined with --sort with --tree/--nested" in err
+
+
+def test_unknown_format_is_rejected(tmp_path: Path, capsys):
+    assert main([str(tmp_path), "--format", "xml"]) == 1
+    _, err = capsys.readouterr()
+    assert "--format must be one of" in err
@@ -0,0 +1,100 @@
+"""Tests for the streaming --tree and --nested writers."""
+
+import io
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.hierarchy import build_nested, build_tree, write_nested_stream, write_tree_stream
+from flatdir.listing import iter_entries
+
+
+def _make_tree(root: Path) -> None:
+    (root / "a" / "deep" / "deeper").mkdir(parents=True)
+    (root / "a" / "empty").mkdir()
+    (root / "b").mkdir()
+    (root / "a" / "one.txt").write_text("1")
+    (root / "a" / "deep" / "two.txt").write_text("22")
+    (root / "a" / "deep" / "deeper" / "x.txt").write_text("x")
+    (root / "b" / "three.txt").write_text("333")
+    (root / "top.txt").write_text("t")
+
+
+def _sorted_tree(node):
+    if "children" in node:
+        node["children"] = sorted((_sorted_tree(c) for c in node["children"]), key=lambda c: c["name"])
+    return node
+
+
+def test_stream_matches_built_layouts_byte_for_byte(tmp_path: Path):
+    _make_tree(tmp_path)
+    entries = list(iter_entries(tmp_path))
+
+    out = io.StringIO()
+    assert write_tree_stream(iter(entries), out, "root") == len(entries)
+    assert out.getvalue() == json.dumps(build_tree(entries, "root"), ensure_ascii=False, indent=4) + "\n"
+
+    out = io.StringIO()
+    write_nested_stream(iter(entries), out)
+    assert out.getvalue() == json.dumps(build_nested(entries), ensure_ascii=False, indent=4) + "\n"
+
+    out = io.StringIO()
+    write_tree_stream(iter(entries), out, "root", indent=None)
+    assert out.getvalue() == json.dumps(build_tree(entries, "root"), ensure_ascii=False) + "\n"
+
+
+def test_stream_empty_and_filtered_directories(tmp_path: Path):
+    out = io.StringIO()
+    write_tree_stream([], out, "root")
+    assert json.loads(out.getvalue()) == {"name": "root"}
+
+    _make_tree(tmp_path)
+    # directories are filtered out: their files still hang below name-only nodes
+    entries = list(iter_entries(tmp_path, only=[("type", "file")]))
+    out = io.StringIO()
+    write_tree_stream(entries, out, "root")
+    assert _sorted_tree(json.loads(out.getvalue())) == _sorted_tree(build_tree(entries, "root"))
+
+
+def test_cli_stream_tree_and_nested(tmp_path: Path, capsys):
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root)
+    for flag in ("--tree", "--nested"):
+        assert main([str(root), flag]) == 0
+        built = json.loads(capsys.readouterr().out)
+        assert main([str(root), flag, "--stream", "--workers", "3"]) == 0
+        streamed = json.loads(capsys.readouterr().out)
+        if flag == "--tree":
+            assert _sorted_tree(streamed) == _sorted_tree(built)
+        else:
+            assert streamed == built
+
+    assert main([str(root), "--tree", "--stream", "--format", "ndjson"]) == 0
+    out = capsys.readouterr().out
+    assert out.count("\n") == 1 and json.loads(out)["name"] == "root"
+
+
+def test_cli_stream_tree_children_come_in_traversal_order(tmp_path: Path, capsys):
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root)
+    (root / "0_first.txt").write_text("0")
+    assert main([str(root), "--tree", "--stream"]) == 0
+    streamed = json.loads(capsys.readouterr().out)
+    # the layout built from the unsorted walk, not from the name-sorted listing
+    assert streamed == build_tree(list(iter_entries(root)), "root")
+
+    def check(node):
+        kinds = [child.get("type") for child in node.get("children", [])]
+        # subdirectories first, then files
+        assert kinds == sorted(kinds)
+        for child in node.get("children", []):
+            check(child)
+
+    check(streamed)
+    assert {child["name"] for child in streamed["children"][:2]} == {"a", "b"}
+
+    # without --stream, children follow the name-sorted listing
+    assert main([str(root), "--tree"]) == 0
+    assert json.loads(capsys.readouterr().out)["children"][0]["name"] == "0_first.txt"
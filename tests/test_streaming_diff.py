@@ -0,0 +1,143 @@
+"""Tests for the merge-join diff engine and --stream --diff."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from flatdir.__main__ import main
+from flatdir.compare import compare_entries, entry_key, iter_changes
+from flatdir.reading import read_entries
+
+
+def _entry(path, name, **values):
+    return {"path": path, "name": name, **values}
+
+
+def test_iter_changes_tags_each_change():
+    old = [_entry(".", "a", size=1), _entry(".", "b", size=2), _entry("d", "c", size=3)]
+    new = [_entry(".", "a", size=1), _entry(".", "b", size=5), _entry("d", "e", size=4)]
+    changes = list(iter_changes(old, new))
+    assert changes == [
+        _entry(".", "b", size=5, change="modified", changed_fields=["size"]),
+        _entry("d", "c", size=3, change="removed"),
+        _entry("d", "e", size=4, change="added"),
+    ]
+
+
+def test_iter_changes_consumes_streams_lazily():
+    def endless(start):
+        i = start
+        while True:
+            yield _entry(".", f"{i:09d}")
+            i += 1
+
+    changes = iter_changes(endless(0), endless(1))
+    assert next(changes) == _entry(".", "000000000", change="removed")
+
+
+def test_iter_changes_rejects_unsorted_input():
+    old = [_entry(".", "b"), _entry(".", "a")]
+    with pytest.raises(ValueError, match="old entries are not sorted"):
+        list(iter_changes(old, []))
+
+
+def test_compare_entries_sorts_its_inputs():
+    old = [_entry(".", "z", size=1), _entry(".", "a", size=1), _entry(".", "gone")]
+    new = [_entry(".", "a", size=2), _entry(".", "z", size=1), _entry(".", "new")]
+    assert [(e["name"], e["change"]) for e in compare_entries(old, new)] == [
+        ("a", "modified"),
+        ("gone", "removed"),
+        ("new", "added"),
+    ]
+
+
+@pytest.mark.parametrize("layout", ["json", "headers", "ndjson", "compact"])
+def test_read_entries_layouts(layout):
+    entries = [_entry(".", f"f{i}", size=i * 1000, tags=["x", "y"]) for i in range(50)]
+    if layout == "json":
+        text = json.dumps(entries, indent=4)
+    elif layout == "headers":
+        text = json.dumps({"headers": {"command": "python -m flatdir ."}, "entries": entries, "extra": 1}, indent=4)
+    elif layout == "ndjson":
+        text = "".join(json.dumps(entry) + "\n" for entry in entries)
+    else:
+        text = json.dumps(entries, separators=(",", ":"))
+    assert list(read_entries(io.StringIO(text))) == entries
+
+
+def test_read_entries_across_chunks(monkeypatch):
+    monkeypatch.setattr("flatdir.reading._CHUNK_SIZE", 7)
+    entries = [_entry(".", f"f{i}", size=123456789 + i) for i in range(20)]
+    assert list(read_entries(io.StringIO(json.dumps(entries)))) == entries
+    assert list(read_entries(io.StringIO("[]"))) == []
+    assert list(read_entries(io.StringIO(""))) == []
+
+
+def test_read_entries_grows_reads_for_large_values(monkeypatch):
+    monkeypatch.setattr("flatdir.reading._CHUNK_SIZE", 16)
+    entries = [_entry(".", "big", note="x" * 100_000), _entry(".", "small")]
+    sizes = []
+
+    class Recording(io.StringIO):
+        def read(self, size=-1):
+            sizes.append(size)
+            return super().read(size)
+
+    assert list(read_entries(Recording(json.dumps(entries)))) == entries
+    # a value spanning chunks is read in reads of doubling size, not chunk by chunk
+    assert len(sizes) < 20
+    assert max(sizes) > 10_000
+
+
+def test_stream_diff_outputs_tagged_changes(tmp_path: Path, capsys):
+    scan_dir = tmp_path / "data"
+    scan_dir.mkdir()
+    (scan_dir / "keep.txt").write_text("k")
+    (scan_dir / "edit.txt").write_text("e")
+    (scan_dir / "gone.txt").write_text("g")
+
+    baseline = tmp_path / "baseline.ndjson"
+    assert main([str(scan_dir), "--format", "ndjson", "--output", str(baseline)]) == 0
+
+    (scan_dir / "edit.txt").write_text("edited")
+    (scan_dir / "gone.txt").unlink()
+    (scan_dir / "new.txt").write_text("n")
+
+    assert main([str(scan_dir), "--stream", "--diff", str(baseline), "--sort-buffer", "1"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert [(e["name"], e["change"]) for e in data] == [
+        ("edit.txt", "modified"),
+        ("gone.txt", "removed"),
+        ("new.txt", "added"),
+    ]
+    assert data == sorted(data, key=entry_key)
+
+
+def test_stream_diff_matches_in_memory_diff(tmp_path: Path, capsys):
+    scan_dir = tmp_path / "data"
+    (scan_dir / "sub").mkdir(parents=True)
+    for i in range(10):
+        (scan_dir / "sub" / f"{i}.txt").write_text(str(i))
+    baseline = tmp_path / "baseline.json"
+    assert main([str(scan_dir), "--with-headers", "--output", str(baseline)]) == 0
+    (scan_dir / "sub" / "3.txt").unlink()
+    (scan_dir / "sub" / "x.txt").write_text("x")
+
+    assert main([str(scan_dir), "--diff", str(baseline)]) == 0
+    in_memory = json.loads(capsys.readouterr().out)
+    assert main([str(scan_dir), "--diff", str(baseline), "--stream", "--format", "ndjson"]) == 0
+    streamed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert streamed == in_memory
+
+
+def test_stream_diff_rejects_hierarchies_and_headers(tmp_path: Path, capsys):
+    baseline = tmp_path / "baseline.ndjson"
+    assert main([str(tmp_path), "--format", "ndjson", "--output", str(baseline)]) == 0
+    capsys.readouterr()
+    for flag in ("--tree", "--nested", "--with-headers"):
+        assert main([str(tmp_path), "--stream", "--diff", str(baseline), flag]) == 1
+    _, err = capsys.readouterr()
+    assert err.count("--stream cannot be combined with --diff with --tree/--nested") == 2
+    assert "--stream cannot be combined with --with-headers" in err
@@ -0,0 +1,58 @@
+"""Tests for bounded top-K selection when --sort and --limit are combined."""
+
+import json
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+from flatdir.sorting import sort_key, top_k
+
+
+def test_top_k_matches_sorted_slice_including_ties():
+    entries = [{"name": f"e{i}", "v": v} for i, v in enumerate([3, 1, 3, None, "x", 1, 2, 3])]
+    key = sort_key("v")
+    for reverse in (False, True):
+        for k in range(0, 10):
+            assert top_k(iter(entries), key, k, reverse=reverse) == sorted(entries, key=key, reverse=reverse)[:k]
+
+
+def test_list_entries_limit_with_sort_returns_largest(tmp_path: Path):
+    for i in range(10):
+        (tmp_path / f"f{i}.bin").write_bytes(b"x" * (i * 10))
+
+    largest = list_entries(tmp_path, sort_by="size", sort_desc=True, limit=3)
+    assert [e["size"] for e in largest] == [90, 80, 70]
+
+    full = list_entries(tmp_path, sort_by="size", sort_desc=True)
+    assert largest == full[:3]
+
+
+def test_stream_limit_without_sort_stops_walk_early(tmp_path: Path, capsys):
+    for i in range(5):
+        sub = tmp_path / f"d{i}"
+        sub.mkdir()
+        for j in range(20):
+            (sub / f"f{j}.txt").write_text("x")
+
+    fields_file = tmp_path.parent / f"{tmp_path.name}_counter.py"
+    fields_file.write_text(
+        "CALLS = []\n"
+        "def counted(path, root):\n"
+        "    CALLS.append(path)\n"
+        "    return len(CALLS)\n"
+    )
+    rc = main([str(tmp_path), "--fields", str(fields_file), "--stream", "--format", "ndjson", "--limit", "3"])
+    assert rc == 0
+    out, _ = capsys.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert len(rows) == 3
+    # only the entries needed to fill the limit were evaluated
+    assert rows[-1]["counted"] == 3
+
+
+def test_stream_sort_with_limit(tmp_path: Path, capsys):
+    for i in range(6):
+        (tmp_path / f"f{i}.bin").write_bytes(b"x" * i)
+    assert main([str(tmp_path), "--stream", "--sort", "size", "--desc", "--limit", "2"]) == 0
+    out, _ = capsys.readouterr()
+    assert [e["size"] for e in json.loads(out)] == [5, 4]
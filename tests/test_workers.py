@@ -0,0 +1,63 @@
+"""Tests for --workers (thread pool traversal and field evaluation)."""
+
+import json
+import threading
+from pathlib import Path
+
+from flatdir.__main__ import main
+from flatdir.listing import list_entries
+
+
+def _make_tree(root: Path) -> None:
+    for i in range(4):
+        sub = root / f"dir{i}"
+        sub.mkdir()
+        for j in range(5):
+            (sub / f"file{j}.txt").write_text("x" * (i + j))
+        nested = sub / "nested"
+        nested.mkdir()
+        (nested / "same.txt").write_text("same")
+    (root / "same.txt").write_text("top")
+
+
+def test_workers_output_matches_sequential(tmp_path: Path):
+    _make_tree(tmp_path)
+    sequential = list_entries(tmp_path)
+    parallel = list_entries(tmp_path, workers=4)
+    assert parallel == sequential
+
+
+def test_workers_preserve_tie_order_with_sort(tmp_path: Path):
+    """Entries with equal sort keys keep their walk order, as in a sequential run."""
+    _make_tree(tmp_path)
+    sequential = list_entries(tmp_path, sort_by="type", depth=1)
+    parallel = list_entries(tmp_path, sort_by="type", depth=1, workers=3)
+    assert parallel == sequential
+
+
+def test_workers_evaluate_fields_on_pool_threads(tmp_path: Path):
+    _make_tree(tmp_path)
+    seen: set[str] = set()
+
+    def thread_name(path, root):
+        seen.add(threading.current_thread().name)
+        return None
+
+    list_entries(tmp_path, fields={"thread_name": thread_name}, workers=2)
+    assert seen and threading.main_thread().name not in seen
+
+
+def test_workers_cli(tmp_path: Path, capsys):
+    _make_tree(tmp_path)
+    assert main([str(tmp_path), "--workers", "4", "--depth", "0"]) == 0
+    out, _ = capsys.readouterr()
+    names = [e["name"] for e in json.loads(out)]
+    assert names == ["dir0", "dir1", "dir2", "dir3", "same.txt"]
+
+
+def test_workers_cli_rejects_invalid_values(capsys):
+    assert main(["--workers", "zero"]) == 1
+    assert main(["--workers", "0"]) == 1
+    _, err = capsys.readouterr()
+    assert "--workers requires a valid integer argument" in err
+    assert "--workers must be at least 1" in err